@@ -0,0 +1,46 @@
+"""
+Time to resolve filter keys to model attributes, searching the per table column dictionaries and converting case for
+each key against one lookup in the attribute index.
+
+    python -m benchmarks.attribute_index
+"""
+from benchmarks.helpers import make_app, time_call, print_table
+from demo.basic_factory.basic_factory.models import Author, Book
+from flask_scheema.services.attributes import get_attribute_lookup
+from flask_scheema.services.operators import (
+    get_all_columns_and_hybrids,
+    get_check_table_columns,
+    get_table_column,
+)
+
+KEYS = ["id__eq", "title__like", "author_id__in", "publication_date__gt", "author.first_name__eq"]
+
+
+def main():
+    app = make_app()
+
+    rows = []
+    with app.test_request_context("/"):
+        for join_models in [{}, {"author": Author}]:
+            keys = KEYS if join_models else KEYS[:-1]
+
+            def scan():
+                all_columns, _ = get_all_columns_and_hybrids(Book, join_models)
+                for key in keys:
+                    table, column, _ = get_table_column(key, all_columns)
+                    get_check_table_columns(table, column, all_columns)
+
+            def index():
+                lookup = get_attribute_lookup(Book, join_models)
+                for key in keys:
+                    lookup.resolve(key.split("__")[0])
+
+            scan_ms = time_call(scan, repeat=1000)
+            index_ms = time_call(index, repeat=1000)
+            rows.append([",".join(join_models) or "-", len(keys), scan_ms, index_ms, scan_ms / index_ms])
+
+    print_table("Filter key resolution", ["join", "keys", "scan ms", "index ms", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Compares the row and columnar layouts of a 1,000 row page, by request time, time to dump the page, and payload size,
+for a numeric table and the demo books.
+
+    python -m benchmarks.columnar_layout
+"""
+import warnings
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import Float, Integer, insert
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from benchmarks.helpers import make_app, time_call, print_table
+from flask_scheema import Naan
+from flask_scheema.scheema.columnar import dump_columnar
+from flask_scheema.scheema.utils import get_input_output_from_model_or_make
+
+ROW_COUNT = 10_000
+LIMIT = 1_000
+
+
+def make_metrics_app():
+    """
+    Builds an app with one numeric model, ``Reading``, holding ``ROW_COUNT`` rows.
+
+    Returns:
+        Tuple[Flask, type]: The app and the model.
+    """
+
+    class Base(DeclarativeBase):
+        def get_session(*args):
+            return db.session
+
+    db = SQLAlchemy(model_class=Base)
+
+    class Reading(db.Model):
+        __tablename__ = "readings"
+        id: Mapped[int] = mapped_column(Integer, primary_key=True)
+        sensor: Mapped[int] = mapped_column(Integer)
+        temperature: Mapped[float] = mapped_column(Float)
+        humidity: Mapped[float] = mapped_column(Float)
+        pressure: Mapped[float] = mapped_column(Float)
+        voltage: Mapped[float] = mapped_column(Float)
+
+        class Meta:
+            tag = "Reading"
+            tag_group = "Benchmark"
+
+    app = Flask(__name__)
+    app.config.update(
+        {
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "API_BASE_MODEL": db.Model,
+            "API_TITLE": "Benchmark",
+            "API_VERSION": "0.1.0",
+            "API_VERBOSITY_LEVEL": 0,
+            "API_CREATE_DOCS": False,
+            "API_PAGINATION_SIZE_MAX": LIMIT,
+        }
+    )
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        db.session.execute(
+            insert(Reading),
+            [
+                {"sensor": i % 40, "temperature": i / 7, "humidity": i / 11, "pressure": i / 13, "voltage": i / 17}
+                for i in range(ROW_COUNT)
+            ],
+        )
+        db.session.commit()
+        scheema = Naan()
+        scheema.route_spec = []
+        scheema.init_app(app)
+
+    return app, Reading
+
+
+def main():
+    warnings.simplefilter("ignore")
+    metrics_app, reading = make_metrics_app()
+    demo_app = make_app({"API_PAGINATION_SIZE_MAX": LIMIT})
+
+    rows = []
+    for app, model, url in [
+        (metrics_app, reading, f"/api/readings?limit={LIMIT}"),
+        (demo_app, None, f"/api/books?limit={LIMIT}"),
+        (demo_app, None, f"/api/books?limit={LIMIT}&fields=id,title,isbn,publication_date,author_id"),
+    ]:
+        client = app.test_client()
+        sizes = []
+        times = []
+        for layout in ["rows", "columnar"]:
+            layout_url = f"{url}&layout={layout}"
+            times.append(time_call(lambda: client.get(layout_url), repeat=10))
+            sizes.append(len(client.get(layout_url).data))
+        rows.append([url, times[0], times[1], sizes[0], sizes[1], sizes[1] / sizes[0]])
+
+    print_table(
+        f"List request, {LIMIT} rows",
+        ["url", "rows ms", "columnar ms", "rows bytes", "columnar bytes", "ratio"],
+        rows,
+    )
+
+    rows = []
+    with metrics_app.test_request_context("/"):
+        _, output_schema = get_input_output_from_model_or_make(reading)
+        schema = output_schema(many=True)
+        results = reading.query.limit(LIMIT).all()
+        rows_ms = time_call(lambda: schema.dump(results, many=True), repeat=20)
+        columnar_ms = time_call(lambda: dump_columnar(schema, results), repeat=20)
+        rows.append(["readings", rows_ms, columnar_ms, rows_ms / columnar_ms])
+
+    print_table(f"Dump of {LIMIT} objects", ["model", "rows ms", "columnar ms", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
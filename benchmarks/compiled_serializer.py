@@ -0,0 +1,53 @@
+"""
+Compares marshmallow's Schema.dump with the compiled serializer on a 100 row page, for each demo model, and the
+time for the whole list request with API_COMPILED_SERIALIZER off and on.
+
+    python -m benchmarks.compiled_serializer
+"""
+from benchmarks.helpers import make_app, time_call, print_table
+from demo.basic_factory.basic_factory.models import Author, Book, Publisher, Category
+from flask_scheema.scheema.compiler import compile_schema
+from flask_scheema.scheema.utils import get_input_output_from_model_or_make
+from flask_scheema.utilities import invalidate_config_cache
+
+
+def main():
+    app = make_app({"API_PAGINATION_SIZE_MAX": 100})
+    client = app.test_client()
+
+    rows = []
+    with app.test_request_context("/"):
+        for model in [Author, Book, Publisher, Category]:
+            _, output_schema = get_input_output_from_model_or_make(model)
+            objs = model.query.limit(100).all()
+            for label, schema in [("all", output_schema(many=True)), ("id,name", None)]:
+                if schema is None:
+                    only = [f for f in ["id", "name", "title", "first_name"] if f in output_schema().fields]
+                    schema = output_schema(many=True, only=only)
+                compiled = compile_schema(schema)
+                mallow_ms = time_call(lambda: schema.dump(objs, many=True), repeat=50)
+                compiled_ms = time_call(lambda: compiled(objs, many=True), repeat=50)
+                rows.append([model.__name__, label, len(objs), mallow_ms, compiled_ms, mallow_ms / compiled_ms])
+
+    print_table(
+        "Dump of one page",
+        ["model", "fields", "rows", "marshmallow ms", "compiled ms", "speedup"],
+        rows,
+    )
+
+    rows = []
+    urls = ["/api/authors?limit=100", "/api/books?limit=100", "/api/categories?limit=100"]
+    timings = {}
+    for enabled in [False, True]:
+        app.config["API_COMPILED_SERIALIZER"] = enabled
+        invalidate_config_cache(app)
+        for url in urls:
+            timings[(url, enabled)] = time_call(lambda: client.get(url), repeat=30)
+    for url in urls:
+        rows.append([url, timings[(url, False)], timings[(url, True)]])
+
+    print_table("List request", ["url", "marshmallow ms", "compiled ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
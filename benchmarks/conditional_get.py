@@ -0,0 +1,33 @@
+"""
+Compares a full GET with a revalidated one (a 304) for each ETag source, on a list and a single record.
+
+    python -m benchmarks.conditional_get
+"""
+from benchmarks.helpers import make_app, time_call, print_table
+
+SOURCES = ["version", "updated", "body"]
+URLS = ["/api/books?limit=100", "/api/books/1"]
+
+
+def main():
+    rows = []
+    for source in SOURCES:
+        app = make_app(
+            {
+                "API_CONDITIONAL_GET": True,
+                "API_ETAG_SOURCE": source,
+                "API_LAST_MODIFIED_COLUMN": "publication_date",
+            }
+        )
+        client = app.test_client()
+        for url in URLS:
+            etag = client.get(url).headers["ETag"]
+            full_ms = time_call(lambda: client.get(url), repeat=50)
+            revalidated_ms = time_call(lambda: client.get(url, headers={"If-None-Match": etag}), repeat=50)
+            rows.append([source, url, full_ms, revalidated_ms, full_ms / revalidated_ms])
+
+    print_table("Conditional GET", ["source", "url", "200 ms", "304 ms", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
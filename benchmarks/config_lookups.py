@@ -0,0 +1,49 @@
+"""
+Shows how many configuration lookups each request makes, and how many of them are resolved from scratch now that
+lookups are memoised per app.
+
+    python -m benchmarks.config_lookups
+"""
+from benchmarks.helpers import make_app, time_call, print_table
+from flask_scheema.utilities import CONFIG_CACHE_EXTENSION, get_config_resolver
+
+URLS = [
+    "/api/books",
+    "/api/books?limit=100",
+    "/api/books/1",
+    "/api/authors?id__gt=5&order_by=-id",
+    "/api/authors/1/books",
+]
+
+
+def main():
+    app = make_app()
+    client = app.test_client()
+    resolver = get_config_resolver(app)
+
+    rows = []
+    for url in URLS:
+        client.get(url)  # first request fills the cache
+
+        before = resolver.stats()
+        client.get(url)
+        after = resolver.stats()
+        calls = (after["hits"] + after["misses"]) - (before["hits"] + before["misses"])
+        resolved = after["misses"] - before["misses"]
+
+        cached_ms = time_call(lambda: client.get(url), repeat=50)
+        app.extensions.pop(CONFIG_CACHE_EXTENSION)
+        uncached_ms = time_call(lambda: client.get(url), repeat=50)
+        app.extensions[CONFIG_CACHE_EXTENSION] = resolver
+
+        rows.append([url, calls, resolved, calls - resolved, uncached_ms, cached_ms])
+
+    print_table(
+        "Config lookups per request",
+        ["url", "lookups", "resolved", "removed", "uncached ms", "cached ms"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Rows per second exporting a table through a list route, as one JSON page, streamed NDJSON and streamed CSV. The JSON
+page is built in memory before it is sent, the streams are written a batch at a time.
+
+    python -m benchmarks.csv_export
+"""
+import time
+import tracemalloc
+import warnings
+from datetime import date
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import Date, Float, Integer, String, insert
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from benchmarks.helpers import print_table
+from flask_scheema import Naan
+
+ROW_COUNT = 100_000
+
+
+def make_app():
+    """
+    Builds an app with one model, ``Sale``, holding ``ROW_COUNT`` rows.
+
+    Returns:
+        Flask: The app.
+    """
+
+    class Base(DeclarativeBase):
+        def get_session(*args):
+            return db.session
+
+    db = SQLAlchemy(model_class=Base)
+
+    class Sale(db.Model):
+        __tablename__ = "sales"
+        id: Mapped[int] = mapped_column(Integer, primary_key=True)
+        product: Mapped[str] = mapped_column(String)
+        quantity: Mapped[int] = mapped_column(Integer)
+        price: Mapped[float] = mapped_column(Float)
+        sold_on: Mapped[date] = mapped_column(Date)
+
+        class Meta:
+            tag = "Sale"
+            tag_group = "Benchmark"
+
+    app = Flask(__name__)
+    app.config.update(
+        {
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "API_BASE_MODEL": db.Model,
+            "API_TITLE": "Benchmark",
+            "API_VERSION": "0.1.0",
+            "API_VERBOSITY_LEVEL": 0,
+            "API_CREATE_DOCS": False,
+            "API_PAGINATION_SIZE_MAX": ROW_COUNT,
+        }
+    )
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        db.session.execute(
+            insert(Sale),
+            [
+                {"product": f"product {i % 500}", "quantity": i % 7, "price": i / 100, "sold_on": date(2024, 1, 1)}
+                for i in range(ROW_COUNT)
+            ],
+        )
+        db.session.commit()
+        scheema = Naan()
+        scheema.route_spec = []
+        scheema.init_app(app)
+
+    return app
+
+
+def read(client, url: str):
+    """
+    Reads a whole response, a chunk at a time, as a client downloading it would.
+    """
+    response = client.get(url, buffered=False)
+    for _ in response.response:
+        pass
+    response.close()
+
+
+def peak_memory(client, url: str) -> float:
+    """
+    Gets the peak memory used reading a whole response, in MB.
+    """
+    tracemalloc.start()
+    read(client, url)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def main():
+    warnings.simplefilter("ignore")
+    app = make_app()
+    client = app.test_client()
+
+    rows = []
+    for name, url in [
+        ("json page", f"/api/sales?limit={ROW_COUNT}"),
+        ("ndjson stream", "/api/sales?format=ndjson"),
+        ("csv stream", "/api/sales?format=csv"),
+    ]:
+        read(client, f"{url}&id__le=10")  # warm up
+        start = time.perf_counter()
+        read(client, url)
+        seconds = time.perf_counter() - start
+        rows.append([name, ROW_COUNT / seconds, seconds * 1000, peak_memory(client, url)])
+
+    print_table(f"Export, {ROW_COUNT} rows", ["format", "rows/sec", "total ms", "peak MB"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Time to fetch a page of a large table at increasing depths, paging by offset against seeking with a cursor. Offset
+pages get slower the deeper they are, as the database still reads every skipped row, cursor pages stay flat.
+
+    python -m benchmarks.cursor_pagination
+"""
+import warnings
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import Integer, String, insert
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from benchmarks.helpers import time_call, print_table
+from flask_scheema import Naan
+from flask_scheema.services.cursors import encode_cursor
+from flask_scheema.services.database import CrudService
+from flask_scheema.services.planner import get_query_plan
+
+ROW_COUNT = 500_000
+LIMIT = 20
+
+
+def make_app():
+    """
+    Builds an app with one model, ``Event``, holding ``ROW_COUNT`` rows.
+
+    Returns:
+        Tuple[Flask, type]: The app and the model.
+    """
+
+    class Base(DeclarativeBase):
+        def get_session(*args):
+            return db.session
+
+    db = SQLAlchemy(model_class=Base)
+
+    class Event(db.Model):
+        __tablename__ = "events"
+        id: Mapped[int] = mapped_column(Integer, primary_key=True)
+        name: Mapped[str] = mapped_column(String)
+
+        class Meta:
+            tag = "Event"
+            tag_group = "Benchmark"
+
+    app = Flask(__name__)
+    app.config.update(
+        {
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "SECRET_KEY": "benchmark",
+            "API_BASE_MODEL": db.Model,
+            "API_TITLE": "Benchmark",
+            "API_VERSION": "0.1.0",
+            "API_VERBOSITY_LEVEL": 0,
+            "API_CREATE_DOCS": False,
+            "API_COUNT_MODE": "none",
+        }
+    )
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        db.session.execute(insert(Event), [{"name": f"event {i}"} for i in range(ROW_COUNT)])
+        db.session.commit()
+        scheema = Naan()
+        scheema.route_spec = []
+        scheema.init_app(app)
+
+    return app, Event
+
+
+def main():
+    warnings.simplefilter("ignore")
+    app, model = make_app()
+    client = app.test_client()
+
+    rows = []
+    for depth in [1, 100, 1_000, 10_000, ROW_COUNT // LIMIT - 1]:
+        with app.test_request_context("/api/events"):
+            service = CrudService(model, session=app.extensions["sqlalchemy"].session)
+            plan, _ = get_query_plan(service, {"cursor": ""})
+            cursor = encode_cursor(plan.cursor, [(depth - 1) * LIMIT], True)
+
+        offset_ms = time_call(lambda: client.get(f"/api/events?limit={LIMIT}&page={depth}"), repeat=20)
+        cursor_ms = time_call(lambda: client.get(f"/api/events?limit={LIMIT}&cursor={cursor}"), repeat=20)
+        rows.append([depth, offset_ms, cursor_ms, offset_ms / cursor_ms])
+
+    print_table(f"Page fetch, {ROW_COUNT} rows", ["page", "offset ms", "cursor ms", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Time to parse the filters in a request's arguments as the query string grows, for ordinary filters and for
+pathological ones, long ``or`` groups, deep nesting, long values and unclosed brackets. The time per character should
+stay flat as the length grows.
+
+    python -m benchmarks.filter_parsing
+"""
+from benchmarks.helpers import time_call, print_table
+from flask_scheema.exceptions import CustomHTTPException
+from flask_scheema.services.filters import MAX_GROUP_DEPTH, parse_filter_args
+
+
+def split_arg(text: str) -> dict:
+    """
+    Splits ``key=value`` the way the query string parser does, on the first ``=``.
+    """
+    key, _, value = text.partition("=")
+    return {key: value}
+
+
+# as deep as a group inside the outer ``or`` is allowed to go.
+DEPTH = MAX_GROUP_DEPTH - 1
+NESTED = "and[" * DEPTH + "id__eq=1" + "]" * DEPTH
+
+CASES = {
+    "plain filters": lambda n: {f"column_{i}__eq": str(i) for i in range(n)},
+    "or group": lambda n: split_arg("or[" + ", ".join(f"id__eq={i}" for i in range(n)) + "]"),
+    "in list": lambda n: {"id__in": "(" + ",".join(str(i) for i in range(n)) + ")"},
+    "nested groups": lambda n: split_arg("or[" + ", ".join(NESTED for _ in range(n // 10 + 1)) + "]"),
+    "long value": lambda n: split_arg("or[title__like=" + "a" * n * 10 + "]"),
+    "unclosed bracket": lambda n: split_arg("or[" + ", ".join(f"id__in=({i}" for i in range(n)) + "]"),
+}
+
+
+def main():
+    rows = []
+    for name, make_args in CASES.items():
+        for size in [10, 100, 1000]:
+            args = make_args(size)
+            length = sum(len(k) + len(v) + 1 for k, v in args.items())
+
+            def parse():
+                try:
+                    parse_filter_args(args)
+                except CustomHTTPException:
+                    pass
+
+            ms = time_call(parse, repeat=20)
+            rows.append([name, size, length, ms, ms * 1000 / length])
+
+    print_table("Filter parsing", ["case", "n", "chars", "ms", "us per char"], rows)
+
+
+if __name__ == "__main__":
+    main()
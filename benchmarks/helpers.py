@@ -0,0 +1,60 @@
+import time
+import warnings
+from typing import Callable, Optional
+
+from demo.basic_factory.basic_factory import create_app
+
+
+def make_app(config: Optional[dict] = None):
+    """
+    Creates the demo book shop app with console output switched off, so benchmark output stays readable.
+
+    Args:
+        config (Optional[dict]): Extra configuration for the app.
+
+    Returns:
+        Flask: The flask app.
+    """
+    warnings.simplefilter("ignore")
+    return create_app(
+        {"API_VERBOSITY_LEVEL": 0, "API_PRINT_EXCEPTIONS": False, **(config or {})}
+    )
+
+
+def time_call(func: Callable, repeat: int = 100) -> float:
+    """
+    Times a function call.
+
+    Args:
+        func (Callable): The function to call.
+        repeat (int): How many times to call it.
+
+    Returns:
+        float: The mean time per call in milliseconds.
+    """
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def print_table(title: str, headers: list, rows: list):
+    """
+    Prints a simple aligned table.
+
+    Args:
+        title (str): The table title.
+        headers (list): The column headers.
+        rows (list): The rows, each a list of values.
+
+    Returns:
+        None
+    """
+    rows = [[f"{v:.3f}" if isinstance(v, float) else str(v) for v in row] for row in rows]
+    widths = [max(len(str(x)) for x in col) for col in zip(headers, *rows)]
+    print(f"\n{title}")
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(v.ljust(w) for v, w in zip(row, widths)))
@@ -0,0 +1,41 @@
+"""
+Compares the API_JSON_BACKEND encoders on a page of each demo model, by encode throughput, and the time of a list
+request with each backend. orjson is included when it is installed.
+
+    python -m benchmarks.json_encoding
+"""
+from benchmarks.helpers import make_app, time_call, print_table
+from flask_scheema.api.encoding import JSON_BACKENDS
+
+ENDPOINTS = ["books", "authors", "publishers", "reviews", "categories"]
+BACKENDS = ["flask"] + [name for name, backend in JSON_BACKENDS.items() if backend]
+
+
+def main():
+    app = make_app({"API_PAGINATION_SIZE_MAX": 100})
+    client = app.test_client()
+
+    rows = []
+    with app.app_context():
+        for endpoint in ENDPOINTS:
+            data = client.get(f"/api/{endpoint}?limit=100").json
+            size = len(app.json.dumps(data).encode())
+            row = [endpoint, size]
+            for name in BACKENDS:
+                dumps = JSON_BACKENDS[name].dumps if name != "flask" else app.json.dumps
+                ms = time_call(lambda: dumps(data), repeat=200)
+                row.append(size / ms / 1000)
+            rows.append(row)
+
+    print_table("Encoding a page of 100 records, MB/s", ["model", "bytes", *BACKENDS], rows)
+
+    rows = []
+    for name in BACKENDS:
+        client = make_app({"API_PAGINATION_SIZE_MAX": 100, "API_JSON_BACKEND": name}).test_client()
+        rows.append([name, time_call(lambda: client.get("/api/books?limit=100"), repeat=30)])
+
+    print_table("List request, /api/books?limit=100", ["backend", "ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Compares encoding a page of each demo model as JSON and as MessagePack, by time to encode and decode, and payload
+size. Needs the ``msgpack`` extra.
+
+    python -m benchmarks.msgpack_encoding
+"""
+import json
+
+import msgpack
+
+from benchmarks.helpers import make_app, time_call, print_table
+
+ENDPOINTS = ["books", "authors", "publishers", "reviews", "categories"]
+
+
+def main():
+    app = make_app({"API_PAGINATION_SIZE_MAX": 100})
+    client = app.test_client()
+
+    rows = []
+    with app.app_context():
+        for endpoint in ENDPOINTS:
+            data = client.get(f"/api/{endpoint}?limit=100").json
+            json_body = app.json.dumps(data)
+            msgpack_body = msgpack.packb(data)
+
+            json_ms = time_call(lambda: app.json.dumps(data), repeat=200)
+            msgpack_ms = time_call(lambda: msgpack.packb(data), repeat=200)
+            json_load_ms = time_call(lambda: json.loads(json_body), repeat=200)
+            msgpack_load_ms = time_call(lambda: msgpack.unpackb(msgpack_body), repeat=200)
+            rows.append(
+                [
+                    endpoint,
+                    json_ms,
+                    msgpack_ms,
+                    json_load_ms,
+                    msgpack_load_ms,
+                    len(json_body.encode()),
+                    len(msgpack_body),
+                    len(msgpack_body) / len(json_body.encode()),
+                ]
+            )
+
+    print_table(
+        "Encoding a page of 100 records",
+        ["model", "json ms", "msgpack ms", "json load ms", "msgpack load ms", "json bytes", "msgpack bytes", "ratio"],
+        rows,
+    )
+
+    rows = []
+    for accept in ["application/json", "application/msgpack"]:
+        ms = time_call(lambda: client.get("/api/books?limit=100", headers={"Accept": accept}), repeat=30)
+        rows.append([accept, ms, len(client.get("/api/books?limit=100", headers={"Accept": accept}).data)])
+
+    print_table("List request, /api/books?limit=100", ["accept", "ms", "bytes"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Startup and per-request time on a synthetic 200 model schema, with the naming and case conversion functions
+memoised, and with their caches switched off.
+
+    python -m benchmarks.naming
+"""
+import itertools
+import time
+import warnings
+from typing import Optional
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import Integer, String, ForeignKey
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+
+from benchmarks.helpers import time_call, print_table
+from flask_scheema import Naan
+from flask_scheema.utilities import MEMOIZED_FUNCTIONS, clear_memo_caches, memo_stats
+
+ADJECTIVES = [
+    "Red", "Blue", "Green", "Quick", "Lazy", "Happy", "Silent", "Bright", "Dark", "Small",
+    "Large", "Early", "Late", "Cold", "Warm", "Brave", "Calm", "Eager", "Fancy", "Gentle",
+]
+NOUNS = ["Order", "Invoice", "Customer", "Address", "Shipment", "Product", "Category", "Supplier", "Payment", "Box"]
+MODEL_COUNT = 200
+
+
+def make_app(memoised: bool):
+    """
+    Builds an app with ``MODEL_COUNT`` models, each with a few columns and a relationship to the previous model.
+
+    Args:
+        memoised (bool): Whether the memo caches are enabled.
+
+    Returns:
+        Tuple[Flask, float]: The app and the time taken to initialise the extension, in ms.
+    """
+
+    class Base(DeclarativeBase):
+        def get_session(*args):
+            return db.session
+
+    db = SQLAlchemy(model_class=Base)
+
+    names = [f"{adjective}{noun}" for adjective, noun in itertools.product(ADJECTIVES, NOUNS)][:MODEL_COUNT]
+
+    # the registry only holds weak references to the classes
+    models = []
+    previous: Optional[tuple] = None
+    for index, name in enumerate(names):
+        attributes = {
+            "__tablename__": f"table_{index}",
+            "id": mapped_column(Integer, primary_key=True),
+            "name": mapped_column(String),
+            "reference_code": mapped_column(String),
+            "Meta": type("Meta", (), {"tag": name, "tag_group": "Benchmark"}),
+            "__annotations__": {"id": Mapped[int], "name": Mapped[str], "reference_code": Mapped[str]},
+        }
+        if previous:
+            previous_table = previous[1]
+            attributes["parent_id"] = mapped_column(ForeignKey(f"{previous_table}.id"))
+            attributes["__annotations__"]["parent_id"] = Mapped[Optional[int]]
+            attributes["parent"] = relationship(previous[0], back_populates="children")
+        if index + 1 < len(names):
+            attributes["children"] = relationship(names[index + 1], back_populates="parent")
+        models.append(type(name, (db.Model,), attributes))
+        previous = (name, attributes["__tablename__"])
+
+    app = Flask(__name__)
+    app.config.update(
+        {
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "API_BASE_MODEL": db.Model,
+            "API_TITLE": "Benchmark",
+            "API_VERSION": "0.1.0",
+            "API_VERBOSITY_LEVEL": 0,
+            "API_CREATE_DOCS": False,
+        }
+    )
+    db.init_app(app)
+
+    for func in MEMOIZED_FUNCTIONS.values():
+        func.cache.maxsize = 1024 if memoised else 0
+    clear_memo_caches()
+
+    with app.app_context():
+        db.create_all()
+        scheema = Naan()
+        scheema.route_spec = []
+        start = time.perf_counter()
+        scheema.init_app(app)
+        startup_ms = (time.perf_counter() - start) * 1000
+
+    app.models = models
+    return app, startup_ms
+
+
+def calls() -> int:
+    """
+    Gets the number of calls made to the memoised functions so far.
+
+    Returns:
+        int: Hits plus misses over all the functions.
+    """
+    return sum(stats["hits"] + stats["misses"] for stats in memo_stats().values())
+
+
+def hits() -> int:
+    """
+    Gets the number of calls answered from the memo caches so far.
+
+    Returns:
+        int: Hits over all the functions.
+    """
+    return sum(stats["hits"] for stats in memo_stats().values())
+
+
+def main():
+    warnings.simplefilter("ignore")
+    rows = []
+    urls = ["/api/quick-orders?fields=name,id", "/api/happy-customers?order_by=-name"]
+    for memoised in [False, True]:
+        start_calls, start_hits = calls(), hits()
+        app, startup_ms = make_app(memoised)
+        startup_calls, startup_hits = calls() - start_calls, hits() - start_hits
+
+        client = app.test_client()
+        start_calls, start_hits = calls(), hits()
+        request_ms = sum(time_call(lambda: client.get(url), repeat=50) for url in urls) / len(urls)
+        request_calls, request_hits = calls() - start_calls, hits() - start_hits
+
+        rows.append(
+            [
+                "on" if memoised else "off",
+                MODEL_COUNT,
+                startup_ms,
+                f"{startup_hits}/{startup_calls}",
+                request_ms,
+                f"{request_hits}/{request_calls}",
+            ]
+        )
+
+    print_table(
+        "Naming memoisation",
+        ["memo", "models", "startup ms", "startup hits/calls", "request ms", "request hits/calls"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
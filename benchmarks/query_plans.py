@@ -0,0 +1,54 @@
+"""
+Time to work out the query for a filtered list request, building it from the request arguments each time against
+binding the values into a cached query plan, and the time for the whole request with the plan cache on and off.
+
+    python -m benchmarks.query_plans
+"""
+from benchmarks.helpers import make_app, time_call, print_table
+from demo.basic_factory.basic_factory.models import Book
+from flask_scheema.services.database import CrudService
+from flask_scheema.services.planner import build_query_plan, get_query_plan, get_query_plan_stats, normalise_args
+
+ARGS = [
+    {"id__gt": "3"},
+    {"id__gt": "3", "title__like": "the", "order_by": "-id"},
+    {"id__in": "(1,2,3,4,5)", "or[title__like": "a, author_id__eq=2]", "fields": "id,title"},
+]
+
+
+def main():
+    app = make_app()
+
+    rows = []
+    with app.test_request_context("/api/books"):
+        service = CrudService(Book, session=app.extensions["sqlalchemy"].session)
+        for args in ARGS:
+            def build():
+                shape, values = normalise_args(args)
+                return build_query_plan(service, shape).bind(values)
+
+            def bind():
+                plan, values = get_query_plan(service, args)
+                return plan.bind(values)
+
+            build_ms = time_call(build, repeat=200)
+            plan_ms = time_call(bind, repeat=200)
+            rows.append(["&".join(f"{k}={v}" for k, v in args.items()), build_ms, plan_ms, build_ms / plan_ms])
+
+    print_table("Query preparation", ["args", "build ms", "plan ms", "speedup"], rows)
+
+    rows = []
+    for size in [0, 256]:
+        app = make_app({"API_QUERY_PLAN_CACHE_SIZE": size})
+        client = app.test_client()
+        url = "/api/books?id__gt=3&title__like=the&order_by=-id&limit=20"
+        rows.append([size, time_call(lambda: client.get(url), repeat=50)])
+        with app.app_context():
+            stats = get_query_plan_stats()
+        rows[-1].append(stats["build"]["count"])
+
+    print_table("List request", ["cache size", "ms", "plans built"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Compares repeated list and record requests with the response cache off, on, and just after a write has invalidated
+it, and reports the cache's statistics.
+
+    python -m benchmarks.response_cache
+"""
+from benchmarks.helpers import make_app, time_call, print_table
+from flask_scheema.api.caching import get_response_cache_stats
+
+URLS = ["/api/books?limit=100", "/api/books?limit=20&order_by=-publication_date", "/api/books/1", "/api/authors"]
+
+
+def main():
+    uncached = make_app({"API_PAGINATION_SIZE_MAX": 100}).test_client()
+    app = make_app({"API_PAGINATION_SIZE_MAX": 100, "API_RESPONSE_CACHE": True})
+    cached = app.test_client()
+
+    def after_write(url):
+        cached.patch("/api/books/2", json={"title": "A new title"})
+        return cached.get(url)
+
+    rows = []
+    for url in URLS:
+        off_ms = time_call(lambda: uncached.get(url), repeat=50)
+        hit_ms = time_call(lambda: cached.get(url), repeat=50)
+        write_ms = time_call(lambda: after_write(url), repeat=20)
+        rows.append([url, off_ms, hit_ms, off_ms / hit_ms, write_ms])
+
+    print_table("GET requests", ["url", "uncached ms", "hit ms", "speedup", "patch + miss ms"], rows)
+
+    with app.app_context():
+        stats = get_response_cache_stats()
+    print_table(
+        "Response cache",
+        ["hits", "misses", "hit ratio", "entries", "bytes", "invalidated entries"],
+        [[stats["hits"], stats["misses"], stats["hit_ratio"], stats["entries"], stats["bytes"],
+          stats["invalidated_entries"]]],
+    )
+
+
+if __name__ == "__main__":
+    main()
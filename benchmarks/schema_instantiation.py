@@ -0,0 +1,36 @@
+"""
+Times creating an output schema instance, with the field templates warm and with them cleared before every instance
+(which is what every request used to pay).
+
+    python -m benchmarks.schema_instantiation
+"""
+from benchmarks.helpers import make_app, time_call, print_table
+from demo.basic_factory.basic_factory.models import Author, Book, Publisher
+from flask_scheema.scheema.bases import FIELD_TEMPLATE_EXTENSION
+from flask_scheema.scheema.utils import get_input_output_from_model_or_make
+
+
+def main():
+    app = make_app()
+    rows = []
+    with app.test_request_context("/"):
+        for model in [Author, Book, Publisher]:
+            _, schema = get_input_output_from_model_or_make(model)
+
+            def rebuild():
+                app.extensions.pop(FIELD_TEMPLATE_EXTENSION, None)
+                schema(many=True)
+
+            uncached_ms = time_call(rebuild, repeat=200)
+            cached_ms = time_call(lambda: schema(many=True), repeat=200)
+            rows.append([model.__name__, len(schema().fields), uncached_ms * 1000, cached_ms * 1000])
+
+    print_table(
+        "Schema instantiation",
+        ["model", "fields", "rebuilt us", "template us"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import dataclasses
 import secrets
 import time
 from types import FunctionType
@@ -7,7 +8,11 @@ from flask import current_app, Blueprint, g
 from sqlalchemy.orm import Session
 from werkzeug.exceptions import default_exceptions
 
+from flask_scheema.api.caching import cache_responses, get_cache_tags, get_response_cache
+from flask_scheema.api.decorators import handle_many, handle_one
+from flask_scheema.api.encoding import validate_json_backend
 from flask_scheema.api.exception_handling import handle_http_exception
+from flask_scheema.api.plan import build_route_plan
 from flask_scheema.api.utils import (
     get_description,
     setup_route_function,
@@ -19,10 +24,13 @@ from flask_scheema.api.utils import (
 )
 from flask_scheema.logging import logger
 from flask_scheema.scheema.bases import DeleteSchema
+from flask_scheema.scheema.compiler import get_compiled_serializer
 from flask_scheema.scheema.utils import (
     get_input_output_from_model_or_make,
 )
+from flask_scheema.services.attributes import get_attribute_index
 from flask_scheema.services.database import CrudService
+from flask_scheema.services.writes import track_session_writes
 from flask_scheema.utilities import (
     AttributeInitializerMixin,
     get_config_or_model_meta,
@@ -52,6 +60,8 @@ class RiceAPI(AttributeInitializerMixin):
 
         super().__init__(*args, **kwargs)
         self.naan = naan
+        # cached counts are dropped when their models are written to
+        track_session_writes()
 
         if self.api_full_auto:
             self.setup_models()
@@ -134,6 +144,8 @@ class RiceAPI(AttributeInitializerMixin):
                     "The user model must have an email and password or api_key field if a authentication function is set."
                 )
 
+        validate_json_backend(get_config_or_model_meta("API_JSON_BACKEND", default="flask"))
+
     def create_routes(self):
         """
         Creates all the routes for the api.
@@ -189,6 +201,9 @@ class RiceAPI(AttributeInitializerMixin):
 
         """
 
+        # filters and field selection resolve names against the index, build it now rather than on the first request
+        get_attribute_index(model)
+
         for _method in ["GETS", "GET", "POST", "PATCH", "DELETE"]:
             kwargs = self._prepare_route_data(model, session, _method)
             self.generate_route(**kwargs)
@@ -375,8 +390,10 @@ class RiceAPI(AttributeInitializerMixin):
         http_method: str = kwargs.get("method", "GET")
 
         # Get blocked methods from Meta class, if any
-        blocked_methods = get_config_or_model_meta(
-            "API_BLOCK_METHODS", model=model, default=[], allow_join=True
+        blocked_methods = list(
+            get_config_or_model_meta(
+                "API_BLOCK_METHODS", model=model, default=[], allow_join=True
+            )
         )
 
         # Check if flask-schema is read only, if it is, block all methods except GET
@@ -404,6 +421,19 @@ class RiceAPI(AttributeInitializerMixin):
             kwargs["output_schema"] = DeleteSchema
 
 
+        # Resolve everything the route needs per request, the composed handler is added once the view exists.
+        plan = build_route_plan(
+            model,
+            http_method,
+            many=kwargs.get("many", False),
+            output_schema=kwargs.get("output_schema"),
+            input_schema=kwargs.get("input_schema"),
+        )
+
+        # compile the serializer for the route's output up front, when enabled
+        if plan.output_schema and get_config_or_model_meta("API_COMPILED_SERIALIZER", default=False):
+            get_compiled_serializer(plan.output_schema(many=plan.many))
+
         # Get the route function
         route_function = setup_route_function(
             service,
@@ -411,6 +441,8 @@ class RiceAPI(AttributeInitializerMixin):
             many=kwargs.get("many", False),
             join_model=kwargs.get("parent_model", None),
             get_field=kwargs.get("join_key"),
+            pre_hook=plan.pre_hook,
+            post_hook=plan.post_hook,
             **{k:v for k,v in kwargs.items() if k not in ["method", "many", "join_model", "get_field","http_method", "service"]}
         )
 
@@ -431,6 +463,14 @@ class RiceAPI(AttributeInitializerMixin):
         )
         kwargs["function"] = unique_route_function
 
+        handle = handle_many if plan.many else handle_one
+        handler = handle(plan.output_schema, plan.input_schema)(unique_route_function)
+        if plan.method == "GET" and plan.response_cache:
+            # cache the route's responses until a model they are made from is written to, see API_RESPONSE_CACHE
+            get_response_cache()
+            handler = cache_responses(handler, model, get_cache_tags(model, kwargs.get("parent_model")))
+        kwargs["plan"] = dataclasses.replace(plan, handler=handler)
+
         logger.debug(
             4,
             f"Creating route function ${unique_function_name}$ for model -{model.__name__}-",
@@ -492,8 +532,12 @@ class RiceAPI(AttributeInitializerMixin):
             "API_ENDPOINT_NAMER", model, default=endpoint_namer
         )
 
+        # the endpoint is named once, each call only formats the primary key into the url
+        url_prefix = f"{api_prefix}/{url_naming_function(model)}/"
+        primary_key = primary_keys[0]
+
         def to_url(self):
-            return f"{api_prefix}/{url_naming_function(model)}/{getattr(self, primary_keys[0])}"
+            return f"{url_prefix}{getattr(self, primary_key)}"
 
         logger.log(3, f"Adding method $to_url$ to model -{model.__name__}-")
         setattr(model, "to_url", to_url)
@@ -525,8 +569,11 @@ class RiceAPI(AttributeInitializerMixin):
 
         parent_pk = get_primary_keys(parent).key
 
+        url_prefix = f"{api_prefix}/{parent_endpoint}/"
+        url_suffix = f"/{child_endpoint_function_name}"
+
         def to_url(self):
-            return f"{api_prefix}/{parent_endpoint}/{getattr(self, parent_pk)}/{child_endpoint_function_name}"
+            return f"{url_prefix}{getattr(self, parent_pk)}{url_suffix}"
 
         logger.log(
             3,
@@ -0,0 +1,406 @@
+import hashlib
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from flask import Response, current_app, g, has_app_context, request
+from sqlalchemy import inspect
+
+from flask_scheema.api.plan import get_route_plan
+from flask_scheema.services.writes import add_write_listener
+from flask_scheema.utilities import config_generation, get_config_or_model_meta
+
+RESPONSE_CACHE_EXTENSION = "flask_scheema_response_cache"
+
+# response headers that are never stored with a cached response
+UNCACHED_HEADERS = ("Set-Cookie", "Content-Length", "X-Cache")
+
+
+class ResponseCacheBackend(ABC):
+    """
+    Stores cached responses, and the version of each model they were made from. Entries are tagged with the names
+    of the models they depend on, so writing to a model drops them and moves its version on. Keys made with the
+    old version are never read again, so a response cached while a write was being made isn't served either.
+
+    Subclasses implement ``get``, ``set``, ``versions``, ``invalidate`` and ``size``, the hit, miss and invalidation
+    counts are kept here.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations: Dict[str, int] = {}
+        self.invalidated_entries = 0
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Gets a cached response, None if it isn't cached or has expired.
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str]):
+        """
+        Caches a response for ``ttl`` seconds, tagged with the names of the models it was made from.
+        """
+
+    @abstractmethod
+    def versions(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        """
+        Gets the current version of each tag, for the cache key.
+        """
+
+    @abstractmethod
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """
+        Moves the tags' versions on and drops their entries, returning how many were dropped.
+        """
+
+    @abstractmethod
+    def size(self) -> Dict[str, Optional[int]]:
+        """
+        Gets the number of entries held and their size in bytes, with any other figures the backend keeps.
+        """
+
+    def record_lookup(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def record_invalidation(self, tags: Iterable[str], entries: int):
+        with self._lock:
+            for tag in tags:
+                self.invalidations[tag] = self.invalidations.get(tag, 0) + 1
+            self.invalidated_entries += entries
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Gets the statistics for the cache.
+
+        Returns:
+            dict: The hits, misses and hit ratio, the number of entries and bytes held, the number of invalidations per
+            model and the number of entries they dropped.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            **self.size(),
+            "invalidations": dict(self.invalidations),
+            "invalidated_entries": self.invalidated_entries,
+        }
+
+
+class MemoryResponseCache(ResponseCacheBackend):
+    """
+    An in process least recently used cache, limited both by the number of entries and the bytes they hold.
+    """
+
+    def __init__(self, maxsize: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initializes the cache.
+
+        Args:
+            maxsize (int): The maximum number of entries.
+            max_bytes (int): The maximum size of the cached bodies and headers, in bytes.
+        """
+        super().__init__()
+        self._data: OrderedDict = OrderedDict()
+        self._tags: Dict[str, set] = {}
+        self._versions: Dict[str, int] = {}
+        self.maxsize = max(int(maxsize or 0), 0)
+        self.max_bytes = max(int(max_bytes or 0), 0)
+        self.bytes = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str]):
+        if not self.maxsize or len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            tags = tuple(tags)
+            self._data[key] = (time.monotonic() + ttl, value, tags)
+            self.bytes += len(value)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._data) > self.maxsize or self.bytes > self.max_bytes:
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def _remove(self, key: str):
+        _, value, tags = self._data.pop(key)
+        self.bytes -= len(value)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+
+    def versions(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        return tuple(self._versions.get(tag, 0) for tag in tags)
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+                for key in self._tags.pop(tag, set()):
+                    if key in self._data:
+                        self._remove(key)
+                        removed += 1
+        return removed
+
+    def size(self) -> Dict[str, Optional[int]]:
+        return {
+            "entries": len(self._data),
+            "bytes": self.bytes,
+            "maxsize": self.maxsize,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+class RedisResponseCache(ResponseCacheBackend):
+    """
+    A cache shared between processes, held in Redis or any server with the same commands. The model versions are
+    kept in Redis too, so a write in one process invalidates the responses cached by all of them.
+    """
+
+    def __init__(self, client: Any, prefix: str = "flask_scheema:response:"):
+        """
+        Initializes the cache.
+
+        Args:
+            client (Any): A ``redis.Redis`` client, or one with the same ``get``, ``set``, ``mget``, ``incr``,
+                ``sadd``, ``smembers``, ``expire``, ``delete``, ``scan_iter`` and ``memory_usage`` methods.
+            prefix (str): Prepended to every key the cache uses.
+        """
+        super().__init__()
+        self.client = client
+        self.prefix = prefix
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def _version_key(self, tag: str) -> str:
+        return f"{self.prefix}version:{tag}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str]):
+        key = self.prefix + key
+        self.client.set(key, value, ex=ttl)
+        # the tag sets only let invalidation free the entries early, the versions in the key keep them from being read
+        for tag in tags:
+            self.client.sadd(self._tag_key(tag), key)
+            self.client.expire(self._tag_key(tag), ttl)
+
+    def versions(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        tags = list(tags)
+        if not tags:
+            return ()
+        return tuple(int(version or 0) for version in self.client.mget([self._version_key(tag) for tag in tags]))
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        removed = 0
+        for tag in tags:
+            self.client.incr(self._version_key(tag))
+            keys = list(self.client.smembers(self._tag_key(tag)))
+            if keys:
+                removed += self.client.delete(*keys)
+            self.client.delete(self._tag_key(tag))
+        return removed
+
+    def size(self) -> Dict[str, Optional[int]]:
+        # held by the server and shared with the other processes, so read from it. This scans the prefix, so is
+        # meant for metrics rather than every request.
+        entries = 0
+        size = 0
+        internal = (self._tag_key(""), self._version_key(""))
+        for key in self.client.scan_iter(match=f"{self.prefix}*", count=1000):
+            name = key.decode() if isinstance(key, bytes) else key
+            if name.startswith(internal):
+                continue
+            usage = self.client.memory_usage(key)
+            if usage is not None:
+                entries += 1
+                size += usage
+        return {"entries": entries, "bytes": size}
+
+
+def _create_backend() -> ResponseCacheBackend:
+    backend = get_config_or_model_meta("API_RESPONSE_CACHE_BACKEND", default="memory")
+    if isinstance(backend, ResponseCacheBackend):
+        return backend
+    if backend == "memory":
+        return MemoryResponseCache(
+            get_config_or_model_meta("API_RESPONSE_CACHE_SIZE", default=1024),
+            get_config_or_model_meta("API_RESPONSE_CACHE_MAX_BYTES", default=64 * 1024 * 1024),
+        )
+    if backend == "redis":
+        client = get_config_or_model_meta("API_RESPONSE_CACHE_REDIS", default=None)
+        if client is None or isinstance(client, str):
+            try:
+                import redis
+            except ImportError:
+                raise ImportError("The redis response cache needs redis-py, pip install redis")
+            client = redis.Redis.from_url(client or "redis://127.0.0.1:6379")
+        return RedisResponseCache(client)
+    raise ValueError(
+        f"API_RESPONSE_CACHE_BACKEND must be 'memory', 'redis' or a ResponseCacheBackend, not {backend!r}"
+    )
+
+
+def _invalidate_written_models(models: Tuple[Any, ...]):
+    backend = get_response_cache()
+    if backend is not None and models:
+        tags = sorted({model.__name__ for model in models})
+        backend.record_invalidation(tags, backend.invalidate(tags))
+
+
+def get_response_cache() -> Optional[ResponseCacheBackend]:
+    """
+    Gets the response cache for the current app, creating it from the config the first time. A new cache replaces
+    the old one whenever the config cache is invalidated.
+
+    Returns:
+        Optional[ResponseCacheBackend]: The cache, or None if outside an app context.
+    """
+    if not has_app_context():
+        return None
+    generation = config_generation()
+    entry = current_app.extensions.get(RESPONSE_CACHE_EXTENSION)
+    if entry is None or entry[0] != generation:
+        entry = current_app.extensions[RESPONSE_CACHE_EXTENSION] = (generation, _create_backend())
+        add_write_listener(_invalidate_written_models)
+    return entry[1]
+
+
+def get_response_cache_stats() -> Dict[str, Any]:
+    """
+    Gets the statistics of the current app's response cache.
+
+    Returns:
+        dict: See :meth:`ResponseCacheBackend.stats`, empty if there is no cache.
+    """
+    entry = current_app.extensions.get(RESPONSE_CACHE_EXTENSION) if has_app_context() else None
+    return entry[1].stats() if entry else {}
+
+
+def get_cache_tags(model: Any, parent_model: Any = None) -> List[str]:
+    """
+    Gets the names of the models a route's responses are made from, its model, the models it is related to (as they
+    can be dumped as nested records) and the parent model of a relation route.
+
+    Args:
+        model (Any): The route's model.
+        parent_model (Any): The parent model, for relation routes.
+
+    Returns:
+        List[str]: The model names, sorted.
+    """
+    models = {model, *(relationship.mapper.class_ for relationship in inspect(model).relationships)}
+    if parent_model is not None:
+        models.add(parent_model)
+    return sorted(related.__name__ for related in models)
+
+
+def _get_user_key(model: Any) -> Any:
+    if not get_config_or_model_meta("API_AUTHENTICATE", model=model, default=False):
+        return None
+    # set by the authentication decorators
+    user = g.get("current_user")
+    if user is not None:
+        state = inspect(user, raiseerr=False)
+        return (type(user).__name__, state.identity) if state is not None else repr(user)
+    authorization = request.headers.get("Authorization")
+    return hashlib.sha1(authorization.encode()).hexdigest() if authorization else None
+
+
+def make_cache_key(model: Any, versions: Tuple[int, ...]) -> str:
+    """
+    Makes the cache key of the current request, from the route, the query arguments in a normal order, the
+    ``Accept`` header, the user when authentication is on, and the versions of the models it depends on.
+
+    Args:
+        model (Any): The route's model.
+        versions (Tuple[int, ...]): The versions of the route's cache tags.
+
+    Returns:
+        str: The key.
+    """
+    args = tuple(sorted(request.args.items(multi=True)))
+    parts = (request.path, args, request.headers.get("Accept"), _get_user_key(model), versions)
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def dump_response(response: Response) -> bytes:
+    headers = [[key, value] for key, value in response.headers.items() if key not in UNCACHED_HEADERS]
+    head = json.dumps({"status": response.status_code, "headers": headers}).encode()
+    return head + b"\n" + response.get_data()
+
+
+def load_response(value: bytes) -> Response:
+    head, body = value.split(b"\n", 1)
+    head = json.loads(head)
+    return Response(body, status=head["status"], headers=head["headers"])
+
+
+def cache_responses(handler: Callable, model: Any, tags: List[str]) -> Callable:
+    """
+    Wraps a generated GET route's handler so its successful responses are cached, see ``API_RESPONSE_CACHE``.
+
+    Args:
+        handler (Callable): The route's handler.
+        model (Any): The route's model.
+        tags (List[str]): The names of the models its responses are made from, from :func:`get_cache_tags`.
+
+    Returns:
+        Callable: The wrapped handler.
+    """
+
+    @wraps(handler)
+    def wrapper(*args, **kwargs):
+        backend = get_response_cache()
+        if backend is None:
+            return handler(*args, **kwargs)
+
+        key = make_cache_key(model, backend.versions(tags))
+        value = backend.get(key)
+        backend.record_lookup(value is not None)
+        if value is not None:
+            response = load_response(value)
+            response.headers["X-Cache"] = "HIT"
+            return response.make_conditional(request) if "ETag" in response.headers else response
+
+        response = handler(*args, **kwargs)
+        if response.status_code == 200 and not response.is_streamed and "Set-Cookie" not in response.headers:
+            plan = get_route_plan()
+            ttl = plan.response_cache_ttl if plan else get_config_or_model_meta(
+                "API_RESPONSE_CACHE_TTL", model=model, default=300
+            )
+            backend.set(key, dump_response(response), ttl, tags)
+        response.headers["X-Cache"] = "MISS"
+        return response
+
+    return wrapper
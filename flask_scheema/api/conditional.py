@@ -0,0 +1,67 @@
+import hashlib
+from typing import Any
+
+from flask import Response, g, request
+
+from flask_scheema.api.encoding import JSON_BACKENDS
+from flask_scheema.api.plan import get_route_plan
+from flask_scheema.api.responses import CustomResponse
+from flask_scheema.services.validators import Validators, make_etag
+
+
+def _set_cache_control(response: Response) -> Response:
+    plan = get_route_plan()
+    if plan and plan.method == "GET" and plan.cache_control:
+        response.headers["Cache-Control"] = plan.cache_control
+    return response
+
+
+def _set_validator_headers(response: Response, validators: Validators) -> Response:
+    _set_cache_control(response)
+    # weak, as the validators follow the data rather than the exact bytes, e.g. the envelope's datetime
+    response.set_etag(validators.etag, weak=True)
+    if validators.last_modified is not None:
+        response.last_modified = validators.last_modified
+    response.vary.add("Accept")
+    return response
+
+
+def not_modified_response(validators: Validators) -> Response:
+    """
+    Creates the empty 304 response for a conditional GET whose validators still match.
+
+    Args:
+        validators (Validators): The current validators.
+
+    Returns:
+        Response: The response.
+    """
+    return _set_validator_headers(Response(status=304), validators)
+
+
+def add_validators(response: Response, value: Any) -> Response:
+    """
+    Adds the ``Cache-Control``, ``ETag`` and ``Last-Modified`` headers to a successful GET response from a generated
+    route, and turns it into a 304 if the request's conditional headers match. Without cheap validators, the ETag
+    is a hash of the dumped value.
+
+    Args:
+        response (Response): The response.
+        value (Any): The value the response was made from.
+
+    Returns:
+        Response: The response, or a 304 response.
+    """
+    validators = g.pop("response_validators", None)
+    if response.status_code != 200:
+        return response
+    if validators is None:
+        return _set_cache_control(response)
+
+    if validators.etag is None:
+        if isinstance(value, CustomResponse):
+            value = (value.value, value.count, value.next_url, value.previous_url)
+        digest = hashlib.sha1(JSON_BACKENDS["stdlib"].dumps(value)).hexdigest()
+        validators = Validators(etag=make_etag(digest))
+
+    return _set_validator_headers(response, validators).make_conditional(request)
@@ -2,21 +2,27 @@ from functools import wraps
 from typing import Optional, List
 from typing import Type, Callable, Any, Dict, Union
 
-from flask import request
+from flask import Response, request
 from marshmallow import Schema
 from sqlalchemy.exc import ProgrammingError
 from werkzeug.exceptions import HTTPException
 
+from flask_scheema.api.conditional import add_validators, not_modified_response
+from flask_scheema.api.encoding import get_request_data
+from flask_scheema.api.plan import get_route_plan
 from flask_scheema.api.responses import (
     deserialize_data,
     serialize_output_with_mallow,
     create_response,
     CustomResponse,
 )
+from flask_scheema.api.streaming import create_stream_response
 from flask_scheema.api.utils import list_model_columns, convert_case
 from flask_scheema.exceptions import CustomHTTPException
 from flask_scheema.scheema.bases import AutoScheema
-from flask_scheema.utilities import get_config_or_model_meta
+from flask_scheema.services.streaming import RowStream
+from flask_scheema.services.validators import NotModified
+from flask_scheema.utilities import get_config_or_model_meta, get_app_cache
 
 HTTP_OK = 200
 HTTP_BAD_REQUEST = 400
@@ -24,6 +30,8 @@ HTTP_INTERNAL_SERVER_ERROR = 500
 HTTP_UNAUTHORIZED = 401
 HTTP_FORBIDDEN = 403
 
+PROJECTION_CACHE_EXTENSION = "flask_scheema_projections"
+
 
 def handle_many(output_schema: Type[AutoScheema], input_schema=None) -> Callable:
     """
@@ -66,10 +74,14 @@ def handle_many(output_schema: Type[AutoScheema], input_schema=None) -> Callable
             if new_output_schema:
                 model = new_output_schema.Meta.model
 
-                model_columns = list_model_columns(
-                    model
-                )  # todo check whats happening here!! Why is this here?
-                schema_columns = list_schema_fields(new_output_schema)
+                # streamed rows are dumped as they are written, see API_STREAM_BATCH_SIZE
+                if isinstance(result, dict) and isinstance(result.get("query"), RowStream):
+                    return create_stream_response(new_output_schema, result)
+
+                # the columns are only compared when the query returned rows rather than models
+                has_rows = isinstance(result, dict) and result.get("dictionary")
+                model_columns = list_model_columns(model) if has_rows else []
+                schema_columns = list_schema_fields(new_output_schema) if has_rows else []
 
                 return check_serialise_method_and_return(
                     result,
@@ -133,9 +145,10 @@ def handle_one(
 
             # Deserializing and validating input if input_schema is provided
             if input_schema:
-                data_or_error = deserialize_data(input_schema, request.json)
+                data_or_error = deserialize_data(input_schema, get_request_data())
                 if isinstance(data_or_error, tuple):  # This means there was an error
-                    case = get_config_or_model_meta("API_FIELD_CASE", "snake")
+                    plan = get_route_plan()
+                    case = plan.field_case if plan else get_config_or_model_meta("API_FIELD_CASE", "snake")
                     error = {convert_case(k, case): v for k, v in data_or_error[0].items()}
                     raise CustomHTTPException(
                         400, error
@@ -158,7 +171,10 @@ def handle_one(
 
 def get_count(result, value):
     # Check if value is a list, a single item, or None, and adjust count accordingly
-    if result.get("total_count", None):
+    if "total_count" in result and result["total_count"] is None:
+        # the list was not counted, see API_COUNT_MODE
+        return None
+    elif result.get("total_count", None):
         return result.get("total_count")
     elif isinstance(value, list):
         return len(value)
@@ -218,10 +234,14 @@ def handle_result(result):
 def standardize_response(f: Callable) -> Callable:
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        print_exc = get_config_or_model_meta(key="API_PRINT_EXCEPTIONS", default=True)
-        error_func = get_config_or_model_meta(
-            key="API_ERROR_CALLBACK", method=request.method
-        )
+        plan = get_route_plan()
+        if plan:
+            print_exc, error_func = plan.print_exceptions, plan.error_callback
+        else:
+            print_exc = get_config_or_model_meta(key="API_PRINT_EXCEPTIONS", default=True)
+            error_func = get_config_or_model_meta(
+                key="API_ERROR_CALLBACK", method=request.method
+            )
 
         def print_exc_run_error(e):
             """
@@ -244,9 +264,12 @@ def standardize_response(f: Callable) -> Callable:
 
         try:
             result = f(*args, **kwargs)
+            if isinstance(result, Response):
+                # already a full response, e.g. a stream
+                return result
             status_code, value, count, next_url, previous_url = handle_result(result)
             error = None if status_code < HTTP_BAD_REQUEST else value
-            return create_response(
+            response = create_response(
                 value=value if not error else None,
                 errors=error,
                 status=status_code,
@@ -254,7 +277,10 @@ def standardize_response(f: Callable) -> Callable:
                 next_url=next_url,
                 previous_url=previous_url,
             )
+            return add_validators(response, value)
 
+        except NotModified as e:
+            return not_modified_response(e.validators)
         except HTTPException as e:
             print_exc_run_error(e)
             return create_response(
@@ -329,9 +355,14 @@ def fields(model_schema: Type[AutoScheema], many: bool = False) -> Callable:
 
             """
             select_fields = request.args.get("fields")
-            if select_fields and get_config_or_model_meta("API_ALLOW_SELECT_FIELDS", model_schema.get_model(), default=True):
-                select_fields = select_fields.split(",")
-                kwargs["schema"] = model_schema(many=many, only=select_fields)
+            plan = get_route_plan()
+            allow_select = (
+                plan.allow_select_fields
+                if plan
+                else get_config_or_model_meta("API_ALLOW_SELECT_FIELDS", model_schema.get_model(), default=True)
+            )
+            if select_fields and allow_select:
+                kwargs["schema"] = get_projected_schema(model_schema, many, select_fields.split(","))
             else:
                 kwargs["schema"] = model_schema(many=many)
             return func(*args, **kwargs)
@@ -341,6 +372,36 @@ def fields(model_schema: Type[AutoScheema], many: bool = False) -> Callable:
     return decorator
 
 
+def get_projected_schema(model_schema: Type[AutoScheema], many: bool, select_fields: List[str]) -> AutoScheema:
+    """
+    Gets a schema instance restricted to the selected fields. Prepared schemas are kept in a bounded LRU cache
+    (sized by ``API_PROJECTION_CACHE_SIZE``), as clients tend to reuse a small number of projections. Entries are
+    keyed on the fields in the order they were asked for, as that is the order of the dumped keys.
+
+    Args:
+        model_schema (Type[AutoScheema]): The schema class.
+        many (bool): Whether the schema serializes multiple objects.
+        select_fields (List[str]): The field names to return.
+
+    Returns:
+        AutoScheema: The projected schema.
+
+    Raises:
+        CustomHTTPException: If a field name is not in the schema, these are never cached.
+    """
+    cache = get_app_cache(PROJECTION_CACHE_EXTENSION, "API_PROJECTION_CACHE_SIZE")
+    key = (model_schema, many, tuple(select_fields))
+    schema = cache.get(key) if cache is not None else None
+    if schema is None:
+        try:
+            schema = model_schema(many=many, only=select_fields)
+        except KeyError as e:
+            raise CustomHTTPException(HTTP_BAD_REQUEST, f"Invalid field name: {e.args[0]}")
+        if cache is not None:
+            cache.set(key, schema)
+    return schema
+
+
 def list_schema_fields(schema: Schema):
     """
         Get all the fields from a schema
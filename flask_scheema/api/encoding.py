@@ -0,0 +1,251 @@
+import json
+import math
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+
+from flask import Response, current_app, has_request_context, jsonify, request
+
+from flask_scheema.exceptions import CustomHTTPException
+from flask_scheema.utilities import get_config_or_model_meta
+
+try:
+    import msgpack
+except ImportError:  # msgpack is an optional extra, flask-scheema[msgpack]
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional extra, flask-scheema[orjson]
+    orjson = None
+
+JSON_MIMETYPE = "application/json"
+MSGPACK_MIMETYPE = "application/msgpack"
+
+# the types MessagePack is negotiated with, the first is the one responses are sent as.
+MSGPACK_MIMETYPES = (MSGPACK_MIMETYPE, "application/x-msgpack")
+
+
+@dataclass(frozen=True)
+class JSONBackend:
+    """
+    Encodes response bodies to, and decodes request bodies from, JSON.
+    """
+
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+def json_default(value: Any) -> Any:
+    """
+    Converts the values the JSON encoders don't hold natively. Dates and times are written in ISO 8601, decimals as
+    strings so no precision is lost, UUIDs in their hyphenated form and enums as their values.
+
+    Args:
+        value (Any): The value to convert.
+
+    Returns:
+        Any: A value the encoder can write.
+
+    Raises:
+        TypeError: If the value can't be converted.
+    """
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _finite(data: Any) -> Any:
+    # NaN and infinity aren't valid JSON, they are written as null, as orjson does
+    if isinstance(data, float):
+        return data if math.isfinite(data) else None
+    if isinstance(data, dict):
+        return {key: _finite(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_finite(value) for value in data]
+    return data
+
+
+def _iso_dates(data: Any) -> Any:
+    # the app's JSON provider writes datetimes as HTTP dates, the backends in ISO 8601, as documented
+    if isinstance(data, (datetime, date, time)):
+        return data.isoformat()
+    if isinstance(data, dict):
+        return {key: _iso_dates(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_iso_dates(value) for value in data]
+    return data
+
+
+def _stdlib_dumps(data: Any) -> bytes:
+    try:
+        text = json.dumps(data, default=json_default, ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+    except ValueError:
+        text = json.dumps(_finite(data), default=json_default, ensure_ascii=False, separators=(",", ":"))
+    return text.encode()
+
+
+def _orjson_dumps(data: Any) -> bytes:
+    try:
+        return orjson.dumps(data, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError:
+        # e.g. integers wider than 64 bits, which only the standard library can write
+        return _stdlib_dumps(data)
+
+
+# the encoders API_JSON_BACKEND can name, ``flask`` uses the app's own JSON provider and ``auto`` picks orjson when
+# it is installed.
+JSON_BACKENDS: Dict[str, Optional[JSONBackend]] = {
+    "stdlib": JSONBackend(_stdlib_dumps, json.loads),
+    "orjson": JSONBackend(_orjson_dumps, orjson.loads) if orjson else None,
+}
+
+
+def validate_json_backend(backend: Any):
+    """
+    Checks the ``API_JSON_BACKEND`` setting names an available encoder, or is an object with ``dumps`` and ``loads``.
+
+    Args:
+        backend (Any): The setting's value.
+
+    Raises:
+        ValueError: If the backend is unknown, or its package is not installed.
+    """
+    if backend in ("flask", "auto") or JSON_BACKENDS.get(backend) is not None:
+        return
+    if backend == "orjson":
+        raise ValueError("API_JSON_BACKEND is 'orjson', but orjson is not installed, pip install flask-scheema[orjson]")
+    has_functions = callable(getattr(backend, "dumps", None)) and callable(getattr(backend, "loads", None))
+    if isinstance(backend, str) or not has_functions:
+        raise ValueError(
+            f"API_JSON_BACKEND must be one of flask, auto, {', '.join(JSON_BACKENDS)}, or an object with dumps and "
+            f"loads functions, not {backend!r}"
+        )
+
+
+def get_json_backend() -> Optional[JSONBackend]:
+    """
+    Gets the encoder set with ``API_JSON_BACKEND``.
+
+    Returns:
+        Optional[JSONBackend]: The encoder, or None to use the app's JSON provider.
+    """
+    backend = get_config_or_model_meta("API_JSON_BACKEND", default="flask")
+    if backend == "flask":
+        return None
+    if backend == "auto":
+        return JSON_BACKENDS["orjson"] or JSON_BACKENDS["stdlib"]
+    if isinstance(backend, str):
+        return JSON_BACKENDS[backend]
+    return backend
+
+
+def get_json_dumps() -> Callable[[Any], str]:
+    """
+    Gets a function that encodes a value as JSON text with the encoder set with ``API_JSON_BACKEND``, for formats
+    that hold JSON inside them, e.g. the lines of NDJSON or the cells of CSV, so they match JSON responses.
+
+    Returns:
+        Callable[[Any], str]: Takes the value, returns its JSON.
+    """
+    backend = get_json_backend()
+    if backend is None:
+        return current_app.json.dumps
+
+    def dumps(value: Any) -> str:
+        text = backend.dumps(value)
+        return text.decode() if isinstance(text, bytes) else text
+
+    return dumps
+
+
+def wants_msgpack() -> bool:
+    """
+    Checks whether the request prefers MessagePack to JSON in its ``Accept`` header. MessagePack is only offered when
+    the ``msgpack`` package is installed.
+
+    Returns:
+        bool: True to send the response as MessagePack.
+    """
+    if msgpack is None or not has_request_context():
+        return False
+    return request.accept_mimetypes.best_match([JSON_MIMETYPE, *MSGPACK_MIMETYPES]) in MSGPACK_MIMETYPES
+
+
+def get_request_data() -> Any:
+    """
+    Gets the body of the request, decoded from MessagePack when its ``Content-Type`` is ``application/msgpack``,
+    otherwise from JSON.
+
+    Returns:
+        Any: The decoded body.
+
+    Raises:
+        CustomHTTPException: If the body is MessagePack and ``msgpack`` is not installed, or it can't be decoded.
+    """
+    if request.mimetype not in MSGPACK_MIMETYPES:
+        backend = get_json_backend()
+        if backend is None or not request.is_json:
+            return request.json
+        try:
+            return backend.loads(request.get_data())
+        except ValueError as e:
+            raise CustomHTTPException(400, f"Invalid JSON body: {e}")
+    if msgpack is None:
+        raise CustomHTTPException(415, "MessagePack request bodies need the msgpack package to be installed.")
+    try:
+        return msgpack.unpackb(request.get_data(), raw=False)
+    except (ValueError, msgpack.UnpackException) as e:
+        raise CustomHTTPException(400, f"Invalid MessagePack body: {e}")
+
+
+def create_msgpack_response(data: Dict[str, Any]) -> Response:
+    """
+    Creates a MessagePack response. Values MessagePack can't hold are converted the same way as for JSON responses.
+
+    Args:
+        data (Dict[str, Any]): The response envelope.
+
+    Returns:
+        Response: The response.
+    """
+    default = json_default if get_json_backend() else getattr(current_app.json, "default", str)
+    return Response(msgpack.packb(data, default=default), mimetype=MSGPACK_MIMETYPE)
+
+
+def create_json_response(data: Dict[str, Any]) -> Response:
+    """
+    Creates a JSON response with the encoder set with ``API_JSON_BACKEND``. With ``API_JSON_VERIFY``, the body is
+    decoded and checked against the app's own JSON provider's encoding of the same data, so switching encoder can be
+    tested not to change what clients read. Key order and number formatting, e.g. ``1e16`` or ``1e+16``, may differ,
+    and the backends' ISO 8601 dates and nulls for NaN and infinity are expected.
+
+    Args:
+        data (Dict[str, Any]): The response envelope.
+
+    Returns:
+        Response: The response.
+
+    Raises:
+        ValueError: If ``API_JSON_VERIFY`` is set and the decoded bodies differ.
+    """
+    backend = get_json_backend()
+    if backend is None:
+        return jsonify(data)
+
+    body = backend.dumps(data)
+    if get_config_or_model_meta("API_JSON_VERIFY", default=False):
+        expected = current_app.json.dumps(_iso_dates(data))
+        # the app's provider writes NaN and infinity as is, the backends as null
+        if json.loads(body) != _finite(json.loads(expected)):
+            raise ValueError(f"API_JSON_BACKEND encoded {body[:200]!r}, the app's JSON provider {expected[:200]!r}")
+    return Response(body, mimetype=JSON_MIMETYPE)
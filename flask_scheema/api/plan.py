@@ -0,0 +1,162 @@
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Optional, Callable, Type, Mapping, FrozenSet, Any
+
+from flask import g, has_app_context
+from marshmallow import Schema
+from sqlalchemy.orm import DeclarativeBase
+
+from flask_scheema.services.operators import OPERATORS
+from flask_scheema.utilities import get_config_or_model_meta, config_generation
+
+# response envelope keys and the config value that switches each one on/off, with its default.
+ENVELOPE_FLAGS = {
+    "datetime": ("API_DUMP_DATETIME", True),
+    "api_version": ("API_DUMP_VERSION", True),
+    "status_code": ("API_DUMP_STATUS_CODE", True),
+    "response_ms": ("API_DUMP_RESPONSE_MS", True),
+    "total_count": ("API_DUMP_TOTAL_COUNT", True),
+    "next_url": ("API_DUMP_NULL_NEXT_URL", True),
+    "previous_url": ("API_DUMP_NULL_PREVIOUS_URL", True),
+    "errors": ("API_DUMP_NULL_ERRORS", False),
+}
+
+
+@dataclass(frozen=True)
+class RoutePlan:
+    """
+    Everything a generated route needs at request time, resolved once when the route is created.
+
+    The plan is placed on ``flask.g`` for the duration of a request, so the response, pagination and error handling
+    code can read from it instead of resolving the config again.
+    """
+
+    model: DeclarativeBase
+    method: str
+    many: bool
+    output_schema: Optional[Type[Schema]] = None
+    input_schema: Optional[Type[Schema]] = None
+    pre_hook: Optional[Callable] = None
+    post_hook: Optional[Callable] = None
+    operators: FrozenSet[str] = frozenset()
+    allow_select_fields: bool = True
+    allow_order_by: bool = True
+    pagination_default: int = 20
+    pagination_max: int = 100
+    count_mode: str = "exact"
+    window_count: bool = True
+    pagination_mode: str = "offset"
+    stream_batch_size: int = 1000
+    conditional_get: bool = False
+    etag_source: str = "auto"
+    last_modified_column: str = "updated_at"
+    cache_control: Optional[str] = None
+    response_cache: bool = False
+    response_cache_ttl: int = 300
+    envelope: Mapping[str, bool] = field(default_factory=lambda: MappingProxyType({}))
+    field_case: str = "snake_case"
+    print_exceptions: bool = True
+    error_callback: Optional[Callable] = None
+    handler: Optional[Callable] = None
+    generation: int = 0
+
+    @property
+    def allow_filter(self) -> bool:
+        return bool(self.operators)
+
+
+def build_route_plan(
+    model: DeclarativeBase,
+    method: str,
+    many: bool = False,
+    output_schema: Optional[Type[Schema]] = None,
+    input_schema: Optional[Type[Schema]] = None,
+    handler: Optional[Callable] = None,
+) -> RoutePlan:
+    """
+    Resolves the configuration for a route and freezes it into a RoutePlan.
+
+    Args:
+        model (DeclarativeBase): The model the route serves.
+        method (str): The HTTP method, ``GETS`` for the multiple record route.
+        many (bool): Whether the route returns multiple records.
+        output_schema (Optional[Type[Schema]]): The output schema.
+        input_schema (Optional[Type[Schema]]): The input schema.
+        handler (Optional[Callable]): The composed request handler for the route.
+
+    Returns:
+        RoutePlan: The route plan.
+    """
+    http_method = "GET" if method == "GETS" else method
+
+    def conf(key, default=None, **kwargs):
+        return get_config_or_model_meta(key, default=default, **kwargs)
+
+    allow_filter = conf("API_ALLOW_FILTER", model=model, default=True)
+
+    return RoutePlan(
+        model=model,
+        method=http_method,
+        many=many,
+        output_schema=output_schema,
+        input_schema=input_schema,
+        pre_hook=conf("API_SETUP_CALLBACK", model=model, method=method),
+        post_hook=conf("API_RETURN_CALLBACK", model=model, method=method),
+        operators=frozenset(OPERATORS) if allow_filter else frozenset(),
+        allow_select_fields=conf("API_ALLOW_SELECT_FIELDS", model=model, default=True),
+        allow_order_by=conf("API_ALLOW_ORDER_BY", model=model, default=True),
+        pagination_default=conf("API_PAGINATION_SIZE_DEFAULT", default=20),
+        pagination_max=conf("API_PAGINATION_SIZE_MAX", default=100),
+        count_mode=conf("API_COUNT_MODE", model=model, default="exact"),
+        window_count=conf("API_WINDOW_COUNT", model=model, default=True),
+        pagination_mode=conf("API_PAGINATION_MODE", model=model, default="offset"),
+        stream_batch_size=conf("API_STREAM_BATCH_SIZE", model=model, default=1000),
+        conditional_get=conf("API_CONDITIONAL_GET", model=model, default=False),
+        etag_source=conf("API_ETAG_SOURCE", model=model, default="auto"),
+        last_modified_column=conf("API_LAST_MODIFIED_COLUMN", model=model, default="updated_at"),
+        cache_control=conf("API_CACHE_CONTROL", model=model, default=None),
+        response_cache=conf("API_RESPONSE_CACHE", model=model, default=False),
+        response_cache_ttl=conf("API_RESPONSE_CACHE_TTL", model=model, default=300),
+        envelope=MappingProxyType(
+            {k: bool(conf(key, default)) for k, (key, default) in ENVELOPE_FLAGS.items()}
+        ),
+        field_case=conf("API_FIELD_CASE", default="snake_case"),
+        print_exceptions=conf("API_PRINT_EXCEPTIONS", default=True),
+        error_callback=conf("API_ERROR_CALLBACK", method=http_method),
+        handler=handler,
+        generation=config_generation(),
+    )
+
+
+def set_route_plan(plan: RoutePlan):
+    """
+    Makes the plan the active one for the current request.
+
+    Args:
+        plan (RoutePlan): The route plan.
+
+    Returns:
+        None
+    """
+    g.route_plan = plan
+
+
+def get_route_plan(model: Optional[DeclarativeBase] = None) -> Optional[RoutePlan]:
+    """
+    Gets the plan for the route being handled. Plans built before the config cache was last invalidated are stale
+    and are ignored, so callers fall back to resolving the config themselves.
+
+    Args:
+        model (Optional[DeclarativeBase]): If given, only return the plan if it was built for this model.
+
+    Returns:
+        Optional[RoutePlan]: The route plan, or None if there isn't a current one.
+    """
+    if not has_app_context():
+        return None
+    plan: Any = g.get("route_plan")
+    if plan is None or plan.generation != config_generation():
+        return None
+    if model is not None and plan.model is not model:
+        return None
+    return plan
@@ -4,11 +4,15 @@ from datetime import datetime
 from typing import Optional, Union, List, Any, Dict, Type, Tuple
 
 import pytz
-from flask import Response, current_app, jsonify, g
+from flask import Response, current_app, g
 from marshmallow import Schema, ValidationError
 from sqlalchemy.orm import DeclarativeBase
 
+from flask_scheema.api.encoding import create_json_response, create_msgpack_response, wants_msgpack
+from flask_scheema.api.plan import get_route_plan, ENVELOPE_FLAGS
 from flask_scheema.api.utils import convert_case
+from flask_scheema.scheema.columnar import dump_columnar, get_layout
+from flask_scheema.scheema.compiler import get_compiled_serializer, get_row_serializer
 from flask_scheema.scheema.utils import convert_snake_to_camel
 from flask_scheema.utilities import get_config_or_model_meta
 
@@ -108,6 +112,13 @@ def dump_schema_if_exists(
 
     """
     if data:
+        # rows of bare columns, from ?fields=, are dumped without building ORM objects or running marshmallow
+        row_dump = get_row_serializer(schema, data, is_list)
+        if row_dump:
+            return row_dump(data, many=is_list)
+        compiled_dump = get_compiled_serializer(schema)
+        if compiled_dump:
+            return compiled_dump(data, many=is_list)
         return schema.dump(data, many=is_list)
     return [] if is_list else None
 
@@ -134,9 +145,13 @@ def serialize_output_with_mallow(
             or ("query" in data and isinstance(data["query"], list))
         )
         dump_data = data["query"] if "query" in data else data
-        value = dump_schema_if_exists(output_schema, dump_data, is_list)
-        # Check if value is a list, a single item, or None, and adjust count accordingly
-        count = get_count(data, value)
+        if is_list and isinstance(dump_data, list) and get_layout() == "columnar":
+            value = dump_columnar(output_schema, dump_data)
+            count = get_count(data, dump_data)
+        else:
+            value = dump_schema_if_exists(output_schema, dump_data, is_list)
+            # Check if value is a list, a single item, or None, and adjust count accordingly
+            count = get_count(data, value)
 
         next_url = data.get("next_url", 1)
         previous_url = data.get("previous_url", 1)
@@ -224,7 +239,7 @@ def create_response(
         }
     )
 
-    if next_url or previous_url or count > 1 or isinstance(value, CustomResponse):
+    if next_url or previous_url or (count or 0) > 1 or isinstance(value, CustomResponse):
         data.update(
             {
                 "next_url": next_url,
@@ -234,11 +249,18 @@ def create_response(
 
     data = remove_values(data)
 
-    field_case = get_config_or_model_meta("API_FIELD_CASE", default="snake_case")
+    plan = get_route_plan()
+    field_case = (
+        plan.field_case
+        if plan
+        else get_config_or_model_meta("API_FIELD_CASE", default="snake_case")
+    )
     data = {convert_case(k, field_case): v for k, v in data.items()}
 
-    response = jsonify(data)
+    # the same envelope is sent as MessagePack to clients that prefer it
+    response = create_msgpack_response(data) if wants_msgpack() else create_json_response(data)
     response.status_code = int(str(status))
+    response.vary.add("Accept")
 
     return response
 
@@ -252,43 +274,21 @@ def remove_values(data: dict) -> dict:
     Returns:
         dict: The response data with the specified keys removed.
     """
-    if "datetime" in data and not get_config_or_model_meta(
-        "API_DUMP_DATETIME", default=True
-    ):
-        data.pop("datetime")
-    if "api_version" in data and not get_config_or_model_meta(
-        "API_DUMP_VERSION", default=True
-    ):
-        data.pop("api_version")
-    if "status_code" in data and not get_config_or_model_meta(
-        "API_DUMP_STATUS_CODE", default=True
-    ):
-        data.pop("status_code")
-    if "response_ms" in data and not get_config_or_model_meta(
-        "API_DUMP_RESPONSE_MS", default=True
-    ):
-        data.pop("response_ms")
-    if "total_count" in data and not get_config_or_model_meta(
-        "API_DUMP_TOTAL_COUNT", default=True
-    ):
-        data.pop("total_count")
-    if (
-        "next_url" in data
-        and not get_config_or_model_meta("API_DUMP_NULL_NEXT_URL", default=True)
-        and not data.get("next_url")
-    ):
-        data.pop("next_url")
-    if (
-        "previous_url" in data
-        and not get_config_or_model_meta("API_DUMP_NULL_PREVIOUS_URL", default=True)
-        and not data.get("previous_url")
-    ):
-        data.pop("previous_url")
-    if (
-        "errors" in data
-        and not get_config_or_model_meta("API_DUMP_NULL_ERRORS", default=False)
-        and not data.get("errors")
-    ):
-        data.pop("errors")
+    plan = get_route_plan()
+
+    def dump(key: str) -> bool:
+        if plan:
+            return plan.envelope[key]
+        config_key, default = ENVELOPE_FLAGS[key]
+        return get_config_or_model_meta(config_key, default=default)
+
+    for key in ["datetime", "api_version", "status_code", "response_ms", "total_count"]:
+        if key in data and not dump(key):
+            data.pop(key)
+
+    # urls and errors are only removed when they are empty
+    for key in ["next_url", "previous_url", "errors"]:
+        if key in data and not dump(key) and not data.get(key):
+            data.pop(key)
 
     return data
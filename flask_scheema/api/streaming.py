@@ -0,0 +1,277 @@
+import csv
+import io
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from flask import Response, stream_with_context
+from marshmallow import Schema, fields
+from sqlalchemy import Float, LargeBinary, Numeric, inspect
+
+from flask_scheema.api.encoding import get_json_dumps
+from flask_scheema.api.responses import dump_schema_if_exists
+from flask_scheema.api.utils import endpoint_namer
+from flask_scheema.scheema.bases import type_mapping
+from flask_scheema.services.attributes import get_attribute_index
+from flask_scheema.services.streaming import STREAM_FORMATS, RowStream, pyarrow
+from flask_scheema.utilities import get_config_or_model_meta
+
+# the arrow type for each marshmallow field type in ``type_mapping``, other fields are written as strings.
+ARROW_TYPES = {
+    fields.Int: "int64",
+    fields.Float: "float64",
+    fields.Bool: "bool_",
+    fields.Date: "date32",
+    fields.DateTime: ("timestamp", "us"),
+    fields.Time: ("time64", "us"),
+    fields.TimeDelta: ("duration", "us"),
+}
+
+
+def get_stream_headers(output: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Gets the headers that carry the response envelope of a streamed list, as the body only holds the rows. The
+    count is sent as ``X-Total-Count``, and the page urls as a ``Link`` header.
+
+    Args:
+        output (Dict[str, Any]): The output of the list query.
+
+    Returns:
+        Dict[str, str]: The headers.
+    """
+    headers = {}
+    if output.get("total_count") is not None:
+        headers["X-Total-Count"] = str(output["total_count"])
+
+    links = [
+        f'<{output[key]}>; rel="{rel}"'
+        for key, rel in (("next_url", "next"), ("previous_url", "prev"))
+        if output.get(key)
+    ]
+    if links:
+        headers["Link"] = ", ".join(links)
+    return headers
+
+
+def generate_ndjson(schema: Schema, rows: RowStream) -> Iterator[str]:
+    """
+    Dumps streamed rows as newline delimited JSON, one batch at a time.
+
+    Args:
+        schema (Schema): The output schema.
+        rows (RowStream): The rows.
+
+    Yields:
+        str: The lines for a batch of rows.
+    """
+    dumps = get_json_dumps()
+    for batch in rows:
+        yield "".join(f"{dumps(item)}\n" for item in dump_schema_if_exists(schema, batch, True))
+
+
+def _relation_renderer(name: str, field: fields.Nested) -> Callable[[Any], Any]:
+    """
+    Gets a function that renders a nested relationship of an object as a url, as ``API_SERIALIZATION_TYPE`` ``url``
+    would. Related objects without a ``to_url`` are rendered as their primary key.
+
+    Args:
+        name (str): The relationship's attribute name.
+        field (fields.Nested): The schema field for the relationship.
+
+    Returns:
+        Callable: Takes the object, returns its cell value.
+    """
+    nested_model = field.schema.get_model()
+    namer = get_config_or_model_meta("API_ENDPOINT_NAMER", model=nested_model, default=endpoint_namer)
+    relation_url_method = namer(nested_model).replace("-", "_") + "_to_url"
+
+    def to_url(related):
+        if hasattr(related, "to_url"):
+            return related.to_url()
+        identity = inspect(related).identity
+        return identity[0] if identity and len(identity) == 1 else identity
+
+    def render(obj):
+        if field.many:
+            relation_url = getattr(obj, relation_url_method, None)
+            if relation_url is not None:
+                return relation_url()
+            return " ".join(str(to_url(related)) for related in getattr(obj, name, None) or [])
+        related = getattr(obj, name, None)
+        return None if related is None else to_url(related)
+
+    return render
+
+
+def generate_csv(schema: Schema, rows: RowStream) -> Iterator[str]:
+    """
+    Dumps streamed rows as CSV, one batch at a time, with a header row of the schema's field names. Nested
+    relationships are written as their urls rather than dumped, other nested values (e.g. from hybrid properties)
+    as JSON.
+
+    Args:
+        schema (Schema): The output schema.
+        rows (RowStream): The rows.
+
+    Yields:
+        str: The header, then the lines for a batch of rows.
+    """
+    from flask_scheema.api.decorators import get_projected_schema
+
+    dumps = get_json_dumps()
+    relations = {
+        name: _relation_renderer(name, field)
+        for name, field in schema.dump_fields.items()
+        if isinstance(field, fields.Nested)
+    }
+    columns = [(name, field.data_key or name) for name, field in schema.dump_fields.items()]
+    flat = [name for name, _ in columns if name not in relations]
+    # the relationships are rendered from the objects, so only the flat fields are dumped
+    dump_schema = get_projected_schema(type(schema), True, flat) if relations and flat else schema
+
+    def cell(value):
+        if value is None:
+            return ""
+        if isinstance(value, (dict, list)):
+            return dumps(value)
+        return value
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
+
+    writer.writerow([key for _, key in columns])
+    yield flush()
+    for batch in rows:
+        records = dump_schema_if_exists(dump_schema, batch, True)
+        writer.writerows(
+            [cell(relations[name](item) if name in relations else record.get(key)) for name, key in columns]
+            for item, record in zip(batch, records)
+        )
+        yield flush()
+
+
+def _arrow_type(field: fields.Field, column_type: Any) -> Any:
+    """
+    Gets the arrow type for a field, from the type of the column it dumps where there is one, as mapped to a
+    marshmallow field by ``type_mapping``.
+
+    Args:
+        field (fields.Field): The schema field.
+        column_type (Any): The SQLAlchemy type of the column, or the type hint of a hybrid property.
+
+    Returns:
+        pyarrow.DataType: The arrow type.
+    """
+    if isinstance(column_type, LargeBinary):
+        return pyarrow.binary()
+    if isinstance(column_type, Numeric) and not isinstance(column_type, Float):
+        if column_type.precision is not None and column_type.scale is not None:
+            return pyarrow.decimal128(column_type.precision, column_type.scale)
+        return pyarrow.float64()
+
+    field_type = type_mapping.get(type(column_type)) or type_mapping.get(column_type) or type(field)
+    arrow_type = ARROW_TYPES.get(field_type)
+    if arrow_type is None:
+        return pyarrow.string()
+    if isinstance(arrow_type, tuple):
+        return getattr(pyarrow, arrow_type[0])(*arrow_type[1:])
+    return getattr(pyarrow, arrow_type)()
+
+
+def get_arrow_columns(schema: Schema) -> List[Tuple[str, Any, Callable[[Any], Any]]]:
+    """
+    Gets the arrow columns for a schema's fields. Column values are read straight from the objects or rows, rather
+    than from the dumped records, so dates and numbers keep their types. Nested relationships are written as their
+    urls, as for CSV.
+
+    Args:
+        schema (Schema): The output schema.
+
+    Returns:
+        List[Tuple]: The name, arrow type and value getter of each column.
+    """
+    dumps = get_json_dumps()
+    attributes = get_attribute_index(schema.get_model()).attributes
+
+    def text(value):
+        if value is None or isinstance(value, str):
+            return value
+        if isinstance(value, (dict, list)):
+            return dumps(value)
+        return str(value)
+
+    columns = []
+    for name, field in schema.dump_fields.items():
+        key = field.data_key or name
+        if isinstance(field, fields.Nested):
+            render = _relation_renderer(name, field)
+            columns.append((key, pyarrow.string(), lambda item, render=render: text(render(item))))
+        elif not field._CHECK_ATTRIBUTE:
+            # values worked out by the field, e.g. relationship urls
+            columns.append(
+                (key, pyarrow.string(), lambda item, name=name, field=field: text(field.serialize(name, item)))
+            )
+        else:
+            attribute = attributes.get(name)
+            arrow_type = _arrow_type(field, attribute.column_type if attribute else None)
+            source = field.attribute if field.attribute is not None else name
+            if arrow_type == pyarrow.string():
+                columns.append((key, arrow_type, lambda item, source=source: text(getattr(item, source, None))))
+            else:
+                columns.append((key, arrow_type, lambda item, source=source: getattr(item, source, None)))
+    return columns
+
+
+def generate_arrow(schema: Schema, rows: RowStream) -> Iterator[bytes]:
+    """
+    Writes streamed rows as an Apache Arrow IPC stream, one record batch per batch of rows.
+
+    Args:
+        schema (Schema): The output schema.
+        rows (RowStream): The rows.
+
+    Yields:
+        bytes: The stream's schema, then a record batch for each batch of rows, then the end of the stream.
+    """
+    columns = get_arrow_columns(schema)
+    arrow_schema = pyarrow.schema([pyarrow.field(key, arrow_type) for key, arrow_type, _ in columns])
+    buffer = io.BytesIO()
+
+    def flush():
+        # messages are padded to 8 bytes, so starting the buffer again keeps them aligned
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    with pyarrow.ipc.new_stream(buffer, arrow_schema) as writer:
+        yield flush()
+        for batch in rows:
+            arrays = [pyarrow.array([get(item) for item in batch], type=arrow_type) for _, arrow_type, get in columns]
+            writer.write_batch(pyarrow.record_batch(arrays, schema=arrow_schema))
+            yield flush()
+    yield flush()
+
+
+# writes the streamed rows for each of the stream formats.
+STREAM_WRITERS = {"ndjson": generate_ndjson, "csv": generate_csv, "arrow": generate_arrow}
+
+
+def create_stream_response(schema: Schema, output: Dict[str, Any]) -> Response:
+    """
+    Creates a streamed response for a list query, written in the stream's format as it is read from the database.
+
+    Args:
+        schema (Schema): The output schema.
+        output (Dict[str, Any]): The output of the list query, with a :class:`RowStream` as its ``query``.
+
+    Returns:
+        Response: The streamed response.
+    """
+    rows = output["query"]
+    body = stream_with_context(STREAM_WRITERS[rows.format](schema, rows))
+    return Response(body, mimetype=STREAM_FORMATS[rows.format], headers=get_stream_headers(output))
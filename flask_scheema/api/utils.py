@@ -8,7 +8,7 @@ from sqlalchemy.orm import DeclarativeBase
 
 from flask_scheema.logging import logger
 from flask_scheema.services.operators import get_all_columns_and_hybrids
-from flask_scheema.utilities import get_config_or_model_meta
+from flask_scheema.utilities import get_config_or_model_meta, memoize
 import inflect
 
 p = inflect.engine()
@@ -80,6 +80,8 @@ def setup_route_function(
     many,
     join_model: Optional[Callable] = None,
     get_field: Optional[str] = None,
+    pre_hook: Optional[Callable] = None,
+    post_hook: Optional[Callable] = None,
     **kwargs,
 ):
     """
@@ -91,6 +93,8 @@ def setup_route_function(
         many (bool): Whether the route is for multiple records or not.
         join_model (Callable): The model to use in the join.
         get_field (str): The field to get the record by.
+        pre_hook (Callable): The setup callback, run before the database action.
+        post_hook (Callable): The return callback, run after the database action.
 
     Returns:
         function: The route function.
@@ -144,14 +148,6 @@ def setup_route_function(
 
         return route_function
 
-    pre_hook = get_config_or_model_meta(
-        f"API_SETUP_CALLBACK", model=service.model, default=None, method=method
-    )
-
-    post_hook = get_config_or_model_meta(
-        f"API_RETURN_CALLBACK", model=service.model, default=None, method=method
-    )
-
     if method == "GET":
         action = lambda **kwargs: service.get_query(
             request.args.to_dict(), alt_field=get_field, **kwargs
@@ -166,6 +162,7 @@ def setup_route_function(
     return route_function_factory(action, many, pre_hook, post_hook, **kwargs)
 
 
+@memoize()
 def table_namer(model: Optional[DeclarativeBase] = None) -> str:
     """
     Gets the table name from the model name by converting camel case and kebab-case to snake_case.
@@ -190,6 +187,7 @@ def table_namer(model: Optional[DeclarativeBase] = None) -> str:
     return snake_case_name
 
 
+@memoize()
 def convert_case(s, target_case):
     # Splitting the string into words considering various input cases
     if "_" in s:  # Handles snake_case and SCREAMING_SNAKE_CASE directly
@@ -217,6 +215,7 @@ def convert_case(s, target_case):
         return s
 
 
+@memoize()
 def pluralize_last_word(converted_name):
     """
     Pluralize the last word of the converted name while preserving the rest of the name and its case.
@@ -273,6 +272,7 @@ def pluralize_last_word(converted_name):
     return new_name
 
 
+@memoize(per_config=True)
 def endpoint_namer(
     model: Optional[DeclarativeBase] = None,
     input_schema: Optional[Schema] = None,
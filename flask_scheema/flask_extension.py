@@ -4,7 +4,7 @@ from functools import wraps
 from typing import Optional, List, Type, Callable
 
 from apispec import APISpec
-from flask import Flask
+from flask import Flask, has_app_context
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from marshmallow import Schema
@@ -12,13 +12,20 @@ from sqlalchemy.orm import DeclarativeBase
 
 from flask_scheema.api.api import RiceAPI
 from flask_scheema.api.decorators import handle_many, handle_one
+from flask_scheema.api.plan import RoutePlan, set_route_plan
 from flask_scheema.logging import logger
 from flask_scheema.specification.doc_generation import get_rule
 from flask_scheema.specification.specification import (
     CurrySpec,
 )
 from flask_scheema.utilities import (
-    AttributeInitializerMixin, check_services, get_config_or_model_meta, validate_flask_limiter_rate_limit_string,
+    AttributeInitializerMixin,
+    check_services,
+    get_config_or_model_meta,
+    validate_flask_limiter_rate_limit_string,
+    register_config_resolver,
+    invalidate_config_cache,
+    config_generation,
 )
 
 FLASK_APP_NAME = "flask_scheema"
@@ -72,9 +79,23 @@ class Naan(AttributeInitializerMixin):
         # Set the app and register it with the extension
         self._register_app(app)
 
+        # config lookups are memoised from here on, a fresh resolver also clears anything from a previous init.
+        register_config_resolver(app)
+
         # set the logger
         logger.verbosity_level = self.get_config("API_VERBOSITY_LEVEL", 0)
 
+        # create the rate limiter, it needs to always created as rate limits can be per model and doesn't have to
+        # be global, so we dont know if it needs to be used in advance. It is created before the routes, so their
+        # rate limits can be applied as they are declared.
+        logger.log(2, "Creating rate limiter")
+        storage_uri = check_services()
+
+        self.app.config["RATELIMIT_HEADERS_ENABLED"] = True
+        self.app.config["RATELIMIT_SWALLOW_ERRORS"] = True
+        self.app.config["RATELIMIT_IN_MEMORY_FALLBACK_ENABLED"] = True  #
+        self.limiter = Limiter(app=app, key_func=get_remote_address, storage_uri=storage_uri if storage_uri else None)
+
         # initialize the api spec
         # Initialize the api spec
         self.api_spec = None
@@ -84,15 +105,6 @@ class Naan(AttributeInitializerMixin):
         if self.get_config("API_CREATE_DOCS", True):
             self.init_apispec(app=app, **kwargs)
 
-        # create the rate limiter, it needs to always created as rate limits can be per model and doesn't have to
-        # be global, so we dont know if it needs to be used in advance.
-        logger.log(2, "Creating rate limiter")
-        storage_uri = check_services()
-
-        self.app.config["RATELIMIT_HEADERS_ENABLED"] = True
-        self.app.config["RATELIMIT_SWALLOW_ERRORS"] = True
-        self.app.config["RATELIMIT_IN_MEMORY_FALLBACK_ENABLED"] = True  #
-        self.limiter = Limiter(app=app, key_func=get_remote_address, storage_uri=storage_uri if storage_uri else None)
 
     def _register_app(self, app: Flask):
         """
@@ -159,6 +171,16 @@ class Naan(AttributeInitializerMixin):
         if self.api_spec:
             return self.api_spec.to_dict()
 
+    def invalidate_config_cache(self):
+        """
+        Clears the memoised configuration for the app. Call this after changing the Flask config or a model's
+        ``Meta`` class at runtime.
+
+        Returns:
+            None
+        """
+        invalidate_config_cache(self.app)
+
     def get_config(self, key, default: Optional = None):
         """
                 Gets a config value from the app config.
@@ -181,6 +203,7 @@ class Naan(AttributeInitializerMixin):
             model: Optional[DeclarativeBase] = None,
             group_tag: Optional[str] = None,
             many: Optional[Callable] = None,
+            plan: Optional[RoutePlan] = None,
             **kwargs
     ) -> Callable:
         """
@@ -193,6 +216,7 @@ class Naan(AttributeInitializerMixin):
             model (Optional[DeclarativeBase], optional): Database model. Defaults to None.
             group_tag (Optional[str], optional): Group name. Defaults to None.
             many (Optional[Callable], optional): Handler function. Defaults to None.
+            plan (Optional[RoutePlan], optional): The precompiled plan for generated routes. Defaults to None.
             kwargs (dict): Dictionary of keyword arguments.
 
         Returns:
@@ -201,9 +225,16 @@ class Naan(AttributeInitializerMixin):
         """
 
         def decorator(f: Callable) -> Callable:
-            @wraps(f)
-            def wrapped(*_args, **_kwargs):
+            # the composed view and the config generation it was built for
+            chain = {"generation": None, "view": None}
 
+            def compose() -> Callable:
+                """
+                Wraps the view in the authentication, output handling and rate limiting decorators.
+
+                Returns:
+                    Callable: The composed view.
+                """
                 f_decorated = f
 
                 # Deal with the authentication method
@@ -216,7 +247,10 @@ class Naan(AttributeInitializerMixin):
                     f_decorated = None #authentication(f_decorated)
 
                 # deal with the output
-                f_decorated = handle_many(output_schema, input_schema)(f_decorated) if many else handle_one(output_schema, input_schema)(f_decorated)
+                if plan is not None and f_decorated is f:
+                    f_decorated = plan.handler
+                else:
+                    f_decorated = handle_many(output_schema, input_schema)(f_decorated) if many else handle_one(output_schema, input_schema)(f_decorated)
 
                 # Check if rate limiting is to be applied
                 rl = get_config_or_model_meta("API_RATE_LIMIT", model=model, input_schema=input_schema, output_schema=output_schema, default=False)
@@ -225,13 +259,33 @@ class Naan(AttributeInitializerMixin):
                     f_decorated = self.limiter.limit(rl)(f_decorated)
                 elif rl:
                     # Apply global rate limiting
-                    rule = get_rule(self, f).rule
-                    logger.error(f"Rate limit definition not a string or not valid. Skipping for `{rule}` route.")
+                    rule = get_rule(self, f)
+                    logger.error(f"Rate limit definition not a string or not valid. Skipping for `{rule.rule if rule else f.__name__}` route.")
+
+                chain["generation"] = config_generation()
+                chain["view"] = f_decorated
+                return f_decorated
+
+            @wraps(f)
+            def wrapped(*_args, **_kwargs):
+
+                if plan is not None:
+                    set_route_plan(plan)
+
+                # the chain is only rebuilt if the config cache has been invalidated since it was composed
+                f_decorated = chain["view"]
+                if f_decorated is None or chain["generation"] != config_generation():
+                    f_decorated = compose()
 
                 # return output
                 result = f_decorated(*_args, **_kwargs)
                 return result
 
+            # compose up front when declared during init_app, so the config (including the rate limit) is checked at
+            # startup. Routes declared before the app exists are composed on their first request instead.
+            if has_app_context() and getattr(self, "limiter", None) is not None:
+                compose()
+
             route_info = {
                 "function": wrapped,
                 "output_schema": output_schema,
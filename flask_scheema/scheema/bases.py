@@ -1,3 +1,5 @@
+import copy
+
 from flask import request
 from marshmallow import fields, Schema, missing, post_dump
 from marshmallow.validate import Length
@@ -27,8 +29,11 @@ from flask_scheema.scheema.utils import (
     get_openapi_meta_data,
     get_input_output_from_model_or_make,
     convert_snake_to_camel,
+    schema_registry,
 )
-from flask_scheema.utilities import get_config_or_model_meta
+from flask_scheema.utilities import get_app_cache, get_config_or_model_meta
+
+FIELD_TEMPLATE_EXTENSION = "flask_scheema_field_templates"
 
 type_mapping = {
     # Basic types
@@ -110,6 +115,23 @@ def _get_relation_use_list_and_type(relationship_property):
     return not relationship_property.uselist, direction
 
 
+def _copy_field(field, parent=None):
+    """
+    Copies a generated field, so that schema instances never share a field they could mutate.
+
+    Args:
+        field (fields.Field): The field to copy.
+        parent (Schema): The schema the copy belongs to.
+
+    Returns:
+        fields.Field: The copied field.
+    """
+    field = copy.copy(field)
+    field.metadata = dict(field.metadata)
+    field.parent = parent
+    return field
+
+
 class DeleteSchema(Schema):
     complete = fields.Boolean(required=True, default=False)
 
@@ -120,6 +142,11 @@ class AutoScheema(Schema):
         add_hybrid_properties = True
         include_children = True
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # keep the schema registry up to date, so lookups never have to scan the subclasses
+        schema_registry.register(cls)
+
     def __init__(self, *args, render_nested=True, **kwargs):
 
         only_fields = kwargs.pop("only", None)
@@ -163,9 +190,18 @@ class AutoScheema(Schema):
         if meta:
             model = getattr(meta, "model")
         return model
+    def get_post_dump_callback(self):
+        """
+        Gets the ``API_POST_DUMP_CALLBACK`` for the schema's model and the current request method.
+
+        Returns:
+            Optional[Callable]: The callback, if one is set.
+        """
+        return get_config_or_model_meta("API_POST_DUMP_CALLBACK", model=self.get_model(), method=request.method, default=None)
+
     @post_dump
     def post_dump(self, data, **kwargs):
-        post_dump_function = get_config_or_model_meta("API_POST_DUMP_CALLBACK", model=self.get_model(), method=request.method, default=None)
+        post_dump_function = self.get_post_dump_callback()
         if post_dump_function:
             return post_dump_function(data, **kwargs)
         return data
@@ -181,6 +217,10 @@ class AutoScheema(Schema):
         """
         Automatically add fields for each column and relationship in the SQLAlchemy model.
         Also adds fields for hybrid properties.
+
+        The fields are only built from the model the first time a schema class is instantiated (per depth and
+        config generation), later instances get cheap copies of them.
+
         Returns:
             None
         """
@@ -192,6 +232,34 @@ class AutoScheema(Schema):
             print("Warning: self.Meta.model is None. Skipping field generation.")
             return
 
+        # generated fields are kept per app, keyed by (schema class, depth), and instances get copies of them. The
+        # cache is bounded, and replaced when the config cache is invalidated.
+        cache = get_app_cache(FIELD_TEMPLATE_EXTENSION, "API_FIELD_TEMPLATE_CACHE_SIZE", 512)
+        key = (self.__class__, self.depth)
+        template = cache.get(key) if cache is not None else None
+        if template is None:
+            declared = dict(self.fields)
+            self._build_fields(model)
+            if cache is not None:
+                cache.set(
+                    key,
+                    {name: _copy_field(field) for name, field in self.fields.items() if declared.get(name) is not field},
+                )
+            return
+
+        for name, field in template.items():
+            self.fields[name] = _copy_field(field, parent=self)
+
+    def _build_fields(self, model):
+        """
+        Builds the fields for the schema from the SQLAlchemy model.
+
+        Args:
+            model: The SQLAlchemy model.
+
+        Returns:
+            None
+        """
         mapper = class_mapper(model)
         for attribute, mapper_property in mapper.all_orm_descriptors.items():
 
@@ -438,15 +506,19 @@ class AutoScheema(Schema):
                 f"Serialization type is `{serialization_type} - Serializing -{nested_schema.__name__}- relations to URL`",
             )
 
+            # the url method names are resolved once here, dumping a row only formats the url
+            nested_model = nested_schema.get_model()
+            namer = get_config_or_model_meta(
+                "API_ENDPOINT_NAMER", model=nested_model, default=endpoint_namer
+            )
+            relation_url_method = namer(nested_model) + "_to_url"
+            self_url_method = matching[0] + "to_url"
+
             def serialize_to_url(obj):
-                # Your logic here
-                nested_model = nested_schema.get_model()
-                namer = get_config_or_model_meta(
-                    "API_ENDPOINT_NAMER", model=nested_model, default=endpoint_namer
-                )
-                if hasattr(obj, namer(nested_model) + "_to_url"):
-                    return getattr(obj, namer(nested_model) + "_to_url")()
-                elif hasattr(obj, matching[0] + "to_url"):
+                to_url = getattr(obj, relation_url_method, None)
+                if to_url is not None:
+                    return to_url()
+                elif hasattr(obj, self_url_method):
                     return obj.to_url()
                 return None
 
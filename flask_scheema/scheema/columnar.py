@@ -0,0 +1,115 @@
+from typing import Any, Dict, List
+
+import numpy as np
+from flask import has_request_context, request
+from marshmallow import Schema, fields
+from marshmallow.decorators import POST_DUMP
+from sqlalchemy.engine import Row
+
+from flask_scheema.exceptions import CustomHTTPException
+from flask_scheema.scheema.bases import AutoScheema
+from flask_scheema.scheema.compiler import _can_compile
+
+# the layouts a list can be returned in with ``?layout=``, ``rows`` is a list of records, ``columnar`` a list per field.
+LAYOUTS = ("rows", "columnar")
+
+# flat fields whose values are converted a column at a time with numpy, when the column has no nulls.
+NUMPY_DTYPES = {
+    fields.Integer: np.int64,
+    fields.Float: np.float64,
+    fields.Boolean: np.bool_,
+}
+
+
+def get_layout() -> str:
+    """
+    Gets the layout the request asked for a list in, from ``?layout=``.
+
+    Returns:
+        str: One of :data:`LAYOUTS`.
+
+    Raises:
+        CustomHTTPException: If the ``layout`` parameter is not a known layout.
+    """
+    layout = request.args.get("layout", "rows") if has_request_context() else "rows"
+    if layout not in LAYOUTS:
+        raise CustomHTTPException(400, f"Invalid layout value: {layout} (must be one of {', '.join(LAYOUTS)})")
+    return layout
+
+
+def _has_post_dump(schema: Schema) -> bool:
+    """
+    Checks whether the schema changes dumped records after they are built, those have to be dumped a row at a time.
+    """
+    for attr_name in schema._hooks[(POST_DUMP, False)] + schema._hooks[(POST_DUMP, True)]:
+        if getattr(type(schema), attr_name) is not AutoScheema.post_dump or schema.get_post_dump_callback():
+            return True
+    return False
+
+
+def _convert_column(field: fields.Field, name: str, values: List[Any]) -> List[Any]:
+    """
+    Formats a column of values as the field would format each one. Numbers, booleans and dates without nulls are
+    converted in one go with numpy, strings are passed through, anything else is formatted by the field.
+
+    Args:
+        field (fields.Field): The schema field.
+        name (str): The field's name.
+        values (List[Any]): The column's values.
+
+    Returns:
+        List[Any]: The formatted values.
+    """
+    field_type = type(field)
+    if values and None not in values:
+        try:
+            dtype = NUMPY_DTYPES.get(field_type)
+            if dtype is not None and not getattr(field, "as_string", False):
+                return np.asarray(values, dtype=dtype).tolist()
+            if field_type is fields.Date and (field.format or field.DEFAULT_FORMAT) == "iso":
+                return np.datetime_as_string(np.asarray(values, dtype="datetime64[D]"), unit="D").tolist()
+        except (TypeError, ValueError, OverflowError):
+            pass
+        if field_type is fields.String and all(type(value) is str for value in values):
+            return values
+    return [None if value is None else field._serialize(value, name, None) for value in values]
+
+
+def dump_columnar(schema: Schema, data: List[Any]) -> Dict[str, Any]:
+    """
+    Dumps a list of objects or rows a column at a time, as ``{"columns": [...], "data": {column: [values]}}``, so
+    keys aren't repeated for every record and no per record dict is built for flat fields. Fields that need the
+    object, e.g. nested schemas and relationship urls, are still dumped one object at a time.
+
+    Args:
+        schema (Schema): The output schema.
+        data (List[Any]): The model instances, or ``Row`` results of a ``?fields=`` query.
+
+    Returns:
+        Dict[str, Any]: The columns and their values.
+    """
+    if data and (not _can_compile(schema) or _has_post_dump(schema)):
+        # the records are only final once dumped, so they are turned into columns afterwards
+        records = schema.dump(data, many=True)
+        columns = list(records[0]) if records else []
+        return {"columns": columns, "data": {key: [record.get(key) for record in records] for key in columns}}
+
+    row_columns = {}
+    if data and isinstance(data[0], Row):
+        row_columns = dict(zip(data[0]._fields, zip(*data)))
+
+    output = {}
+    for name, field in schema.dump_fields.items():
+        key = field.data_key if field.data_key is not None else name
+        if not field._CHECK_ATTRIBUTE or isinstance(field, fields.Nested):
+            output[key] = [field.serialize(name, item) for item in data]
+            continue
+
+        source = field.attribute if field.attribute is not None else name
+        if source in row_columns:
+            values = list(row_columns[source])
+        else:
+            values = [getattr(item, source, None) for item in data]
+        output[key] = _convert_column(field, name, values)
+
+    return {"columns": list(output), "data": output}
@@ -0,0 +1,358 @@
+from typing import Callable, Optional, Any, Dict, List, Tuple
+
+from marshmallow import Schema, fields, missing
+from marshmallow.decorators import PRE_DUMP, POST_DUMP
+from marshmallow.utils import ensure_text_type
+from sqlalchemy.engine import Row
+
+from flask_scheema.logging import logger
+from flask_scheema.scheema.bases import AutoScheema
+from flask_scheema.utilities import get_app_cache, get_config_or_model_meta
+
+COMPILED_SERIALIZER_EXTENSION = "flask_scheema_compiled_serializers"
+
+
+def _value_expression(
+    field: fields.Field, name: str, namespace: Dict[str, Any], value: str = "value"
+) -> Optional[str]:
+    """
+    Gets the python expression that formats a value the same way the field's ``_serialize`` would, for the field
+    types that can be inlined.
+
+    Args:
+        field (fields.Field): The marshmallow field.
+        name (str): A unique name for the field, used to bind helpers into the namespace.
+        namespace (dict): The namespace the generated function is compiled in.
+        value (str): The name of the variable holding the value.
+
+    Returns:
+        Optional[str]: The expression, or None if the field must be serialized by marshmallow.
+    """
+    field_type = type(field)
+    if field_type in (fields.Integer, fields.Float) and not field.as_string:
+        return f"None if {value} is None else {field.num_type.__name__}({value})"
+    if field_type is fields.String:
+        return f"None if {value} is None else ensure_text_type({value})"
+    if field_type is fields.Raw:
+        return value
+    if field_type in (fields.DateTime, fields.Date, fields.Time):
+        format_func = field.SERIALIZATION_FUNCS.get(field.format or field.DEFAULT_FORMAT)
+        if format_func is None:
+            return None
+        namespace[f"format_{name}"] = format_func
+        return f"None if {value} is None else format_{name}({value})"
+    return None
+
+
+def _can_compile(schema: Schema) -> bool:
+    """
+    Checks the schema only uses the parts of marshmallow the compiler reproduces.
+
+    Args:
+        schema (Schema): The schema instance.
+
+    Returns:
+        bool: True if the schema can be compiled.
+    """
+    schema_class = type(schema)
+    if (
+        schema_class.get_attribute is not Schema.get_attribute
+        or schema_class._serialize is not Schema._serialize
+        or schema.dict_class is not dict
+    ):
+        return False
+    if schema._hooks[(PRE_DUMP, False)] or schema._hooks[(PRE_DUMP, True)]:
+        return False
+    if schema._hooks[(POST_DUMP, True)]:
+        return False
+    for attr_name in schema._hooks[(POST_DUMP, False)]:
+        hook = getattr(schema, attr_name).__marshmallow_hook__[(POST_DUMP, False)]
+        if hook.get("pass_original"):
+            return False
+    return True
+
+
+def _post_dump(data: Any, schema: Schema, many: bool) -> Any:
+    """
+    Runs the schema's ``post_dump`` hooks on dumped data, as marshmallow would.
+
+    Args:
+        data (Any): The dumped item, or list of items if ``many``.
+        schema (Schema): The schema instance.
+        many (bool): Whether ``data`` is a list of items.
+
+    Returns:
+        Any: The processed data.
+    """
+    for attr_name in schema._hooks[(POST_DUMP, False)]:
+        if getattr(type(schema), attr_name) is AutoScheema.post_dump:
+            # AutoScheema's own hook only runs the configured callback, so look that up once per dump
+            callback = schema.get_post_dump_callback()
+            if not callback:
+                continue
+            processor = callback
+        else:
+            processor = getattr(schema, attr_name)
+
+        if many:
+            data = [processor(item, many=many) for item in data]
+        else:
+            data = processor(data, many=many)
+    return data
+
+
+def _field_signature(schema: Schema) -> tuple:
+    """
+    Gets what the generated code depends on of each of a schema's dump fields, so instances whose fields would be
+    compiled differently get their own functions.
+
+    Args:
+        schema (Schema): The schema instance.
+
+    Returns:
+        tuple: The name, type, keys and formatting options of each field.
+    """
+    return tuple(
+        (
+            attr_name,
+            type(field),
+            field.data_key,
+            field.attribute,
+            field._CHECK_ATTRIBUTE,
+            getattr(field, "format", None),
+            getattr(field, "as_string", None),
+        )
+        for attr_name, field in schema.dump_fields.items()
+    )
+
+
+def _make_factory(source: str, function_name: str, namespace: Dict[str, Any], filename: str, count: int) -> Callable:
+    # the fields are arguments of an outer function, so the code can be shared by instances with their own fields
+    names = "".join(f", f{index}" for index in range(count))
+    lines = [f"def make(get_attribute{names}):"]
+    lines += [f"    {line}" for line in source.splitlines()]
+    lines.append(f"    return {function_name}")
+    exec(compile("\n".join(lines), filename, "exec"), namespace)
+    return namespace["make"]
+
+
+def _compile_schema_factory(schema: Schema) -> Optional[Callable[[Schema], Callable[[Any, bool], Any]]]:
+    """
+    Generates the dump code for a schema's fields, see :func:`compile_schema`.
+
+    Args:
+        schema (Schema): The schema instance to compile.
+
+    Returns:
+        Optional[Callable]: A function taking a schema instance with the same fields, and returning its dump function,
+        or None if the schema can't be compiled.
+    """
+    if not _can_compile(schema):
+        return None
+
+    namespace: Dict[str, Any] = {"missing": missing, "ensure_text_type": ensure_text_type}
+    lines: List[str] = ["def dump_one(obj):", "    ret = {}"]
+
+    for index, (attr_name, field) in enumerate(schema.dump_fields.items()):
+        name = f"f{index}"
+        key = field.data_key if field.data_key is not None else attr_name
+        attribute = field.attribute if field.attribute is not None else attr_name
+        expression = (
+            _value_expression(field, name, namespace)
+            if field._CHECK_ATTRIBUTE and "." not in attribute
+            else None
+        )
+
+        if expression is None:
+            lines += [
+                f"    value = {name}.serialize({attr_name!r}, obj, accessor=get_attribute)",
+                "    if value is not missing:",
+                f"        ret[{key!r}] = value",
+            ]
+        else:
+            # a missing attribute falls back to the field, which applies its dump_default
+            lines += [
+                f"    value = getattr(obj, {attribute!r}, missing)",
+                "    if value is missing:",
+                f"        value = {name}.serialize({attr_name!r}, obj, accessor=get_attribute)",
+                "        if value is not missing:",
+                f"            ret[{key!r}] = value",
+                "    else:",
+                f"        ret[{key!r}] = {expression}",
+            ]
+    lines.append("    return ret")
+
+    make = _make_factory(
+        "\n".join(lines), "dump_one", namespace, f"<compiled {type(schema).__name__}>", len(schema.dump_fields)
+    )
+
+    def bind(instance: Schema) -> Callable[[Any, bool], Any]:
+        dump_one = make(instance.get_attribute, *instance.dump_fields.values())
+
+        def dump(obj, many: bool = False):
+            # objects that support item access are read with obj[key] by marshmallow, leave those to it.
+            if many:
+                if obj is None:
+                    return instance.dump(obj, many=many)
+                if any(hasattr(item, "__getitem__") for item in obj):
+                    return instance.dump(obj, many=many)
+                return _post_dump([dump_one(item) for item in obj], instance, many)
+
+            if hasattr(obj, "__getitem__"):
+                return instance.dump(obj, many=many)
+            return _post_dump(dump_one(obj), instance, many)
+
+        return dump
+
+    return bind
+
+
+def compile_schema(schema: Schema) -> Optional[Callable[[Any, bool], Any]]:
+    """
+    Generates a dump function specialised to the schema's fields. Column values are read and formatted inline, any
+    field that can't be inlined (relationships, functions, custom fields) is serialized by the field itself, and the
+    schema's ``post_dump`` hooks are run on each item, so the output is identical to ``schema.dump``.
+
+    Args:
+        schema (Schema): The schema instance to compile.
+
+    Returns:
+        Optional[Callable]: A function taking ``(obj, many)``, or None if the schema can't be compiled.
+    """
+    bind = _compile_schema_factory(schema)
+    return bind(schema) if bind is not None else None
+
+
+def _compile_row_factory(
+    schema: Schema, keys: Tuple[str, ...]
+) -> Optional[Callable[[Schema], Callable[[Any, bool], Any]]]:
+    """
+    Generates the row dump code for a schema's fields, see :func:`compile_row_serializer`.
+
+    Args:
+        schema (Schema): The (projected) schema instance.
+        keys (Tuple[str, ...]): The keys of the rows, in order.
+
+    Returns:
+        Optional[Callable]: A function taking a schema instance with the same fields, and returning its dump function,
+        or None if the rows can't be dumped this way.
+    """
+    if not _can_compile(schema):
+        return None
+
+    namespace: Dict[str, Any] = {"ensure_text_type": ensure_text_type}
+    names = [f"v{index}" for index in range(len(keys))]
+    items = []
+
+    for index, (attr_name, field) in enumerate(schema.dump_fields.items()):
+        attribute = field.attribute if field.attribute is not None else attr_name
+        if not field._CHECK_ATTRIBUTE or attribute not in keys:
+            return None
+        name = f"f{index}"
+        value = names[keys.index(attribute)]
+        expression = _value_expression(field, name, namespace, value=value)
+        if expression is None:
+            expression = f"{name}._serialize({value}, {attr_name!r}, row)"
+        key = field.data_key if field.data_key is not None else attr_name
+        items.append(f"{key!r}: {expression}")
+
+    source = "\n".join(
+        [
+            "def dump_row(row):",
+            f"    {', '.join(names)}, = row" if names else "    pass",
+            f"    return {{{', '.join(items)}}}",
+        ]
+    )
+    make = _make_factory(
+        source, "dump_row", namespace, f"<compiled {type(schema).__name__} rows>", len(schema.dump_fields)
+    )
+
+    def bind(instance: Schema) -> Callable[[Any, bool], Any]:
+        dump_row = make(instance.get_attribute, *instance.dump_fields.values())
+
+        def dump(rows, many: bool = False):
+            if many:
+                return _post_dump([dump_row(row) for row in rows], instance, many)
+            return _post_dump(dump_row(rows), instance, many)
+
+        return dump
+
+    return bind
+
+
+def compile_row_serializer(schema: Schema, keys: Tuple[str, ...]) -> Optional[Callable[[Any, bool], Any]]:
+    """
+    Generates a dump function for SQLAlchemy ``Row`` results, as returned when ``?fields=`` selects bare columns.
+    Each row is unpacked and its values formatted straight into the output dict, so no ORM entities are built and
+    marshmallow isn't run, the output matches ``schema.dump`` of the same rows.
+
+    Args:
+        schema (Schema): The (projected) schema instance.
+        keys (Tuple[str, ...]): The keys of the rows, in order.
+
+    Returns:
+        Optional[Callable]: A function taking ``(rows, many)``, or None if the rows can't be dumped this way.
+    """
+    bind = _compile_row_factory(schema, keys)
+    return bind(schema) if bind is not None else None
+
+
+def get_row_serializer(schema: Schema, data: Any, many: bool) -> Optional[Callable[[Any, bool], Any]]:
+    """
+    Gets the row dump function for a schema, if the data is a ``Row`` or a list of them.
+
+    Args:
+        schema (Schema): The schema instance.
+        data (Any): The data to be dumped.
+        many (bool): Whether the data is a list.
+
+    Returns:
+        Optional[Callable]: The row dump function, or None if the data should be dumped by marshmallow.
+    """
+    first = data[0] if many and isinstance(data, list) and data else data
+    if not isinstance(first, Row):
+        return None
+
+    keys = tuple(first._fields)
+    key = ("rows", type(schema), _field_signature(schema), keys)
+    cache = get_app_cache(COMPILED_SERIALIZER_EXTENSION, "API_COMPILED_SERIALIZER_CACHE_SIZE", 1024)
+    if cache is not None and key in cache:
+        bind = cache.get(key)
+    else:
+        bind = _compile_row_factory(schema, keys)
+        if cache is not None:
+            cache.set(key, bind)
+    # the code is shared, the fields, context and hooks are the instance's own
+    return bind(schema) if bind is not None else None
+
+
+def get_compiled_serializer(schema: Schema) -> Optional[Callable[[Any, bool], Any]]:
+    """
+    Gets the compiled dump function for a schema instance, when ``API_COMPILED_SERIALIZER`` is enabled. The generated
+    code is cached per schema class and shape of its dump fields, so projected schemas get their own, and is bound to
+    the instance's own fields on each call, so its context and field changes are kept.
+
+    Args:
+        schema (Schema): The schema instance.
+
+    Returns:
+        Optional[Callable]: The compiled function, or None if the schema should be dumped by marshmallow.
+    """
+    if not get_config_or_model_meta("API_COMPILED_SERIALIZER", default=False):
+        return None
+
+    cache = get_app_cache(COMPILED_SERIALIZER_EXTENSION, "API_COMPILED_SERIALIZER_CACHE_SIZE", 1024)
+    if cache is None:
+        return None
+
+    key = ("objects", type(schema), _field_signature(schema))
+    if key in cache:
+        bind = cache.get(key)
+    else:
+        bind = _compile_schema_factory(schema)
+        if bind is None:
+            logger.debug(
+                3, f"Schema |{type(schema).__name__}| can't be compiled, it will be dumped by marshmallow."
+            )
+        cache.set(key, bind)
+    return bind(schema) if bind is not None else None
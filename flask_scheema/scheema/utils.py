@@ -1,6 +1,7 @@
 import re
+import threading
 from types import new_class
-from typing import Optional, Callable
+from typing import Optional, Callable, Dict, Set, Tuple
 
 from marshmallow import fields
 from marshmallow_sqlalchemy.fields import Nested, Related, RelatedList
@@ -59,9 +60,131 @@ def convert_kebab_to_snake(name: str) -> str:
     return name.replace("-", "_")
 
 
+def _matches_dump(schema_class: type, dump: bool) -> bool:
+    """
+    Checks whether a schema class can be used for dumping (or loading), see :func:`get_scheema_subclass`.
+
+    Args:
+        schema_class (type): The schema class.
+        dump (bool): Whether it is wanted for dumping or loading.
+
+    Returns:
+        bool: True if the class matches.
+    """
+    return bool(getattr(schema_class, "dump", False) is dump or getattr(schema_class, "dump", None))
+
+
+class SchemaRegistry:
+    """
+    Indexes schema classes by their base class, model and whether they dump or load, so finding the schema for a
+    model is a dictionary lookup rather than a scan of every subclass.
+
+    A base's direct subclasses are indexed the first time it is looked up, in definition order so the first schema
+    declared for a model wins. Subclasses of :class:`AutoScheema` declared later are added as they are defined,
+    anything else is picked up by re-indexing the base when a lookup misses. Misses are remembered, so models
+    without a schema aren't re-indexed on every lookup, until the next schema is registered.
+    """
+
+    def __init__(self):
+        self._index: Dict[Tuple[type, type, bool], type] = {}
+        self._indexed_bases: Set[type] = set()
+        self._missing: Set[Tuple[type, type, bool]] = set()
+        self._dynamic: Dict[Tuple[type, type], type] = {}
+        self._lock = threading.RLock()
+
+    def _add(self, base: type, schema_class: type):
+        meta = getattr(schema_class, "Meta", None)
+        model = getattr(meta, "model", None)
+        if model is None:
+            return
+        for dump in (True, False):
+            if _matches_dump(schema_class, dump):
+                self._index.setdefault((base, model, dump), schema_class)
+
+    def _index_base(self, base: type):
+        with self._lock:
+            for subclass in base.__subclasses__():
+                self._add(base, subclass)
+            self._indexed_bases.add(base)
+
+    def register(self, schema_class: type):
+        """
+        Adds a newly defined schema class to the index of each of its (already indexed) bases, and forgets the
+        lookups that missed, as it may be the schema they were looking for.
+
+        Args:
+            schema_class (type): The schema class.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            for base in schema_class.__bases__:
+                if base in self._indexed_bases:
+                    self._add(base, schema_class)
+            self._missing.clear()
+
+    def get(self, base: type, model: type, dump: bool = False) -> Optional[type]:
+        """
+        Gets the schema class for a model.
+
+        Args:
+            base (type): The base schema class.
+            model (type): The model.
+            dump (bool): Whether the schema is for dumping or loading.
+
+        Returns:
+            Optional[type]: The schema class, or None if there isn't one.
+        """
+        key = (base, model, dump)
+        schema_class = self._index.get(key)
+        if schema_class is None and key not in self._missing:
+            with self._lock:
+                self._index_base(base)
+                schema_class = self._index.get(key)
+                if schema_class is None:
+                    self._missing.add(key)
+        return schema_class
+
+    def get_or_create_dynamic(self, base: type, model: type) -> type:
+        """
+        Gets the dynamic schema for a model, creating it the first time.
+
+        Args:
+            base (type): The base schema class.
+            model (type): The model.
+
+        Returns:
+            type: The schema class.
+        """
+        key = (base, model)
+        with self._lock:
+            schema_class = self._dynamic.get(key)
+            if schema_class is None:
+                schema_class = self._dynamic[key] = create_dynamic_schema(base, model)
+                self.register(schema_class)
+        return schema_class
+
+    def clear(self):
+        """
+        Empties the index, it is rebuilt on the next lookups.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._index.clear()
+            self._indexed_bases.clear()
+            self._missing.clear()
+
+
+schema_registry = SchemaRegistry()
+
+
 def get_scheema_subclass(model: callable, dump: Optional[bool] = False):
     """
-        Searches through all subclasses of AutoScheema to find the one that matches the model and dump parameters.
+        Finds the subclass of AutoScheema (or ``API_BASE_SCHEMA``) that matches the model and dump parameters, using
+        the schema registry.
 
     Args:
         model (callable): The model to search for.
@@ -77,15 +200,7 @@ def get_scheema_subclass(model: callable, dump: Optional[bool] = False):
         "API_BASE_SCHEMA", model=model, default=AutoScheema
     )
 
-    for subclass in schema_base.__subclasses__():
-        schema_model = hasattr(subclass, "Meta") and getattr(
-            subclass.Meta, "model", None
-        )
-        if schema_model == model and (
-            getattr(subclass, "dump", False) is dump or getattr(subclass, "dump", None)
-        ):
-            return subclass
-            # subclass is not type(self)
+    return schema_registry.get(schema_base, model, dump)
 
 
 def create_dynamic_schema(base_class, model_class):
@@ -113,7 +228,8 @@ def create_dynamic_schema(base_class, model_class):
 
 def get_input_output_from_model_or_make(model: Callable):
     """
-        Gets the input and output schemas from the model, or creates them if they do not exist.
+        Gets the input and output schemas from the model, or creates them if they do not exist. A dynamic schema is
+        only created once per model and then used for both.
 
     Args:
         model (Callable): The model to get the schemas from.
@@ -130,10 +246,10 @@ def get_input_output_from_model_or_make(model: Callable):
     output_schema_class = get_scheema_subclass(model, dump=True)
 
     if input_schema_class is None:
-        input_schema_class = create_dynamic_schema(AutoScheema, model)
+        input_schema_class = schema_registry.get_or_create_dynamic(AutoScheema, model)
 
     if output_schema_class is None:
-        output_schema_class = create_dynamic_schema(AutoScheema, model)
+        output_schema_class = schema_registry.get_or_create_dynamic(AutoScheema, model)
 
     return input_schema_class, output_schema_class
 
@@ -0,0 +1,258 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import DeclarativeBase, InstrumentedAttribute
+
+from flask_scheema.api.utils import convert_case
+from flask_scheema.exceptions import CustomHTTPException
+from flask_scheema.services.operators import coerce_condition_value, get_type_hint_from_hybrid
+from flask_scheema.utilities import config_generation, get_config_or_model_meta
+
+ATTRIBUTE_INDEX_EXTENSION = "flask_scheema_attribute_indexes"
+
+# the cases attribute and table names are accepted in, as well as their own spelling.
+ACCEPTED_CASES = ("snake", "camel", "pascal", "kebab")
+
+
+@dataclass(frozen=True)
+class ModelAttribute:
+    """
+    A column or hybrid property of a model that can be filtered and selected by.
+    """
+
+    model: Any
+    name: str
+    attribute: Any
+    column_type: Any
+    is_hybrid: bool
+
+    def coerce(self, value: Any) -> Any:
+        """
+        Converts a raw request value to the attribute's type.
+
+        Args:
+            value (Any): The value, shaped for the operator.
+
+        Returns:
+            Any: The converted value, or the value unchanged if it can't be converted.
+        """
+        return coerce_condition_value(value, self.column_type)
+
+
+@dataclass(frozen=True)
+class AttributeIndex:
+    """
+    The filterable attributes of a model, keyed by every accepted spelling of their names. Built once per model and
+    not changed afterwards.
+    """
+
+    model: Any
+    table_name: str
+    table_names: Tuple[str, ...]
+    attributes: Mapping[str, ModelAttribute]
+    spellings: Mapping[str, ModelAttribute]
+
+
+@dataclass(frozen=True)
+class AttributeLookup:
+    """
+    Resolves names against a model and the models joined to it. Plain names are looked up on the model first, then
+    the joined models in order, names qualified with a table name are looked up on that table only.
+    """
+
+    model: Any
+    indexes: Tuple[AttributeIndex, ...]
+    spellings: Mapping[str, ModelAttribute]
+    tables: Mapping[str, AttributeIndex]
+    field_case: str
+
+    def get(self, name: str) -> Optional[ModelAttribute]:
+        """
+        Gets an attribute by any accepted spelling.
+
+        Args:
+            name (str): The name, optionally qualified with a table name, e.g. ``author.firstName``.
+
+        Returns:
+            Optional[ModelAttribute]: The attribute, or None if there isn't one.
+        """
+        attribute = self.spellings.get(name)
+        if attribute is None and self.field_case:
+            table, _, column = name.rpartition(".")
+            converted = convert_case(column, self.field_case)
+            attribute = self.spellings.get(f"{table}.{converted}" if table else converted)
+        return attribute
+
+    def resolve(self, name: str) -> ModelAttribute:
+        """
+        Gets an attribute by any accepted spelling.
+
+        Args:
+            name (str): The name, optionally qualified with a table name.
+
+        Returns:
+            ModelAttribute: The attribute.
+
+        Raises:
+            CustomHTTPException: If the table or attribute does not exist.
+        """
+        attribute = self.get(name)
+        if attribute is not None:
+            return attribute
+
+        table, _, column = name.rpartition(".")
+        if table and table not in self.tables:
+            raise CustomHTTPException(400, f"Invalid table name: {table}")
+        raise CustomHTTPException(400, f"Invalid column name: {convert_case(column, self.field_case)}")
+
+
+def _name_spellings(name: str) -> Tuple[str, ...]:
+    """
+    Gets the spellings a name is accepted in, skipping any that would not convert back to the same words.
+
+    Args:
+        name (str): The name.
+
+    Returns:
+        Tuple[str, ...]: The spellings, the name itself first.
+    """
+    words = convert_case(name, "snake")
+    spellings = [name]
+    for case in ACCEPTED_CASES:
+        spelling = convert_case(name, case)
+        if spelling not in spellings and convert_case(spelling, "snake") == words:
+            spellings.append(spelling)
+    return tuple(spellings)
+
+
+def build_attribute_index(model: DeclarativeBase) -> AttributeIndex:
+    """
+    Indexes the columns and hybrid properties of a model by every accepted spelling, plain and qualified with the
+    model's table name.
+
+    Args:
+        model (DeclarativeBase): The model.
+
+    Returns:
+        AttributeIndex: The index.
+    """
+    ignore_underscore = get_config_or_model_meta("API_IGNORE_UNDERSCORE_ATTRIBUTES", model=model, default=True)
+    schema_case = get_config_or_model_meta("API_SCHEMA_CASE", model=model, default="camel")
+
+    attributes = {}
+    for name, attribute in model.__dict__.items():
+        if not isinstance(attribute, (hybrid_property, InstrumentedAttribute)):
+            continue
+        if ignore_underscore and name.startswith("_"):
+            continue
+
+        is_hybrid = isinstance(attribute, hybrid_property)
+        column_type = get_type_hint_from_hybrid(attribute) if is_hybrid else getattr(attribute, "type", None)
+        attributes[name] = ModelAttribute(model, name, attribute, column_type, is_hybrid)
+
+    table_name = convert_case(model.__name__, schema_case)
+    table_names = [table_name]
+    for spelling in _name_spellings(model.__name__) + (getattr(model, "__tablename__", None),):
+        if spelling and spelling not in table_names:
+            table_names.append(spelling)
+
+    # exact names are added first, so they win over another attribute's alternative spelling
+    spellings = dict(attributes)
+    for name, attribute in attributes.items():
+        for spelling in _name_spellings(name):
+            spellings.setdefault(spelling, attribute)
+
+    for table in table_names:
+        for spelling, attribute in list(spellings.items()):
+            if "." not in spelling:
+                spellings[f"{table}.{spelling}"] = attribute
+
+    return AttributeIndex(
+        model=model,
+        table_name=table_name,
+        table_names=tuple(table_names),
+        attributes=MappingProxyType(attributes),
+        spellings=MappingProxyType(spellings),
+    )
+
+
+def _get_store() -> Optional[Dict]:
+    """
+    Gets the index store for the current app, emptied whenever the config cache is invalidated.
+
+    Returns:
+        Optional[Dict]: The store, or None if outside an app context.
+    """
+    if not has_app_context():
+        return None
+    generation = config_generation()
+    entry = current_app.extensions.get(ATTRIBUTE_INDEX_EXTENSION)
+    if entry is None or entry[0] != generation:
+        entry = current_app.extensions[ATTRIBUTE_INDEX_EXTENSION] = (generation, {})
+    return entry[1]
+
+
+def get_attribute_index(model: DeclarativeBase) -> AttributeIndex:
+    """
+    Gets the attribute index for a model, built the first time it is needed and kept for the app.
+
+    Args:
+        model (DeclarativeBase): The model.
+
+    Returns:
+        AttributeIndex: The index.
+    """
+    store = _get_store()
+    if store is None:
+        return build_attribute_index(model)
+    index = store.get(model)
+    if index is None:
+        index = store[model] = build_attribute_index(model)
+    return index
+
+
+def get_attribute_lookup(model: DeclarativeBase, join_models: Optional[Dict[str, Any]] = None) -> AttributeLookup:
+    """
+    Gets the lookup for a model and the models joined to it, kept for the app.
+
+    Args:
+        model (DeclarativeBase): The model being queried.
+        join_models (Optional[Dict[str, Any]]): The joined models, by the name they were joined with.
+
+    Returns:
+        AttributeLookup: The lookup.
+    """
+    join_models = tuple((join_models or {}).items())
+    store = _get_store()
+    key = (model, join_models)
+    lookup = store.get(key) if store is not None else None
+    if lookup is not None:
+        return lookup
+
+    indexes = (get_attribute_index(model),) + tuple(get_attribute_index(join) for _, join in join_models)
+
+    spellings = {}
+    tables = {}
+    # the model's own attributes are added last, so they take precedence over the joined models'
+    for index in reversed(indexes):
+        spellings.update(index.spellings)
+        tables.update({table: index for table in index.table_names})
+    for name, join in join_models:
+        tables.setdefault(name, get_attribute_index(join))
+        for spelling, attribute in get_attribute_index(join).attributes.items():
+            spellings.setdefault(f"{name}.{spelling}", attribute)
+
+    field_case = get_config_or_model_meta("API_FIELD_CASE", default="snake_case")
+    lookup = AttributeLookup(
+        model=model,
+        indexes=indexes,
+        spellings=MappingProxyType(spellings),
+        tables=MappingProxyType(tables),
+        field_case=field_case,
+    )
+    if store is not None:
+        store[key] = lookup
+    return lookup
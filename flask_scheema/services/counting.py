@@ -0,0 +1,208 @@
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.engine import Dialect
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from flask_scheema.api.plan import get_route_plan
+from flask_scheema.exceptions import CustomHTTPException
+from flask_scheema.services.writes import get_write_generations
+from flask_scheema.utilities import get_app_cache, get_config_or_model_meta
+
+COUNT_CACHE_EXTENSION = "flask_scheema_count_cache"
+
+# how the total count is worked out for a list request.
+COUNT_MODES = ("exact", "cached", "estimate", "none")
+
+
+def get_count_mode(model: Any, args_dict: Dict[str, str]) -> str:
+    """
+    Gets how to count the records for a list request, from the ``?count=`` query parameter, or the route's
+    configuration.
+
+    Args:
+        model (Any): The model being listed.
+        args_dict (Dict[str, str]): Dictionary of request arguments.
+
+    Returns:
+        str: One of :data:`COUNT_MODES`.
+
+    Raises:
+        CustomHTTPException: If the ``count`` parameter or the configured mode is not a known mode.
+    """
+    mode = args_dict.get("count")
+    if mode is None:
+        plan = get_route_plan(model)
+        mode = plan.count_mode if plan else get_config_or_model_meta("API_COUNT_MODE", model=model, default="exact")
+
+    if mode not in COUNT_MODES:
+        raise CustomHTTPException(400, f"Invalid count value: {mode} (must be one of {', '.join(COUNT_MODES)})")
+    return mode
+
+
+def _hashable(value: Any) -> Any:
+    return tuple(value) if isinstance(value, list) else value
+
+
+def get_cached_count(session: Session, plan: Any, params: Dict[str, Any]) -> int:
+    """
+    Gets the count for a plan from the cache, counting and caching it if it isn't there or has expired. Counts are
+    kept per plan and filter values, and are dropped when any model the plan reads from is written to.
+
+    Args:
+        session (Session): The database session.
+        plan (QueryPlan): The query plan.
+        params (Dict[str, Any]): The bound parameters.
+
+    Returns:
+        int: The count.
+    """
+    cache = get_app_cache(COUNT_CACHE_EXTENSION, "API_COUNT_CACHE_SIZE", 256)
+    if cache is None:
+        return session.execute(plan.count_statement, params).scalar()
+
+    values = tuple(sorted((k, _hashable(v)) for k, v in params.items() if k not in ("_limit", "_offset")))
+    models = tuple(sorted(plan.models, key=lambda model: model.__name__))
+    key = (plan.model, plan.shape, models, values, get_write_generations(models))
+
+    entry = cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+
+    count = session.execute(plan.count_statement, params).scalar()
+    ttl = get_config_or_model_meta("API_COUNT_CACHE_TTL", model=plan.model, default=60)
+    cache.set(key, (time.monotonic() + ttl, count))
+    return count
+
+
+def estimate_count(session: Session, statement: Select, params: Dict[str, Any]) -> Optional[int]:
+    """
+    Gets the database's estimate of the number of rows a statement returns, from the query planner's statistics.
+    Only PostgreSQL and MySQL/MariaDB keep statistics that are useful here.
+
+    Args:
+        session (Session): The database session.
+        statement (Select): The filtered statement, without ordering or pagination.
+        params (Dict[str, Any]): The bound parameters.
+
+    Returns:
+        Optional[int]: The estimate, or None if the database can't give one.
+    """
+    connection = session.connection()
+    dialect = connection.dialect
+    if dialect.name not in ("postgresql", "mysql", "mariadb"):
+        return None
+
+    compiled = statement.params(**params).compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    parameters = compiled.params
+    if compiled.positional:
+        parameters = tuple(parameters[name] for name in compiled.positiontup)
+
+    if dialect.name == "postgresql":
+        output = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled.string}", parameters).scalar()
+        if isinstance(output, str):
+            output = json.loads(output)
+        return int(output[0]["Plan"]["Plan Rows"])
+
+    row = connection.exec_driver_sql(f"EXPLAIN {compiled.string}", parameters).mappings().first()
+    if row is None or row.get("rows") is None:
+        return None
+    return int(row["rows"] * float(row.get("filtered") or 100) / 100)
+
+
+def count_rows(session: Session, plan: Any, params: Dict[str, Any], mode: str) -> Optional[int]:
+    """
+    Counts the records a list request matches.
+
+    Args:
+        session (Session): The database session.
+        plan (QueryPlan): The query plan.
+        params (Dict[str, Any]): The bound parameters.
+        mode (str): ``exact`` runs a ``COUNT``, ``cached`` reuses a recent count for the same filters, ``estimate``
+            asks the database for an estimate and counts exactly where there isn't one, ``none`` skips counting.
+
+    Returns:
+        Optional[int]: The count, or None when not counting.
+    """
+    if mode == "none":
+        return None
+    if mode == "cached":
+        return get_cached_count(session, plan, params)
+    if mode == "estimate":
+        estimate = estimate_count(session, plan.filtered_statement, params)
+        if estimate is not None:
+            return estimate
+    return session.execute(plan.count_statement, params).scalar()
+
+
+def supports_window_count(dialect: Dialect) -> bool:
+    """
+    Checks whether a database can run ``COUNT(*) OVER ()``.
+
+    Args:
+        dialect (Dialect): The SQLAlchemy dialect of the connection.
+
+    Returns:
+        bool: True if window functions are supported.
+    """
+    if dialect.name == "sqlite":
+        dbapi = getattr(dialect, "loaded_dbapi", None) or dialect.dbapi
+        return getattr(dbapi, "sqlite_version_info", (0,)) >= (3, 25)
+    if dialect.name in ("mysql", "mariadb"):
+        version = dialect.server_version_info or (0,)
+        return version >= ((10, 2) if getattr(dialect, "is_mariadb", False) else (8,))
+    return dialect.name in ("postgresql", "mssql", "oracle")
+
+
+def uses_window_count(session: Session, plan: Any) -> bool:
+    """
+    Checks whether a page of a plan can be fetched with its total count in the same statement.
+
+    Args:
+        session (Session): The database session.
+        plan (QueryPlan): The query plan.
+
+    Returns:
+        bool: True if the plan has a windowed statement, the model allows it and the database supports it.
+    """
+    if plan.windowed_statement is None:
+        return False
+    route_plan = get_route_plan(plan.model)
+    if route_plan:
+        allowed = route_plan.window_count
+    else:
+        allowed = get_config_or_model_meta("API_WINDOW_COUNT", model=plan.model, default=True)
+    return bool(allowed) and supports_window_count(session.get_bind().dialect)
+
+
+def fetch_counted_page(session: Session, plan: Any, params: Dict[str, Any]) -> Tuple[List[Any], int]:
+    """
+    Fetches a page of a plan and the total count in one statement, the count is a ``COUNT(*) OVER ()`` column added
+    to every row.
+
+    Args:
+        session (Session): The database session.
+        plan (QueryPlan): The query plan.
+        params (Dict[str, Any]): The bound parameters, including ``_limit`` and ``_offset``.
+
+    Returns:
+        Tuple[List[Any], int]: The rows or model instances, and the count.
+    """
+    result = session.execute(plan.windowed_statement, params)
+    if plan.selects_columns:
+        width = len(result.keys()) - 1
+        frozen = result.freeze()
+        rows = frozen().all()
+        results = frozen().columns(*range(width)).all()
+    else:
+        rows = result.all()
+        results = [row[0] for row in rows]
+
+    if rows:
+        return results, rows[0][-1]
+    if params.get("_offset"):
+        # past the last page, there is no row to read the count from
+        return results, session.execute(plan.count_statement, params).scalar()
+    return results, 0
@@ -0,0 +1,322 @@
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from flask import current_app
+from itsdangerous import BadData, URLSafeSerializer
+from sqlalchemy import and_, bindparam, case, inspect, or_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from flask_scheema.api.plan import get_route_plan
+from flask_scheema.exceptions import CustomHTTPException
+from flask_scheema.services.attributes import AttributeLookup, ModelAttribute
+from flask_scheema.utilities import get_config_or_model_meta
+
+CURSOR_SALT = "flask-scheema-cursor"
+
+PAGINATION_MODES = ("offset", "cursor")
+
+# values that JSON can't hold are written as {tag: text}, and read back with the matching function.
+VALUE_TAGS = {
+    "dt": (datetime, datetime.fromisoformat),
+    "d": (date, date.fromisoformat),
+    "t": (time, time.fromisoformat),
+    "n": (Decimal, Decimal),
+    "u": (UUID, UUID),
+}
+
+
+@dataclass(frozen=True)
+class CursorColumn:
+    """
+    A column the cursor seeks on, with where to find its value in a result row.
+    """
+
+    name: str
+    expression: Any
+    descending: bool
+    index: Optional[int] = None
+    nullable: bool = False
+
+
+@dataclass(frozen=True)
+class CursorPlan:
+    """
+    The statements for paging through a query plan with cursors. Rows are ordered by the ``order_by`` columns with
+    the primary key last as a tie breaker, and each page seeks past the last row of the one before, rather than
+    skipping rows with an offset.
+    """
+
+    columns: Tuple[CursorColumn, ...]
+    first_statement: Select
+    next_statement: Select
+    previous_statement: Select
+    width: Optional[int] = None
+
+    @property
+    def order(self) -> List[str]:
+        return [f"-{column.name}" if column.descending else column.name for column in self.columns]
+
+
+def _value(position: int, column: CursorColumn) -> Any:
+    return bindparam(f"_c{position}", type_=column.expression.type)
+
+
+def _equal(position: int, column: CursorColumn) -> Any:
+    value = _value(position, column)
+    if not column.nullable:
+        return column.expression == value
+    return or_(column.expression == value, and_(column.expression.is_(None), value.is_(None)))
+
+
+def _beyond(position: int, column: CursorColumn, greater: bool) -> Any:
+    value = _value(position, column)
+    if not column.nullable:
+        return column.expression > value if greater else column.expression < value
+    # nulls sort after every value, see _ordering
+    if greater:
+        return or_(column.expression > value, and_(column.expression.is_(None), value.is_not(None)))
+    return or_(column.expression < value, and_(column.expression.is_not(None), value.is_(None)))
+
+
+def _seek(columns: Tuple[CursorColumn, ...], forward: bool) -> Any:
+    """
+    Builds the condition for rows after (or before) the cursor, ``(a > :a) OR (a = :a AND b > :b) ...``. Nullable
+    columns also compare their nulls, as greater than every value.
+    """
+    clauses = []
+    for position, column in enumerate(columns):
+        after = _beyond(position, column, column.descending != forward)
+        equal = [_equal(i, columns[i]) for i in range(position)]
+        clauses.append(and_(*equal, after) if equal else after)
+    return or_(*clauses)
+
+
+def _ordering(columns: Tuple[CursorColumn, ...], forward: bool) -> List[Any]:
+    # nulls are put last in ascending order on every dialect, rather than wherever the database puts them
+    ordering = []
+    for column in columns:
+        keys = [column.expression]
+        if column.nullable:
+            keys.insert(0, case((column.expression.is_(None), 1), else_=0))
+        ordering.extend(key.desc() if column.descending == forward else key.asc() for key in keys)
+    return ordering
+
+
+def _is_nullable(expression: Any) -> bool:
+    columns = getattr(getattr(expression, "property", None), "columns", None)
+    return not columns or any(getattr(column, "nullable", True) for column in columns)
+
+
+def build_cursor_plan(
+    statement: Select,
+    model: Any,
+    lookup: AttributeLookup,
+    order_by: Optional[str],
+    primary_key: Any,
+    select_fields: List[ModelAttribute],
+) -> Optional[CursorPlan]:
+    """
+    Builds the cursor statements for a query plan.
+
+    Args:
+        statement (Select): The filtered statement, without ordering or pagination.
+        model (Any): The model being listed.
+        lookup (AttributeLookup): The attributes of the model, to resolve ``order_by`` names.
+        order_by (Optional[str]): The ``order_by`` request argument.
+        primary_key (Any): The primary key column.
+        select_fields (List[ModelAttribute]): The attributes selected with ``?fields=``, if any.
+
+    Returns:
+        Optional[CursorPlan]: The plan, or None if the ordering uses columns of another model.
+    """
+    ordering = []
+    for key in (order_by or "").split(","):
+        if key:
+            descending = key.startswith("-")
+            attribute = lookup.resolve(key.lstrip("-"))
+            if attribute.model is not model:
+                return None
+            ordering.append((attribute.name, getattr(model, attribute.name), descending))
+
+    primary_key_name = inspect(model).get_property_by_column(primary_key).key
+    if primary_key_name not in [name for name, _, _ in ordering]:
+        ordering.append((primary_key_name, getattr(model, primary_key_name), False))
+
+    width = None
+    extra = []
+    columns = []
+    for name, expression, descending in ordering:
+        index = None
+        if select_fields:
+            width = len(select_fields)
+            index = next(
+                (i for i, field in enumerate(select_fields) if field.model is model and field.name == name), None
+            )
+            if index is None:
+                # selected to read the cursor from, then dropped from the rows
+                index = width + len(extra)
+                extra.append(expression)
+        columns.append(CursorColumn(name, expression, descending, index, _is_nullable(expression)))
+    columns = tuple(columns)
+
+    if extra:
+        statement = statement.add_columns(*extra)
+    limit = bindparam("_limit")
+    return CursorPlan(
+        columns=columns,
+        first_statement=statement.order_by(*_ordering(columns, True)).limit(limit),
+        next_statement=statement.where(_seek(columns, True)).order_by(*_ordering(columns, True)).limit(limit),
+        previous_statement=statement.where(_seek(columns, False)).order_by(*_ordering(columns, False)).limit(limit),
+        width=width if extra else None,
+    )
+
+
+def uses_cursor_pagination(model: Any, args_dict: Dict[str, str]) -> bool:
+    """
+    Checks whether a list request is paged with cursors, either because it passes ``?cursor=``, or the model is set
+    to use cursors and the request doesn't ask for a ``?page=``.
+
+    Args:
+        model (Any): The model being listed.
+        args_dict (Dict[str, str]): Dictionary of request arguments.
+
+    Returns:
+        bool: True to page with cursors.
+    """
+    if "cursor" in args_dict:
+        return True
+    plan = get_route_plan(model)
+    if plan:
+        mode = plan.pagination_mode
+    else:
+        mode = get_config_or_model_meta("API_PAGINATION_MODE", model=model, default="offset")
+
+    if mode not in PAGINATION_MODES:
+        raise CustomHTTPException(
+            500, f"Invalid API_PAGINATION_MODE: {mode} (must be one of {', '.join(PAGINATION_MODES)})"
+        )
+    return mode == "cursor" and "page" not in args_dict
+
+
+def _get_serializer() -> URLSafeSerializer:
+    secret_key = current_app.config.get("SECRET_KEY")
+    if not secret_key:
+        raise CustomHTTPException(500, "SECRET_KEY must be set in the Flask app config to use cursor pagination.")
+    return URLSafeSerializer(secret_key, salt=CURSOR_SALT)
+
+
+def _encode_value(value: Any) -> Any:
+    for tag, (value_type, _) in VALUE_TAGS.items():
+        if isinstance(value, value_type):
+            return {tag: str(value) if value_type in (Decimal, UUID) else value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and len(value) == 1:
+        tag, text = next(iter(value.items()))
+        return VALUE_TAGS[tag][1](text)
+    return value
+
+
+def encode_cursor(cursor_plan: CursorPlan, values: List[Any], forward: bool) -> str:
+    """
+    Makes a signed cursor, for the page after (or before) the row with the values.
+
+    Args:
+        cursor_plan (CursorPlan): The cursor plan.
+        values (List[Any]): The row's values for the cursor columns.
+        forward (bool): True for the next page, False for the previous one.
+
+    Returns:
+        str: The cursor, safe to use in a URL.
+    """
+    return _get_serializer().dumps(
+        {"o": cursor_plan.order, "v": [_encode_value(v) for v in values], "f": forward}
+    )
+
+
+def decode_cursor(cursor_plan: CursorPlan, token: str) -> Tuple[List[Any], bool]:
+    """
+    Reads a cursor made by :func:`encode_cursor`.
+
+    Args:
+        cursor_plan (CursorPlan): The cursor plan for the request.
+        token (str): The cursor.
+
+    Returns:
+        Tuple[List[Any], bool]: The values to seek from, and whether to page forwards.
+
+    Raises:
+        CustomHTTPException: If the cursor is not valid, or was made for a different ordering.
+    """
+    try:
+        data = _get_serializer().loads(token)
+        values = [_decode_value(v) for v in data["v"]]
+        forward = bool(data["f"])
+    except (BadData, KeyError, TypeError, ValueError):
+        raise CustomHTTPException(400, "Invalid cursor")
+
+    if data.get("o") != cursor_plan.order or len(values) != len(cursor_plan.columns):
+        raise CustomHTTPException(400, "Cursor does not match the order_by of the request")
+    return values, forward
+
+
+def fetch_cursor_page(
+    session: Session, plan: Any, params: Dict[str, Any], limit: int, token: Optional[str]
+) -> Tuple[List[Any], Optional[str], Optional[str]]:
+    """
+    Fetches a page of a query plan by cursor. One row more than the page is fetched, to tell whether there are more
+    rows in the direction of travel.
+
+    Args:
+        session (Session): The database session.
+        plan (QueryPlan): The query plan.
+        params (Dict[str, Any]): The bound parameters.
+        limit (int): The page size.
+        token (Optional[str]): The cursor from the request, None for the first page.
+
+    Returns:
+        Tuple: The rows, and the cursors for the next and previous pages, None where there isn't one.
+    """
+    cursor_plan = plan.cursor
+    if cursor_plan is None:
+        raise CustomHTTPException(400, f"Cursor pagination can only order by columns of {plan.model.__name__}")
+
+    forward = True
+    statement = cursor_plan.first_statement
+    if token:
+        values, forward = decode_cursor(cursor_plan, token)
+        statement = cursor_plan.next_statement if forward else cursor_plan.previous_statement
+        params.update({f"_c{i}": value for i, value in enumerate(values)})
+    params["_limit"] = limit + 1
+
+    result = session.execute(statement, params)
+    if plan.selects_columns:
+        frozen = result.freeze()
+        rows = frozen().all()
+        keys = [[row[column.index] for column in cursor_plan.columns] for row in rows]
+        if cursor_plan.width is not None:
+            rows = frozen().columns(*range(cursor_plan.width)).all()
+    else:
+        if plan.unique:
+            result = result.unique()
+        rows = result.scalars().all()
+        keys = [[getattr(row, column.name) for column in cursor_plan.columns] for row in rows]
+
+    more = len(rows) > limit
+    rows, keys = rows[:limit], keys[:limit]
+    if not forward:
+        rows, keys = rows[::-1], keys[::-1]
+
+    next_cursor = previous_cursor = None
+    if rows:
+        if more or not forward:
+            next_cursor = encode_cursor(cursor_plan, keys[-1], True)
+        if token and (more or forward):
+            previous_cursor = encode_cursor(cursor_plan, keys[0], False)
+    return rows, next_cursor, previous_cursor
@@ -1,23 +1,33 @@
+import time
 from functools import wraps
 from typing import Callable, Union, Dict, List, Optional, Any
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
 import sqlalchemy
-from flask import request
-from sqlalchemy import desc, inspect, Column, and_, func
+from flask import g, request
+from sqlalchemy import desc, inspect, Column, func
 from sqlalchemy.exc import IntegrityError, DataError
 from sqlalchemy.orm import Query, Session, class_mapper
+from sqlalchemy.sql import Select
 
+from flask_scheema.api.plan import get_route_plan
 from flask_scheema.api.utils import get_primary_keys
 from flask_scheema.exceptions import CustomHTTPException
+from flask_scheema.services.counting import (
+    count_rows,
+    fetch_counted_page,
+    get_count_mode,
+    uses_window_count,
+)
+from flask_scheema.services.cursors import fetch_cursor_page, uses_cursor_pagination
+from flask_scheema.services.loading import get_loader_options
+from flask_scheema.services.planner import QueryPlan, get_query_plan, get_plan_stats_recorder
+from flask_scheema.services.streaming import RowStream, get_stream_batch_size, get_stream_format, stream_rows
+from flask_scheema.services.validators import Validators, check_not_modified, get_etag_source, get_validators
 from flask_scheema.services.operators import (
     aggregate_funcs,
     get_pagination,
-    get_all_columns_and_hybrids,
     get_group_by_fields,
-    get_select_fields,
-    create_conditions_from_args,
-    get_models_for_join,
     create_aggregate_conditions,
     get_table_and_column,
     get_column_and_table_name_and_operator,
@@ -45,7 +55,8 @@ def add_dict_to_query(f: Callable) -> Callable:
                     output["dictionary"] = [
                         result._asdict() for result in output["query"]
                     ]
-                output["dictionary"] = output["query"]._asdict()
+                else:
+                    output["dictionary"] = output["query"]._asdict()
 
             except AttributeError:
                 pass
@@ -81,6 +92,9 @@ def add_page_totals_and_urls(f: Callable) -> Callable:
         limit = output.get("limit")
         page = output.get("page")
         total_count = output.get("total_count")
+        # set instead of the total when the list was not counted
+        has_next = output.get("has_next")
+        cursor_paged = "next_cursor" in output
 
         parsed_url = urlparse(request.url)
         query_params = parse_qs(parsed_url.query)
@@ -90,11 +104,26 @@ def add_page_totals_and_urls(f: Callable) -> Callable:
         current_page = None
         total_pages = None
 
+        if cursor_paged:
+            # pages are found by cursor, so there are no page numbers
+            query_params.pop("page", None)
+            query_params["limit"] = [str(limit)]
+
+            def cursor_url(cursor):
+                if not cursor:
+                    return None
+                query_params["cursor"] = [cursor]
+                return urlunparse(parsed_url._replace(query=urlencode(query_params, doseq=True)))
+
+            next_url = cursor_url(output["next_cursor"])
+            previous_url = cursor_url(output["previous_cursor"])
+
         # Calculate total_pages and current_page
-        if total_count and limit:
-            total_pages = -(
-                -total_count // limit
-            )  # Equivalent to math.ceil(count / limit)
+        elif (total_count or has_next is not None) and limit:
+            if total_count:
+                total_pages = -(
+                    -total_count // limit
+                )  # Equivalent to math.ceil(count / limit)
             current_page = page
 
             # Update the 'page' query parameter for the next and previous URLs
@@ -106,7 +135,10 @@ def add_page_totals_and_urls(f: Callable) -> Callable:
             prev_query_string = urlencode(query_params, doseq=True)
 
             # Determine if there are next and previous pages
-            next_page = page + 1 if (page + 1) * limit < total_count else None
+            if has_next is not None:
+                next_page = page + 1 if has_next else None
+            else:
+                next_page = page + 1 if (page + 1) * limit < total_count else None
             prev_page = page - 1 if page > 1 else None
 
             # Construct next and previous URLs
@@ -229,82 +261,54 @@ class CrudService:
 
         return related_model.mapper.class_
 
-    def get_query_from_args(self, args_dict: Dict[str, Union[str, int]]) -> Query:
+    def get_eager_load_options(
+        self, query: Union[Query, Select], output_schema: Optional[Callable] = None, stream: bool = False
+    ) -> tuple:
         """
-                Filters a query based on request arguments. Handles filtering, sorting, pagination and aggregation.
+                Gets the eager loading options for the route's output schema, for a query of whole models.
 
         Args:
-            args_dict (dict): Dictionary containing filtering and pagination conditions.
+            query (Union[Query, Select]): The query or select statement to load.
+            output_schema (Optional[Callable]): The schema the results are dumped with, defaults to the route's.
+            stream (bool): Whether the results are streamed, collections are then loaded with ``selectinload``.
 
         Returns:
-            Query: The filtered query.
+            tuple: The loader options, empty if the query selects columns.
 
         """
-        # columns in the model
-
-        # get the models to join
-        join_models: Dict = get_models_for_join(args_dict, self.get_model_by_name)
-
-        # get all columns in the model
-        all_columns, all_models = get_all_columns_and_hybrids(
-            self.model, join_models
-        )  # table name, column name, column
-
-
-        # create the conditions
-        conditions: List = [
-            x
-            for x in create_conditions_from_args(
-                args_dict, self.model, all_columns, all_models, join_models
-            )
-            if x is not None
-        ]
-
-        # # create the aggregates
-        # aggregates: Optional[Dict[str, Optional[str]]] = create_aggregate_conditions(
-        #     args_dict
-        # )
-
-        # # apply the aggregates
-        # if aggregates:
-        #     aggregate_columns = self.calculate_aggregates(aggregates, all_columns)
-        #     # combine the select fields with the aggregate columns
-        #     select_fields = select_fields + aggregate_columns
-
-        # get the select fields
-        allow_select = get_config_or_model_meta("API_ALLOW_SELECT_FIELDS", model=self.model, default=True)
-        query = None
-        if allow_select:
-            select_fields: List[Callable] = get_select_fields(
-                args_dict, self.model, all_columns
-            )
-            # create the query
-            if select_fields:
-                query: Query = self.session.query(*select_fields)
+        descriptions = query.column_descriptions
+        if len(descriptions) != 1 or descriptions[0]["type"] is not self.model:
+            # columns selected with ?fields= have no relationships to load
+            return ()
+
+        if output_schema is None:
+            plan = get_route_plan(self.model)
+            if plan:
+                output_schema = plan.output_schema
+            else:
+                from flask_scheema.scheema.utils import get_input_output_from_model_or_make
 
-        if not query:
-            query: Query = self.session.query(self.model)
+                output_schema = get_input_output_from_model_or_make(self.model)[1]
 
-        # # join the models
-        # for k, v in join_models.items():
-        #     query = query.join(v)
+        return get_loader_options(self.model, output_schema, stream=stream)
 
-        # groupby_columns: List[Callable] = get_group_by_fields(
-        #     args_dict, all_columns, self.model
-        # )
-        # # apply the groupby
-        # if groupby_columns:
-        #     query = query.group_by(*groupby_columns)
+    def apply_eager_loading(
+        self, query: Union[Query, Select], output_schema: Optional[Callable] = None
+    ) -> Union[Query, Select]:
+        """
+                Adds the eager loading options for the route's output schema to a query of whole models, so nested
+                relationships are loaded with the results rather than one query per row.
 
-        # apply the conditions
-        if conditions and get_config_or_model_meta("API_ALLOW_FILTER", model=self.model, default=True):
-            query = query.filter(and_(*conditions))
+        Args:
+            query (Union[Query, Select]): The query or select statement to load.
+            output_schema (Optional[Callable]): The schema the results are dumped with, defaults to the route's.
 
-        # Handle Sorting
-        if get_config_or_model_meta("API_ALLOW_ORDER_BY", model=self.model, default=True):
-            query = apply_order_by(args_dict, query, self.model)
+        Returns:
+            Union[Query, Select]: The query with loader options.
 
-        return query
+        """
+        options = self.get_eager_load_options(query, output_schema)
+        return query.options(*options) if options else query
 
     def calculate_aggregates(
         self, aggregate_conditions: Dict, all_columns: Dict[str, Dict[str, Column]]
@@ -379,19 +383,88 @@ class CrudService:
 
         """
         pk = get_primary_keys(self.model)
-        query = self.get_query_from_args(args_dict)
+        recorder = get_plan_stats_recorder()
 
-        if lookup_val:  # and not multiple:
+        # work out the plan for the shape of the request, and bind this request's values to it
+        start = time.perf_counter()
+        lookup = (alt_field or "pk") if lookup_val else None
+        plan, values = get_query_plan(
+            self, args_dict, lookup=lookup, many=many, other_model=None if lookup else other_model
+        )
+        params = plan.bind(values, lookup_val=lookup_val)
 
-            if alt_field:
-                query = query.filter_by(**{alt_field: lookup_val})
+        use_cursor = False
+        stream_format = None if lookup_val else get_stream_format(args_dict)
+        stream = stream_format is not None
+        if lookup_val:  # and not multiple:
+            statement = plan.statement
+        else:
+            page, limit = get_pagination(args_dict)
+            use_cursor = uses_cursor_pagination(self.model, args_dict)
+            if use_cursor:
+                statement = None
+                per_page = limit if limit > 0 else 20
+            elif stream and "page" not in args_dict and "limit" not in args_dict:
+                # a stream that doesn't ask for a page returns every row, so there are no page urls
+                statement = plan.statement
+                page = limit = None
+            elif page or limit:
+                # the same defaults as Flask-SQLAlchemy's paginate
+                page_number = page if page > 0 else 1
+                per_page = limit if limit > 0 else 20
+                statement = plan.paged_statement
+                params.update(_limit=per_page, _offset=(page_number - 1) * per_page)
             else:
-                query = query.filter(pk == lookup_val)
+                statement = plan.statement
+        if recorder:
+            recorder.record("parse", time.perf_counter() - start)
+
+        # conditional GETs are answered from cheap validators before the rows are fetched, see API_CONDITIONAL_GET
+        etag_source = None if stream else get_etag_source(self.model)
+        if etag_source in ("version", "updated"):
+            validators = get_validators(self.session, plan, params, etag_source, single=bool(lookup_val))
+            check_not_modified(validators)
+            g.response_validators = validators
+        elif etag_source == "body":
+            g.response_validators = Validators()
+
+        start = time.perf_counter()
+        count = None
+        count_mode = None
+        windowed = False
+        if not lookup_val:
+            count_mode = get_count_mode(self.model, args_dict)
+            # an exact count of an offset page is read from the page's own rows where the database allows it
+            windowed = (
+                count_mode == "exact"
+                and not stream
+                and statement is plan.paged_statement
+                and uses_window_count(self.session, plan)
+            )
+            if count_mode == "none" and "_limit" in params and not stream:
+                # fetch one extra row to tell whether there is a next page
+                params["_limit"] += 1
+            if not windowed:
+                count = count_rows(self.session, plan, params, count_mode)
+        if use_cursor:
+            results, next_cursor, previous_cursor = fetch_cursor_page(
+                self.session, plan, params, per_page, args_dict.get("cursor")
+            )
+        elif windowed:
+            results, count = fetch_counted_page(self.session, plan, params)
+        elif stream:
+            results = stream_rows(
+                self.session, plan, statement, params, get_stream_batch_size(self.model), stream_format
+            )
+        else:
+            results = self.execute_plan(plan, statement, params)
+        if recorder:
+            recorder.record("execute", time.perf_counter() - start)
 
-            if many:
-                results = query.all()
-            else:
-                results = query.first()
+        if lookup_val:  # and not multiple:
+
+            if not many:
+                results = results[0] if results else None
 
             if not results:
                 raise CustomHTTPException(
@@ -402,26 +475,40 @@ class CrudService:
 
         else:
 
-            if other_model:
-                pk = get_primary_keys(other_model)
-                query = query.join(other_model).filter(pk == lookup_val)
-
-            count = self.session.query(func.count()).select_from(query).scalar()
-            page, limit = get_pagination(args_dict)
-            if page or limit:
-                query = apply_pagination(query, page, limit)
-
-            if hasattr(query, "all"):
-                results = query.all()
-            else:
-                results = query.items
-
-            return {
+            output = {
                 "query": results,
                 "total_count": count,
                 "page": page,
                 "limit": limit,
             }
+            if use_cursor:
+                output.update(next_cursor=next_cursor, previous_cursor=previous_cursor)
+                if stream:
+                    output["query"] = RowStream(iter([results]), stream_format)
+            elif count_mode == "none" and "_limit" in params and not stream:
+                output["has_next"] = len(results) >= params["_limit"]
+                output["query"] = results[: params["_limit"] - 1]
+            return output
+
+    def execute_plan(self, plan: QueryPlan, statement: Select, params: Dict[str, Any]) -> List[Any]:
+        """
+                Executes one of a query plan's statements.
+
+        Args:
+            plan (QueryPlan): The query plan.
+            statement (Select): The statement to execute.
+            params (dict): The bound parameters.
+
+        Returns:
+            list: Rows when fields are selected, otherwise model instances.
+
+        """
+        result = self.session.execute(statement, params)
+        if plan.selects_columns:
+            return result.all()
+        if plan.unique:
+            result = result.unique()
+        return result.scalars().all()
 
     def create(self, **kwargs) -> object:
         """
@@ -0,0 +1,302 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy import and_, or_
+
+from flask_scheema.exceptions import CustomHTTPException
+from flask_scheema.services.attributes import AttributeLookup, ModelAttribute
+from flask_scheema.services.operators import (
+    OPERATORS,
+    aggregate_funcs,
+    apply_operator,
+    is_empty_numeric_value,
+    prepare_condition_value,
+)
+
+# the conjunctions a group of filters can be written with, e.g. ``or[id__eq=1, id__eq=2]``.
+GROUP_CONJUNCTIONS = ("and", "or")
+
+# groups nested deeper than this are rejected, rather than recursing until python gives up.
+MAX_GROUP_DEPTH = 32
+
+# characters that end a name, whitespace also ends one.
+NAME_DELIMITERS = frozenset("[]=,")
+
+
+@dataclass(frozen=True)
+class Token:
+    """
+    A token of a filter expression.
+    """
+
+    kind: str
+    text: str
+    position: int
+
+
+@dataclass(frozen=True)
+class Condition:
+    """
+    A single filter, e.g. ``author.first_name__eq``. The value is not kept, so conditions that only differ in their
+    value are equal, only whether it was empty, as conditions on numeric columns are dropped for empty values.
+    """
+
+    field: str
+    operator: str
+    empty: bool
+
+
+@dataclass(frozen=True)
+class Group:
+    """
+    Filters joined with ``and`` or ``or``, the items can be conditions or other groups.
+    """
+
+    conjunction: str
+    items: Tuple[Union[Condition, "Group"], ...]
+
+
+FilterNode = Union[Condition, Group]
+
+
+def _error(text: str, position: int, message: str) -> CustomHTTPException:
+    """
+    Makes the error for a malformed filter.
+
+    Args:
+        text (str): The filter expression.
+        position (int): Where in the expression the error is.
+        message (str): What is wrong.
+
+    Returns:
+        CustomHTTPException: The 400 error to raise.
+    """
+    return CustomHTTPException(400, f"Invalid filter '{text}': {message} at position {position}")
+
+
+def tokenize(text: str) -> Iterator[Token]:
+    """
+    Splits a filter expression into tokens in a single pass. After ``=`` the text up to the next ``,`` or ``]`` is
+    one value token, unless it starts with ``(``, when the value runs to the closing ``)`` so it can hold commas.
+
+    Args:
+        text (str): The filter expression, e.g. ``or[id__in=(1,2), title__like=dune]``.
+
+    Yields:
+        Token: ``name``, ``value``, ``[``, ``]``, ``,`` or ``=`` tokens, then an ``end`` token.
+
+    Raises:
+        CustomHTTPException: If a ``(`` is not closed.
+    """
+    length = len(text)
+    position = 0
+    while position < length:
+        char = text[position]
+        if char.isspace():
+            position += 1
+        elif char == "=":
+            yield Token("=", char, position)
+            position += 1
+
+            while position < length and text[position].isspace():
+                position += 1
+            start = position
+            if position < length and text[position] == "(":
+                end = text.find(")", position)
+                if end == -1:
+                    raise _error(text, position, "'(' is not closed")
+                position = end + 1
+                yield Token("value", text[start:position], start)
+            else:
+                while position < length and text[position] not in ",]":
+                    position += 1
+                yield Token("value", text[start:position].rstrip(), start)
+        elif char in NAME_DELIMITERS:
+            yield Token(char, char, position)
+            position += 1
+        else:
+            start = position
+            while position < length and text[position] not in NAME_DELIMITERS and not text[position].isspace():
+                position += 1
+            yield Token("name", text[start:position], start)
+
+    yield Token("end", "", length)
+
+
+def parse_condition_key(key: str, text: Optional[str] = None, position: int = 0) -> Tuple[str, str]:
+    """
+    Splits a filter key into its field and operator.
+
+    Args:
+        key (str): The key, e.g. ``author.first_name__eq``.
+        text (Optional[str]): The expression the key is part of, for error messages.
+        position (int): Where the key starts in the expression.
+
+    Returns:
+        Tuple[str, str]: The field and the operator.
+
+    Raises:
+        CustomHTTPException: If the field is missing or the operator is not known.
+    """
+    text = key if text is None else text
+    parts = key.split("__")
+    if len(parts) != 2 or not parts[0]:
+        raise _error(text, position, f"expected <field>__<operator>, got '{key}'")
+    field, operator = parts
+    if operator not in OPERATORS:
+        raise _error(text, position + len(field) + 2, f"unknown operator '{operator}'")
+    return field, operator
+
+
+class _Parser:
+    """
+    A recursive descent parser for filter expressions::
+
+        expression := conjunction "[" expression ("," expression)* "]"
+                    | name "=" value
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.token = next(self.tokens)
+        self.values: List[str] = []
+
+    def advance(self) -> Token:
+        token = self.token
+        self.token = next(self.tokens, token)
+        return token
+
+    def expect(self, kind: str, description: str) -> Token:
+        if self.token.kind != kind:
+            found = f"'{self.token.text}'" if self.token.kind != "end" else "end of filter"
+            raise _error(self.text, self.token.position, f"expected {description}, found {found}")
+        return self.advance()
+
+    def parse(self) -> FilterNode:
+        node = self.expression(0)
+        self.expect("end", "end of filter")
+        return node
+
+    def expression(self, depth: int) -> FilterNode:
+        name = self.expect("name", "a filter or group")
+        if self.token.kind == "[":
+            if name.text not in GROUP_CONJUNCTIONS:
+                raise _error(self.text, name.position, f"unknown group '{name.text}', use 'and' or 'or'")
+            if depth >= MAX_GROUP_DEPTH:
+                raise _error(self.text, name.position, f"groups are nested more than {MAX_GROUP_DEPTH} deep")
+            self.advance()
+            items = [self.expression(depth + 1)]
+            while self.token.kind == ",":
+                self.advance()
+                items.append(self.expression(depth + 1))
+            self.expect("]", "',' or ']'")
+            return Group(name.text, tuple(items))
+
+        field, operator = parse_condition_key(name.text, self.text, name.position)
+        self.expect("=", "'='")
+        value = self.expect("value", "a value").text
+        self.values.append(value)
+        return Condition(field, operator, value == "")
+
+
+def parse_filter(text: str) -> Tuple[FilterNode, List[str]]:
+    """
+    Parses a filter expression.
+
+    Args:
+        text (str): The expression, e.g. ``or[id__eq=1, and[title__like=dune, author_id__eq=2]]``.
+
+    Returns:
+        Tuple[FilterNode, List[str]]: The parsed filter, and its values in the order its conditions appear.
+
+    Raises:
+        CustomHTTPException: If the expression is malformed.
+    """
+    parser = _Parser(text)
+    return parser.parse(), parser.values
+
+
+def _is_group(key: str) -> bool:
+    return any(key.startswith(f"{conjunction}[") for conjunction in GROUP_CONJUNCTIONS)
+
+
+def parse_filter_args(args_dict: Dict[str, str]) -> Tuple[Group, List[str]]:
+    """
+    Parses the filters in the request arguments. Keys of the form ``<field>__<operator>`` are conditions, and keys
+    starting ``or[`` or ``and[`` are groups, whose key and value are joined back together and parsed as one
+    expression, e.g. ``or[id__eq`` and ``1, id__eq=2]``. Other arguments, pagination, ``fields`` and so on, are skipped, as are aggregates (``id__sum``).
+
+    The filters are sorted, so requests that only differ in the order or values of their filters give the same tree.
+
+    Args:
+        args_dict (Dict[str, str]): Dictionary of request arguments.
+
+    Returns:
+        Tuple[Group, List[str]]: The filters, all joined with ``and``, and their values in the order their conditions
+        appear in the tree.
+
+    Raises:
+        CustomHTTPException: If a filter is malformed.
+    """
+    filters = []
+    for key, value in args_dict.items():
+        if _is_group(key) or ("[" in key and "__" in key):
+            filters.append(parse_filter(f"{key}={value}"))
+        elif "__" in key and "|" not in key and key.rsplit("__", 1)[-1] not in aggregate_funcs:
+            field, operator = parse_condition_key(key)
+            filters.append((Condition(field, operator, value == ""), [value]))
+
+    filters.sort(key=lambda item: repr(item[0]))
+    tree = Group("and", tuple(item[0] for item in filters))
+    values = [value for item in filters for value in item[1]]
+    return tree, values
+
+
+def compile_filter(
+    node: FilterNode,
+    lookup: AttributeLookup,
+    parameter: Callable[[int, Condition, ModelAttribute], Any],
+) -> Tuple[Optional[Any], List[Tuple[int, Condition, ModelAttribute]]]:
+    """
+    Builds the SQL expression for a filter tree.
+
+    Args:
+        node (FilterNode): The filter tree, from :func:`parse_filter_args`.
+        lookup (AttributeLookup): The attributes of the model and the join models.
+        parameter (Callable): Gets the value to compare against for a condition, from the index of its value, the
+            condition and its attribute. This can be a bound parameter, or the converted request value.
+
+    Returns:
+        Tuple: The expression, or None if there are no conditions, and the index, condition and attribute of each
+        condition that is part of it.
+
+    Raises:
+        CustomHTTPException: If a table or column does not exist.
+    """
+    used = []
+    index = 0
+
+    def build(item: FilterNode) -> Optional[Any]:
+        nonlocal index
+        if isinstance(item, Group):
+            expressions = [x for x in (build(child) for child in item.items) if x is not None]
+            if not expressions:
+                return None
+            if len(expressions) == 1:
+                return expressions[0]
+            return (or_ if item.conjunction == "or" else and_)(*expressions)
+
+        value_index = index
+        index += 1
+        attribute = lookup.resolve(item.field)
+        if item.empty and is_empty_numeric_value(prepare_condition_value(item.operator, ""), attribute.column_type):
+            return None
+
+        value = parameter(value_index, item, attribute)
+        expression = apply_operator(attribute.attribute, attribute.name, item.operator, value, attribute.model)
+        if expression is not None:
+            used.append((value_index, item, attribute))
+        return expression
+
+    return build(node), used
@@ -0,0 +1,162 @@
+from typing import Optional, Type, Tuple, List, Any, FrozenSet
+
+from marshmallow import Schema, fields
+from sqlalchemy import inspect
+from sqlalchemy.orm import DeclarativeBase, selectinload, joinedload
+
+from flask_scheema.logging import logger
+from flask_scheema.utilities import get_app_cache, get_config_or_model_meta
+
+LOADER_OPTIONS_EXTENSION = "flask_scheema_loader_options"
+
+# the strategies that can be set with ``API_EAGER_LOAD``, ``auto`` joins to-one relations and selects collections.
+EAGER_LOAD_STRATEGIES = ("auto", "selectin", "joined", "lazy")
+
+# how many relationships deep nested schemas are followed
+MAX_EAGER_LOAD_DEPTH = 3
+
+
+def _get_strategy(model: DeclarativeBase) -> str:
+    """
+    Gets the eager load strategy for a model's relationships.
+
+    Args:
+        model (DeclarativeBase): The model the relationships are declared on.
+
+    Returns:
+        str: One of ``EAGER_LOAD_STRATEGIES``.
+    """
+    strategy = get_config_or_model_meta("API_EAGER_LOAD", model=model, default="auto")
+    if strategy is False or strategy is None:
+        return "lazy"
+    if strategy is True:
+        return "auto"
+    if strategy not in EAGER_LOAD_STRATEGIES:
+        logger.error(f"Invalid eager load strategy `{strategy}` for -{model.__name__}-, using `auto`.")
+        return "auto"
+    return strategy
+
+
+def _nested_relationships(model: DeclarativeBase, schema: Schema) -> List[Tuple[Any, Schema]]:
+    """
+    Gets the relationships of a model that a schema dumps with nested schemas.
+
+    Args:
+        model (DeclarativeBase): The model the schema dumps.
+        schema (Schema): The schema instance.
+
+    Returns:
+        List[Tuple]: The relationship properties and the nested schema instances.
+    """
+    relationships = inspect(model).relationships
+    nested = []
+    for name, field in schema.dump_fields.items():
+        if not isinstance(field, fields.Nested):
+            continue
+        relationship = relationships.get(name)
+        if relationship is None:
+            continue
+        nested.append((relationship, field.schema))
+    return nested
+
+
+def build_loader_options(
+    model: DeclarativeBase,
+    output_schema: Type[Schema],
+    max_depth: int = MAX_EAGER_LOAD_DEPTH,
+    stream: bool = False,
+) -> Tuple[Any, ...]:
+    """
+    Derives the eager loading options for a query from the nested fields of its output schema, so related objects
+    are loaded with the page instead of one query per row.
+
+    Each relationship uses the ``API_EAGER_LOAD`` strategy of the model it is declared on. Relationships already on
+    the path are not followed again.
+
+    Args:
+        model (DeclarativeBase): The model being queried.
+        output_schema (Type[Schema]): The schema the results are dumped with.
+        max_depth (int): How many relationships deep to follow.
+        stream (bool): Whether the results are streamed, collections are then always loaded with ``selectinload``,
+            as joined collections repeat rows that can only be de-duplicated across the whole result.
+
+    Returns:
+        Tuple: The loader options, to be passed to ``query.options``.
+    """
+    options = []
+
+    def walk(current_model, schema, parent_loader, path: FrozenSet, depth: int):
+        if depth >= max_depth:
+            return
+        strategy = _get_strategy(current_model)
+        if strategy == "lazy":
+            return
+
+        for relationship, nested_schema in _nested_relationships(current_model, schema):
+            if relationship in path:
+                continue
+
+            if stream and relationship.uselist:
+                loader = selectinload
+            elif strategy == "joined" or (strategy == "auto" and not relationship.uselist):
+                loader = joinedload
+            else:
+                loader = selectinload
+
+            attribute = relationship.class_attribute
+            option = getattr(parent_loader, loader.__name__)(attribute) if parent_loader is not None else loader(attribute)
+            options.append(option)
+
+            walk(relationship.mapper.class_, nested_schema, option, path | {relationship}, depth + 1)
+
+    walk(model, output_schema(), None, frozenset(), 0)
+    return tuple(options)
+
+
+def get_loader_options(
+    model: DeclarativeBase, output_schema: Optional[Type[Schema]], stream: bool = False
+) -> Tuple[Any, ...]:
+    """
+    Gets the eager loading options for a model and output schema, cached per app up to
+    ``API_LOADER_OPTIONS_CACHE_SIZE`` entries.
+
+    Args:
+        model (DeclarativeBase): The model being queried.
+        output_schema (Optional[Type[Schema]]): The schema the results are dumped with.
+        stream (bool): Whether the results are streamed, see :func:`build_loader_options`.
+
+    Returns:
+        Tuple: The loader options.
+    """
+    if output_schema is None:
+        return ()
+
+    cache = get_app_cache(LOADER_OPTIONS_EXTENSION, "API_LOADER_OPTIONS_CACHE_SIZE", 256)
+    key = (model, output_schema, stream)
+    if cache is not None and key in cache:
+        return cache.get(key)
+
+    options = build_loader_options(model, output_schema, stream=stream)
+    logger.debug(4, f"Eager loading {len(options)} relationships for -{model.__name__}-")
+    if cache is not None:
+        cache.set(key, options)
+    return options
+
+
+def requires_unique(options: Tuple[Any, ...]) -> bool:
+    """
+    Checks whether any of the loader options join a collection, those results must be de-duplicated with
+    ``Result.unique()``.
+
+    Args:
+        options (Tuple): The loader options.
+
+    Returns:
+        bool: True if a collection is joined.
+    """
+    for option in options:
+        for element in option.context:
+            path = element.path.path
+            if element.strategy == (("lazy", "joined"),) and len(path) > 1 and getattr(path[-2], "uselist", False):
+                return True
+    return False
@@ -47,13 +47,24 @@ def get_pagination(args_dict: Dict[str, str]):
     # Handle Pagination
     from flask_scheema.utilities import get_config_or_model_meta
 
+    from flask_scheema.api.plan import get_route_plan
+
+    plan = get_route_plan()
     PAGINATION_DEFAULTS = {
         "page": 1,
-        "limit": get_config_or_model_meta("API_PAGINATION_SIZE_DEFAULT", default=20),
+        "limit": (
+            plan.pagination_default
+            if plan
+            else get_config_or_model_meta("API_PAGINATION_SIZE_DEFAULT", default=20)
+        ),
     }
     PAGINATION_MAX = {
         "page": 1,
-        "limit": get_config_or_model_meta("API_PAGINATION_SIZE_MAX", default=100),
+        "limit": (
+            plan.pagination_max
+            if plan
+            else get_config_or_model_meta("API_PAGINATION_SIZE_MAX", default=100)
+        ),
     }
 
     page = args_dict.get("page", PAGINATION_DEFAULTS["page"])
@@ -83,40 +94,34 @@ def get_pagination(args_dict: Dict[str, str]):
 def get_all_columns_and_hybrids(
     model: Any, join_models: Dict[str, Any]
 ) -> Dict[str, Any]:
+    """
+    Get the columns and hybrid properties of a model and the models joined to it, from their attribute indexes.
+
+    Args:
+        model (Any): The base SQLAlchemy model.
+        join_models (Dict[str, Any]): Dictionary of join models.
+
+    Returns:
+        Tuple[Dict[str, Dict[str, Any]], List[Any]]: The columns keyed by table name and then attribute name, and all
+        the models, the base model last.
+    """
+    from flask_scheema.services.attributes import get_attribute_index
+
     all_columns = {}
     all_models = []
-    # For primary model
-
-    from flask_scheema.utilities import get_config_or_model_meta
-    from flask_scheema.api.utils import table_namer
-
-    ignore_underscore = get_config_or_model_meta(
-        key="API_IGNORE_UNDERSCORE_ATTRIBUTES", model=model, default=True
-    )
-    schema_case = get_config_or_model_meta(
-        key="API_SCHEMA_CASE", model=model, default="camel"
-    )
-    from flask_scheema.api.utils import convert_case
 
-    main_table_name = convert_case(model.__name__, schema_case)
-    all_columns[main_table_name] = {}
-    for attr, column in model.__dict__.items():
-        if isinstance(column, (hybrid_property, InstrumentedAttribute)) and (
-            not ignore_underscore or (ignore_underscore and not attr.startswith("_"))
-        ):
-            all_columns[main_table_name][attr] = column
+    index = get_attribute_index(model)
+    all_columns[index.table_name] = {
+        name: attribute.attribute for name, attribute in index.attributes.items()
+    }
 
-    # For each join model
     for join_model_name, join_model in join_models.items():
-        join_table_name = convert_case(join_model.__name__, schema_case)
-        all_columns[join_table_name] = {}
+        join_index = get_attribute_index(join_model)
+        all_columns[join_index.table_name] = {
+            name: attribute.attribute
+            for name, attribute in join_index.attributes.items()
+        }
         all_models.append(join_model)
-        for attr, column in join_model.__dict__.items():
-            if isinstance(column, (hybrid_property, InstrumentedAttribute)) and (
-                not ignore_underscore
-                or (ignore_underscore and not attr.startswith("_"))
-            ):
-                all_columns[join_table_name][attr] = column
 
     all_models.append(model)
     return all_columns, all_models
@@ -227,147 +232,6 @@ def get_table_column(
     return table_name, column_name, operator
 
 
-def get_select_fields(
-    args_dict: Dict[str, str],
-    base_model: DeclarativeBase,
-    all_columns: Dict[str, Dict[str, Column]],
-):
-    """
-        Get the select fields from the request arguments
-
-    Args:
-        args_dict (Dict[str, str]): Dictionary of request arguments.
-        base_model (DeclarativeBase): The base SQLAlchemy model.
-        all_columns (Dict[str, Dict[str, Column]]): Nested dictionary of table names and their columns.
-
-    Returns:
-        List[Callable]: List of conditions to apply in the query.
-
-    """
-
-    select_fields = []
-    if "fields" in args_dict:
-        _select_fields = args_dict.get("fields").split(",")
-        for field in _select_fields:
-            # gets the table name and column name from the field
-            table_name, column_name = get_table_and_column(field, base_model)
-            # gets the column from the column dictionary which is the actual column for the model
-            model_column, column_name = get_check_table_columns(
-                table_name, column_name, all_columns
-            )
-            select_fields.append(model_column)
-
-    return select_fields
-
-
-def get_or_vals_and_keys(key, val):
-    """
-    Get the or values and keys
-    Args:
-        key (str): The key from request arguments, e.g. "id__eq".
-        val (str): The value from request arguments, e.g. "1".
-
-    Returns:
-
-    """
-    all_keys = []
-    all_vals = []
-
-    all_keys.append(key.strip()[3:])
-
-    key_vals = [x.strip() for x in val.split(",")]
-    key_vals[-1] = key_vals[-1].replace("]", "")
-
-    all_vals.append(key_vals[0])
-
-    for extra_val in key_vals[1:]:
-        split_key = extra_val.split("=")
-        split_key = [x.strip() for x in split_key]
-        all_keys.append(split_key[0])
-        all_vals.append(split_key[1])
-
-    return all_keys, all_vals
-
-
-def create_conditions_from_args(
-    args_dict: Dict[str, str],
-    base_model: DeclarativeBase,
-    all_columns: Dict[str, Dict[str, Column]],
-    all_models: List[DeclarativeBase],
-    join_models: Dict[str, DeclarativeBase],
-) -> List[Callable]:
-    """Create filter conditions based on request arguments and model's columns.
-
-
-    Args:
-        args_dict (Dict[str, str]): Dictionary of request arguments.
-        base_model (DeclarativeBase): The base SQLAlchemy model.
-        all_columns (Dict[str, Dict[str, Any]]): Nested dictionary of table names and their columns.
-        all_models (List[DeclarativeBase]): List of all models.
-        join_models (Dict[str, Any]): Dictionary of join models.
-
-    Returns:
-        List[Callable]: List of conditions to apply in the query.
-
-    Raises:
-        ValueError: If an invalid or ambiguous column name is provided.
-
-    Examples:
-        'id__eq': 1 would return Addresses.id == 1
-        'account__eq': '12345' would return Addresses.account == '12345'
-        'account__in': '12345,67890' would return Addresses.account.in_(['12345', '67890'])
-        'account__like': '12345' would return Addresses.account.like('%12345%')
-        '[account__eq,id__eq]': '12345,1' would return (Addresses.account == '12345') | (Addresses.id == 1)
-
-    """
-    from flask_scheema.utilities import get_config_or_model_meta
-
-    PAGINATION_DEFAULTS = {
-        "page": 1,
-        "limit": get_config_or_model_meta("API_PAGINATION_SIZE_DEFAULT", default=20),
-    }
-
-    conditions = []
-    or_conditions = []
-
-    for key, value in args_dict.items():
-        if (
-            len([x for x in OPERATORS.keys() if x in key]) > 0
-            and len([x for x in PAGINATION_DEFAULTS.keys() if x in key]) <= 0
-            and len([x for x in OTHER_FUNCTIONS if x in key]) <= 0
-        ):
-            if key.startswith("or["):
-
-                or_keys, or_vals = get_or_vals_and_keys(key, value)
-
-                for or_key, or_val in zip(or_keys, or_vals):
-                    table, column, operator = get_table_column(or_key, all_columns)
-
-                    condition = create_condition(
-                        table, column, operator, or_val, all_columns, base_model
-                    )
-
-                    or_conditions.append(condition)
-                continue
-
-            table, column, operator = get_table_column(key, all_columns)
-            if not column:
-                raise CustomHTTPException(
-                    400, f"Invalid table/column name: {table}.{key}"
-                )
-
-            condition = create_condition(
-                table, column, operator, value, all_columns, base_model
-            )
-            if condition is not None:
-                conditions.append(condition)
-
-    if or_conditions:
-        conditions.append(or_(*or_conditions))
-
-    return conditions
-
-
 def get_key_and_label(key):
     """
         Get the key and label from the key
@@ -531,50 +395,17 @@ def get_check_table_columns(
     return model_column, column_name
 
 
-def create_condition(
-    table_name: str,
-    column_name: str,
-    operator: str,
-    value: str,
-    all_columns: Dict[str, Dict[str, Column]],
-    model: DeclarativeBase,
-) -> Callable:
+def prepare_condition_value(operator: str, value: str) -> Union[str, List[str]]:
     """
-    Converts a key-value pair from request arguments to a condition.
-
-    This version of the function accounts for joined tables.
+    Shapes a raw query string value for the operator, a list for ``in`` and ``nin`` and a pattern for ``like``.
 
     Args:
-        table_name (str): The table name.
-        column_name (str): The column name.
         operator (str): The operator.
-        value (str): The value associated with the key.
-        all_columns (Dict[str, Column]): Dictionary of columns in the base model.
-        model DeclarativeBase: Single model
-    Returns:
-        Callable: A condition function.
+        value (str): The value from the request arguments.
 
-    Raises:
-        ValueError: If invalid operator or column is found in query params.
+    Returns:
+        The shaped value, still as strings.
     """
-
-    # # Determine if key contains joined table information
-    # column_name, table_name, operator = get_column_and_table_name_and_operator(
-    #     key, base_model
-    # )
-
-    # Get the column from the column dictionary
-    model_column, column_name = get_check_table_columns(
-        table_name, column_name, all_columns
-    )
-
-    # Check if it's a hybrid property
-    is_hybrid = type(model_column) is hybrid_property
-    if is_hybrid:
-        column_type = get_type_hint_from_hybrid(model_column)
-    else:
-        column_type = model_column.type
-
     if "in" in operator:
         value = value.split(",")
         if value[0].startswith("("):
@@ -585,16 +416,57 @@ def create_condition(
     if "like" in operator:
         value = f"%{value}%"
 
-    # Attempt to convert value to the type of the column
+    return value
+
+
+def is_empty_numeric_value(value: Any, column_type: Any) -> bool:
+    """
+    Checks for an empty value against a numeric column, those conditions are skipped.
+
+    Args:
+        value (Any): The shaped value.
+        column_type (Any): The column type.
+
+    Returns:
+        bool: True if the condition should be skipped.
+    """
+    return column_type.__class__ in [Integer, Float] and value == ""
+
+
+def coerce_condition_value(value: Any, column_type: Any) -> Any:
+    """
+    Converts a shaped value to the column's type, values that can't be converted are left as they are.
+
+    Args:
+        value (Any): The shaped value.
+        column_type (Any): The column type.
+
+    Returns:
+        Any: The converted value.
+    """
     try:
-        if model_column:
-            if column_type.__class__ in [Integer, Float] and value == "":
-                return
-            value = convert_value_to_type(value, column_type)
+        return convert_value_to_type(value, column_type)
     except ValueError as e:
         # Handle or propagate the error. For instance, you might add an error message to the response.
-        pass
+        return value
+
+
+def apply_operator(
+    model_column: Any, column_name: str, operator: str, value: Any, model: DeclarativeBase
+) -> Optional[Any]:
+    """
+    Builds the SQL expression for a condition, the value can be a python value or a bound parameter.
 
+    Args:
+        model_column (Any): The column or hybrid property.
+        column_name (str): The column name.
+        operator (str): The operator.
+        value (Any): The value to compare against.
+        model (DeclarativeBase): The base model, used to get hybrid property expressions.
+
+    Returns:
+        Optional[Any]: The expression, or None if the operator is not valid for the column.
+    """
     # Get operator function from the OPERATORS dictionary
     operator_func = OPERATORS.get(operator)
     if operator_func is None:
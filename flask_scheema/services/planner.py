@@ -0,0 +1,325 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.sql import Select
+
+from flask_scheema.api.plan import get_route_plan
+from flask_scheema.api.utils import get_primary_keys
+from flask_scheema.services.attributes import ModelAttribute, get_attribute_lookup
+from flask_scheema.services.cursors import CursorPlan, build_cursor_plan
+from flask_scheema.services.filters import Condition, compile_filter, parse_filter_args
+from flask_scheema.services.loading import requires_unique
+from flask_scheema.services.operators import get_models_for_join, prepare_condition_value
+from flask_scheema.utilities import get_app_cache, get_config_or_model_meta
+
+QUERY_PLAN_EXTENSION = "flask_scheema_query_plans"
+QUERY_PLAN_STATS_EXTENSION = "flask_scheema_query_plan_stats"
+
+# request arguments that change the statement itself, rather than the values bound into it.
+STRUCTURAL_ARGS = ("fields", "join", "order_by")
+
+
+@dataclass(frozen=True)
+class Binder:
+    """
+    Converts one raw request value into the value for a bound parameter of a query plan.
+    """
+
+    index: int
+    name: str
+    operator: str
+    attribute: ModelAttribute
+
+    def bind(self, value: str) -> Any:
+        return self.attribute.coerce(prepare_condition_value(self.operator, value))
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """
+    The statements for one shape of request, the filter keys, operators, selected fields, joins and ordering, but not
+    the filter values. Values are passed as bound parameters when the plan is executed, so SQLAlchemy's compiled
+    statement cache is hit as well.
+    """
+
+    model: Any
+    statement: Select
+    paged_statement: Optional[Select]
+    count_statement: Optional[Select]
+    windowed_statement: Optional[Select]
+    filtered_statement: Optional[Select]
+    cursor: Optional[CursorPlan]
+    binders: Tuple[Binder, ...]
+    selects_columns: bool
+    unique: bool
+    shape: tuple = ()
+    models: FrozenSet[Any] = frozenset()
+    # when unique, the statements for streaming, which load collections with selectinload rather than joining them
+    stream_statement: Optional[Select] = None
+    stream_paged_statement: Optional[Select] = None
+
+    def bind(self, values: List[str], **params) -> Dict[str, Any]:
+        """
+        Gets the parameters for executing the plan.
+
+        Args:
+            values (List[str]): The raw filter values from the request, as returned by :func:`normalise_args`.
+            **params: Any other parameters, e.g. the lookup value or pagination.
+
+        Returns:
+            dict: The bound parameters.
+        """
+        for binder in self.binders:
+            params[binder.name] = binder.bind(values[binder.index])
+        return params
+
+
+class QueryPlanStats:
+    """
+    Keeps count of the time spent working out and binding query plans, building new ones and executing them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.parse_count = 0
+        self.parse_ms = 0.0
+        self.build_count = 0
+        self.build_ms = 0.0
+        self.execute_count = 0
+        self.execute_ms = 0.0
+
+    def record(self, kind: str, seconds: float):
+        """
+        Records a timing.
+
+        Args:
+            kind (str): ``parse``, ``build`` or ``execute``.
+            seconds (float): The time taken.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            setattr(self, f"{kind}_count", getattr(self, f"{kind}_count") + 1)
+            setattr(self, f"{kind}_ms", getattr(self, f"{kind}_ms") + seconds * 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Gets the statistics.
+
+        Returns:
+            dict: The count, total and average time for each kind.
+        """
+        output = {}
+        for kind in ("parse", "build", "execute"):
+            count = getattr(self, f"{kind}_count")
+            total = getattr(self, f"{kind}_ms")
+            output[kind] = {"count": count, "total_ms": total, "average_ms": total / count if count else 0.0}
+        return output
+
+
+def get_plan_stats_recorder() -> Optional[QueryPlanStats]:
+    """
+    Gets the stats recorder for the current app.
+
+    Returns:
+        Optional[QueryPlanStats]: The recorder, or None if outside an app context.
+    """
+    if not has_app_context():
+        return None
+    recorder = current_app.extensions.get(QUERY_PLAN_STATS_EXTENSION)
+    if recorder is None:
+        recorder = current_app.extensions[QUERY_PLAN_STATS_EXTENSION] = QueryPlanStats()
+    return recorder
+
+
+def get_query_plan_stats() -> Dict[str, Any]:
+    """
+    Gets the query plan statistics for the current app, the plan cache's hit rate and the time spent parsing
+    requests, building plans and executing them.
+
+    Returns:
+        dict: The statistics.
+    """
+    cache = get_app_cache(QUERY_PLAN_EXTENSION, "API_QUERY_PLAN_CACHE_SIZE", 256)
+    recorder = get_plan_stats_recorder()
+    output = recorder.stats() if recorder else {}
+    if cache is not None:
+        cache_stats = cache.stats()
+        lookups = cache_stats["hits"] + cache_stats["misses"]
+        output["plans"] = {**cache_stats, "hit_rate": cache_stats["hits"] / lookups if lookups else 0.0}
+    return output
+
+
+def normalise_args(args_dict: Dict[str, str]) -> Tuple[tuple, List[str]]:
+    """
+    Splits the request arguments into the shape of the query and the filter values. Requests that only differ in
+    their filter values have the same shape, and so share a plan.
+
+    Args:
+        args_dict (Dict[str, str]): Dictionary of request arguments.
+
+    Returns:
+        Tuple[tuple, List[str]]: The shape, the parsed filters followed by the structural arguments, and the raw
+        filter values, in the order the plan binds them.
+
+    Raises:
+        CustomHTTPException: If a filter is malformed.
+    """
+    filters, values = parse_filter_args(args_dict)
+    structure = tuple((key, args_dict[key]) for key in STRUCTURAL_ARGS if key in args_dict)
+    return (filters,) + structure, values
+
+
+def _bound_parameter(index: int, condition: Condition, attribute: ModelAttribute) -> Any:
+    return bindparam(f"p{index}", expanding="in" in condition.operator)
+
+
+def build_query_plan(
+    service,
+    shape: tuple,
+    lookup: Optional[str] = None,
+    many: bool = True,
+    other_model: Any = None,
+    output_schema: Any = None,
+) -> QueryPlan:
+    """
+    Builds the statements for a request shape.
+
+    Args:
+        service (CrudService): The service for the model.
+        shape (tuple): The query shape, from :func:`normalise_args`.
+        lookup (Optional[str]): ``pk`` to get a record by primary key, or the name of the field to look up by.
+        many (bool): Whether many records are returned.
+        other_model (Any): A model to join and filter by its primary key.
+        output_schema (Any): The output schema, used to work out eager loading.
+
+    Returns:
+        QueryPlan: The plan.
+    """
+    from flask_scheema.services.database import apply_order_by
+
+    model = service.model
+    filters, structure = shape[0], dict(shape[1:])
+
+    join_models = get_models_for_join(structure, service.get_model_by_name)
+    attribute_lookup = get_attribute_lookup(model, join_models)
+    condition, used = compile_filter(filters, attribute_lookup, _bound_parameter)
+    binders = tuple(Binder(index, f"p{index}", item.operator, attribute) for index, item, attribute in used)
+
+    route_plan = get_route_plan(model)
+
+    def allowed(attribute: str, key: str) -> bool:
+        if route_plan:
+            return getattr(route_plan, attribute)
+        return get_config_or_model_meta(key, model=model, default=True)
+
+    selected = []
+    if allowed("allow_select_fields", "API_ALLOW_SELECT_FIELDS") and structure.get("fields"):
+        selected = [attribute_lookup.resolve(field) for field in structure["fields"].split(",")]
+    select_fields = [attribute.attribute for attribute in selected]
+
+    statement = select(*select_fields) if select_fields else select(model)
+    if condition is not None and allowed("allow_filter", "API_ALLOW_FILTER"):
+        statement = statement.where(condition)
+    if allowed("allow_order_by", "API_ALLOW_ORDER_BY"):
+        statement = apply_order_by(structure, statement, model)
+
+    lookup_value = bindparam("lookup_val")
+    if lookup == "pk":
+        statement = statement.where(get_primary_keys(model) == lookup_value)
+    elif lookup:
+        statement = statement.filter_by(**{lookup: lookup_value})
+    elif other_model is not None:
+        statement = statement.join(other_model).where(get_primary_keys(other_model) == lookup_value)
+
+    count_statement = None
+    paged_statement = None
+    windowed_statement = None
+    cursor = None
+    filtered_statement = statement.order_by(None)
+    if not lookup:
+        count_statement = select(func.count()).select_from(filtered_statement.subquery())
+
+    stream_statement = None
+    stream_paged_statement = None
+    options = service.get_eager_load_options(statement, output_schema)
+    unique = requires_unique(options)
+    if unique and not lookup:
+        stream_statement = statement.options(*service.get_eager_load_options(statement, output_schema, stream=True))
+        stream_paged_statement = stream_statement.limit(bindparam("_limit")).offset(bindparam("_offset"))
+    if options:
+        statement = statement.options(*options)
+
+    if not lookup:
+        paged_statement = statement.limit(bindparam("_limit")).offset(bindparam("_offset"))
+        if not unique:
+            # joined collections repeat rows, which the window count would include
+            windowed_statement = paged_statement.add_columns(func.count().over().label("_total_count"))
+        order_by = structure.get("order_by") if allowed("allow_order_by", "API_ALLOW_ORDER_BY") else None
+        cursor = build_cursor_plan(
+            statement.order_by(None), model, attribute_lookup, order_by, get_primary_keys(model), selected
+        )
+    elif not many:
+        statement = statement.limit(1)
+
+    return QueryPlan(
+        model=model,
+        statement=statement,
+        paged_statement=paged_statement,
+        count_statement=count_statement,
+        windowed_statement=windowed_statement,
+        filtered_statement=filtered_statement,
+        cursor=cursor,
+        binders=binders,
+        selects_columns=bool(select_fields),
+        unique=unique,
+        shape=shape,
+        models=frozenset([model, *join_models.values(), *([other_model] if other_model is not None else [])]),
+        stream_statement=stream_statement,
+        stream_paged_statement=stream_paged_statement,
+    )
+
+
+def get_query_plan(
+    service,
+    args_dict: Dict[str, str],
+    lookup: Optional[str] = None,
+    many: bool = True,
+    other_model: Any = None,
+) -> Tuple[QueryPlan, List[str]]:
+    """
+    Gets the cached plan for the request arguments, building it the first time the shape is seen.
+
+    Args:
+        service (CrudService): The service for the model.
+        args_dict (Dict[str, str]): Dictionary of request arguments.
+        lookup (Optional[str]): ``pk`` to get a record by primary key, or the name of the field to look up by.
+        many (bool): Whether many records are returned.
+        other_model (Any): A model to join and filter by its primary key.
+
+    Returns:
+        Tuple[QueryPlan, List[str]]: The plan and the raw filter values to bind.
+    """
+    shape, values = normalise_args(args_dict)
+
+    route_plan = get_route_plan(service.model)
+    output_schema = route_plan.output_schema if route_plan else None
+
+    cache = get_app_cache(QUERY_PLAN_EXTENSION, "API_QUERY_PLAN_CACHE_SIZE", 256)
+    key = (service.model, lookup, many, other_model, output_schema, shape)
+    plan = cache.get(key) if cache is not None else None
+    if plan is None:
+        start = time.perf_counter()
+        plan = build_query_plan(service, shape, lookup, many, other_model, output_schema)
+        recorder = get_plan_stats_recorder()
+        if recorder:
+            recorder.record("build", time.perf_counter() - start)
+        if cache is not None:
+            cache.set(key, plan)
+
+    return plan, values
@@ -0,0 +1,140 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from flask import has_request_context, request
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from flask_scheema.api.plan import get_route_plan
+from flask_scheema.exceptions import CustomHTTPException
+from flask_scheema.utilities import get_config_or_model_meta
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:  # pyarrow is an optional extra, flask-scheema[arrow]
+    pyarrow = None
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+CSV_MIMETYPE = "text/csv"
+ARROW_MIMETYPE = "application/vnd.apache.arrow.stream"
+
+# the formats a list can be streamed in, by the name used with ``?format=``.
+STREAM_FORMATS = {"ndjson": NDJSON_MIMETYPE, "csv": CSV_MIMETYPE, "arrow": ARROW_MIMETYPE}
+
+# the optional packages some formats need, installed with the extra of the same name as the format.
+STREAM_FORMAT_PACKAGES = {"arrow": "pyarrow"}
+
+# values of ``?stream=`` that switch streaming on.
+STREAM_TRUE_VALUES = ("1", "true", "yes")
+
+
+@dataclass
+class RowStream:
+    """
+    The results of a streamed list request. Rows are fetched from the database in batches as the stream is
+    iterated, so only one batch is held in memory at a time.
+    """
+
+    batches: Iterator[List[Any]]
+    format: str = "ndjson"
+
+    def __iter__(self) -> Iterator[List[Any]]:
+        return iter(self.batches)
+
+
+def is_format_available(stream_format: str) -> bool:
+    """
+    Checks whether the package a stream format needs, if any, could be imported.
+
+    Args:
+        stream_format (str): One of :data:`STREAM_FORMATS`.
+
+    Returns:
+        bool: True if the format can be written.
+    """
+    if stream_format == "arrow":
+        return pyarrow is not None
+    return True
+
+
+def get_stream_format(args_dict: Dict[str, str]) -> Optional[str]:
+    """
+    Gets the format a list request asked for its results to be streamed in, from ``?format=``, ``?stream=1`` (for
+    ``ndjson``), or the type it prefers in its ``Accept`` header.
+
+    Args:
+        args_dict (Dict[str, str]): Dictionary of request arguments.
+
+    Returns:
+        Optional[str]: One of :data:`STREAM_FORMATS`, or None if the results are not streamed.
+
+    Raises:
+        CustomHTTPException: If the ``format`` parameter is not a known format, or needs a package that isn't
+            installed.
+    """
+    requested = args_dict.get("format")
+    if requested is not None:
+        if requested in STREAM_FORMATS:
+            if not is_format_available(requested):
+                package = STREAM_FORMAT_PACKAGES[requested]
+                raise CustomHTTPException(406, f"The {requested} format needs the {package} package to be installed.")
+            return requested
+        if requested != "json":
+            raise CustomHTTPException(
+                400, f"Invalid format value: {requested} (must be one of json, {', '.join(STREAM_FORMATS)})"
+            )
+        return None
+
+    if str(args_dict.get("stream", "")).lower() in STREAM_TRUE_VALUES:
+        return "ndjson"
+    if not has_request_context():
+        return None
+    offered = {name: mimetype for name, mimetype in STREAM_FORMATS.items() if is_format_available(name)}
+    best = request.accept_mimetypes.best_match(["application/json", *offered.values()])
+    return next((name for name, mimetype in offered.items() if mimetype == best), None)
+
+
+def get_stream_batch_size(model: Any) -> int:
+    """
+    Gets how many rows are fetched from the database at a time when streaming.
+
+    Args:
+        model (Any): The model being listed.
+
+    Returns:
+        int: The batch size.
+    """
+    plan = get_route_plan(model)
+    if plan:
+        return plan.stream_batch_size
+    return get_config_or_model_meta("API_STREAM_BATCH_SIZE", model=model, default=1000)
+
+
+def stream_rows(
+    session: Session, plan: Any, statement: Select, params: Dict[str, Any], batch_size: int, stream_format: str
+) -> RowStream:
+    """
+    Executes one of a query plan's statements, fetching the results in batches with ``yield_per``. The statement
+    runs straight away, so errors are raised before the response starts, only the fetching is deferred.
+
+    Args:
+        session (Session): The database session.
+        plan (QueryPlan): The query plan.
+        statement (Select): The statement to execute.
+        params (Dict[str, Any]): The bound parameters.
+        batch_size (int): How many rows to fetch at a time.
+        stream_format (str): The format the rows are written in.
+
+    Returns:
+        RowStream: The batches of rows, or of model instances.
+    """
+    if plan.unique:
+        # joined collections repeat rows that can only be de-duplicated across the whole result, the plan's stream
+        # statements load them with selectinload instead, a batch at a time
+        statement = plan.stream_paged_statement if statement is plan.paged_statement else plan.stream_statement
+
+    result = session.execute(statement, params, execution_options={"yield_per": batch_size})
+    if not plan.selects_columns:
+        result = result.scalars()
+    return RowStream(result.partitions(), stream_format)
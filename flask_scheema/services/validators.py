@@ -0,0 +1,155 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+from flask import current_app, request
+from sqlalchemy import func, inspect
+from sqlalchemy.orm import Session
+from werkzeug.http import is_resource_modified
+
+from flask_scheema.api.plan import get_route_plan
+from flask_scheema.services.planner import QueryPlan
+from flask_scheema.services.writes import get_write_generations
+from flask_scheema.utilities import config_generation, get_config_or_model_meta
+
+INSTANCE_TOKEN_EXTENSION = "flask_scheema_instance_token"
+
+# where the ETag of a GET response comes from, see API_ETAG_SOURCE.
+ETAG_SOURCES = ("auto", "version", "updated", "body")
+
+
+@dataclass(frozen=True)
+class Validators:
+    """
+    The validators of a GET response. An ETag of None means it is worked out from the dumped response instead.
+    """
+
+    etag: Optional[str] = None
+    last_modified: Optional[datetime] = None
+
+
+class NotModified(Exception):
+    """
+    Raised when a conditional GET matches the current validators, so the response is sent as a 304 without running
+    the query.
+    """
+
+    def __init__(self, validators: Validators):
+        self.validators = validators
+
+
+def get_etag_source(model: Any) -> Optional[str]:
+    """
+    Gets where the ETag of a GET request to a generated route comes from. ``auto`` is ``updated`` when the model has
+    the ``API_LAST_MODIFIED_COLUMN`` column, otherwise ``body``.
+
+    Args:
+        model (Any): The model being fetched.
+
+    Returns:
+        Optional[str]: ``version``, ``updated`` or ``body``, or None when conditional GETs are off for the route.
+
+    Raises:
+        ValueError: If the configured source is not one of :data:`ETAG_SOURCES`.
+    """
+    plan = get_route_plan(model)
+    if plan is None or plan.method != "GET" or not plan.conditional_get:
+        return None
+
+    if plan.etag_source not in ETAG_SOURCES:
+        raise ValueError(f"API_ETAG_SOURCE must be one of {', '.join(ETAG_SOURCES)}, not {plan.etag_source!r}")
+    if plan.etag_source == "auto":
+        return "updated" if _get_last_modified_column(model, plan.last_modified_column) is not None else "body"
+    return plan.etag_source
+
+
+def _get_last_modified_column(model: Any, name: str) -> Any:
+    column = inspect(model).columns.get(name)
+    return getattr(model, name) if column is not None else None
+
+
+def _get_instance_token() -> str:
+    # write generations start again from zero when the app restarts, so their ETags are kept apart
+    token = current_app.extensions.get(INSTANCE_TOKEN_EXTENSION)
+    if token is None:
+        token = current_app.extensions[INSTANCE_TOKEN_EXTENSION] = uuid4().hex
+    return token
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Makes an ETag for the current request's url and representation from the given parts.
+
+    Args:
+        *parts (Any): Values that change whenever the response would.
+
+    Returns:
+        str: The ETag, without quotes.
+    """
+    variant = (
+        request.full_path,
+        request.headers.get("Accept"),
+        request.headers.get("Authorization"),
+        config_generation(),
+    )
+    return hashlib.sha1(repr((variant, parts)).encode()).hexdigest()
+
+
+def get_validators(
+    session: Session, plan: QueryPlan, params: Dict[str, Any], source: str, single: bool = False
+) -> Validators:
+    """
+    Gets the validators of a GET request without fetching its rows.
+
+    ``version`` reads the write generations of the models the response is made from, so needs no query at all.
+    ``updated`` runs one aggregate query for the latest ``API_LAST_MODIFIED_COLUMN`` value and the number of rows,
+    which also gives the ``Last-Modified`` date of a single record. Lists get no ``Last-Modified``, as deleting a row
+    or filtering out one that isn't the newest leaves the latest value as it was, and ``If-Modified-Since`` can't
+    see the count.
+
+    Args:
+        session (Session): The database session.
+        plan (QueryPlan): The query plan of the request.
+        params (Dict[str, Any]): The bound parameters.
+        source (str): ``version`` or ``updated``.
+        single (bool): Whether the request fetches a single record by its primary key.
+
+    Returns:
+        Validators: The validators.
+    """
+    if source == "version":
+        # related models are included, as their rows can be dumped as nested records
+        related = {relationship.mapper.class_ for relationship in inspect(plan.model).relationships}
+        models = sorted({*plan.models, *related}, key=lambda model: model.__name__)
+        return Validators(etag=make_etag(_get_instance_token(), get_write_generations(models)))
+
+    route_plan = get_route_plan(plan.model)
+    column_name = (
+        route_plan.last_modified_column
+        if route_plan
+        else get_config_or_model_meta("API_LAST_MODIFIED_COLUMN", model=plan.model, default="updated_at")
+    )
+    column = _get_last_modified_column(plan.model, column_name)
+    if column is None:
+        raise ValueError(f"{plan.model.__name__} has no {column_name} column to read the last modified date from")
+    statement = plan.filtered_statement.with_only_columns(func.max(column), func.count())
+    last_modified, count = session.execute(statement, params).one()
+    if isinstance(last_modified, date) and not isinstance(last_modified, datetime):
+        last_modified = datetime.combine(last_modified, time())
+    return Validators(etag=make_etag(last_modified, count), last_modified=last_modified if single else None)
+
+
+def check_not_modified(validators: Validators):
+    """
+    Checks the request's ``If-None-Match`` and ``If-Modified-Since`` headers against the validators.
+
+    Args:
+        validators (Validators): The current validators.
+
+    Raises:
+        NotModified: If the client's copy is still current.
+    """
+    if not is_resource_modified(request.environ, etag=validators.etag, last_modified=validators.last_modified):
+        raise NotModified(validators)
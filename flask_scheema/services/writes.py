@@ -0,0 +1,102 @@
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+MODEL_WRITES_EXTENSION = "flask_scheema_model_writes"
+WRITE_LISTENERS_EXTENSION = "flask_scheema_write_listeners"
+
+# the session.info key holding the models flushed in the session's current transaction
+FLUSHED_MODELS_KEY = "flask_scheema_flushed_models"
+
+
+def _get_generations() -> Dict[Any, int]:
+    entry = current_app.extensions.get(MODEL_WRITES_EXTENSION)
+    if entry is None:
+        entry = current_app.extensions[MODEL_WRITES_EXTENSION] = {}
+    return entry
+
+
+def record_model_writes(*models: Any):
+    """
+    Records that rows of the models were written, so anything cached from them is treated as stale. Writes made
+    through a session are recorded when it flushes, call this after changing rows any other way, e.g. bulk updates or
+    raw SQL.
+
+    Args:
+        *models (Any): The models that were written to.
+
+    Returns:
+        None
+    """
+    if not has_app_context():
+        return
+    generations = _get_generations()
+    for model in models:
+        generations[model] = generations.get(model, 0) + 1
+    for listener in current_app.extensions.get(WRITE_LISTENERS_EXTENSION, []):
+        listener(models)
+
+
+def add_write_listener(listener: Callable[[Tuple[Any, ...]], None]):
+    """
+    Calls the listener with the models written to, whenever writes are recorded for the current app.
+
+    Args:
+        listener (Callable): Called with a tuple of the models.
+
+    Returns:
+        None
+    """
+    listeners: List[Callable] = current_app.extensions.setdefault(WRITE_LISTENERS_EXTENSION, [])
+    if listener not in listeners:
+        listeners.append(listener)
+
+
+def get_write_generations(models: Iterable[Any]) -> Tuple[int, ...]:
+    """
+    Gets a number for each model that changes every time it is written to, for use in cache keys.
+
+    Args:
+        models (Iterable[Any]): The models.
+
+    Returns:
+        Tuple[int, ...]: The write generation of each model, in the order given.
+    """
+    if not has_app_context():
+        return ()
+    generations = _get_generations()
+    return tuple(generations.get(model, 0) for model in models)
+
+
+def _record_flushed_writes(session: Session, flush_context: Any):
+    models = {type(obj) for obj in chain(session.new, session.dirty, session.deleted)}
+    session.info.setdefault(FLUSHED_MODELS_KEY, set()).update(models)
+    record_model_writes(*models)
+
+
+def _record_committed_writes(session: Session):
+    # recorded again once committed, anything cached from the old rows between the flush and the commit is stale too
+    models = session.info.pop(FLUSHED_MODELS_KEY, None)
+    if models:
+        record_model_writes(*models)
+
+
+def _forget_flushed_writes(session: Session):
+    session.info.pop(FLUSHED_MODELS_KEY, None)
+
+
+def track_session_writes():
+    """
+    Records the models written to whenever any session flushes, and again when the flushed changes are committed. Only
+    registered once however often it is called.
+
+    Returns:
+        None
+    """
+    if not event.contains(Session, "after_flush", _record_flushed_writes):
+        event.listen(Session, "after_flush", _record_flushed_writes)
+        event.listen(Session, "after_commit", _record_committed_writes)
+        event.listen(Session, "after_rollback", _forget_flushed_writes)
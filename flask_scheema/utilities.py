@@ -1,10 +1,14 @@
+import itertools
 import os
 import random
 import re
 import socket
-from typing import Optional, Any, Dict, List
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Optional, Any, Dict, List, Callable
 
-from flask import Flask, current_app
+from flask import Flask, current_app, has_app_context
 from jinja2 import Environment, FileSystemLoader
 from marshmallow import Schema
 from sqlalchemy import inspect
@@ -101,6 +105,340 @@ def normalize_key(key: str) -> str:
     # Convert to uppercase
     return key.upper()
 
+
+CONFIG_CACHE_EXTENSION = "flask_scheema_config"
+
+_MISSING = object()
+_generations = itertools.count(1)
+
+
+class ConfigResolver:
+    """
+    Memoises :func:`get_config_or_model_meta` lookups for a single Flask app.
+
+    A resolver is registered against the app by ``Naan.init_app``. From then on the effective value for each
+    (key, model, schema, method) combination is worked out once and answered from a dictionary on every later call.
+    If the config or a model's ``Meta`` is changed at runtime, call :func:`invalidate_config_cache` so the new values
+    are picked up.
+    """
+
+    def __init__(self):
+        self._cache: Dict[tuple, Any] = {}
+        self.hits = 0
+        self.misses = 0
+        self.generation = next(_generations)
+
+    def resolve(
+            self,
+            key: str,
+            model: Optional[DeclarativeBase] = None,
+            output_schema: Optional[Schema] = None,
+            input_schema: Optional[Schema] = None,
+            allow_join: bool = False,
+            method: str = "IGNORE",
+    ) -> Any:
+        """
+        Gets the effective value for a key, computing and storing it on the first call.
+
+        Args:
+            key (str): The config key.
+            model (DeclarativeBase): The model to check for a Meta value.
+            output_schema (Schema): The output schema to check for a Meta value.
+            input_schema (Schema): The input schema to check for a Meta value.
+            allow_join (bool): Whether list values can be joined.
+            method (str): The HTTP method the lookup is for.
+
+        Returns:
+            Any: The resolved value, or ``_MISSING`` if it is not set anywhere.
+        """
+        cache_key = (key, model, output_schema, input_schema, allow_join, method)
+        try:
+            value = self._cache[cache_key]
+        except KeyError:
+            self.misses += 1
+            value = self._cache[cache_key] = _resolve_config_or_model_meta(
+                key, model, output_schema, input_schema, allow_join, method
+            )
+            return value
+        except TypeError:
+            # unhashable arguments cannot be cached, so resolve them every time.
+            self.misses += 1
+            return _resolve_config_or_model_meta(
+                key, model, output_schema, input_schema, allow_join, method
+            )
+
+        self.hits += 1
+        return value
+
+    def invalidate(self):
+        """
+        Clears all memoised values. Caches that depend on the configuration can compare ``generation`` to know when
+        they are stale.
+        """
+        self._cache.clear()
+        self.generation = next(_generations)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Gets the lookup statistics for the resolver.
+
+        Returns:
+            dict: The number of cached entries, hits and misses.
+        """
+        return {"size": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+def register_config_resolver(app: Flask) -> ConfigResolver:
+    """
+    Registers a fresh config resolver with the app, replacing (and so invalidating) any existing one.
+
+    Args:
+        app (Flask): The flask app.
+
+    Returns:
+        ConfigResolver: The new resolver.
+    """
+    resolver = app.extensions.get(CONFIG_CACHE_EXTENSION)
+    if resolver is None:
+        resolver = app.extensions[CONFIG_CACHE_EXTENSION] = ConfigResolver()
+    else:
+        resolver.invalidate()
+    return resolver
+
+
+def get_config_resolver(app: Optional[Flask] = None) -> Optional[ConfigResolver]:
+    """
+    Gets the config resolver for the app, or the current app if none is supplied.
+
+    Args:
+        app (Optional[Flask]): The flask app.
+
+    Returns:
+        Optional[ConfigResolver]: The resolver, or None if outside an app context or ``init_app`` has not run.
+    """
+    if app is None:
+        if not has_app_context():
+            return None
+        app = current_app
+    return app.extensions.get(CONFIG_CACHE_EXTENSION)
+
+
+def invalidate_config_cache(app: Optional[Flask] = None):
+    """
+    Clears the memoised configuration, use this after changing the Flask config or a model's ``Meta`` at runtime.
+
+    Args:
+        app (Optional[Flask]): The flask app, defaults to the current app.
+
+    Returns:
+        None
+    """
+    resolver = get_config_resolver(app)
+    if resolver is not None:
+        resolver.invalidate()
+
+
+def config_generation() -> int:
+    """
+    Gets the generation of the current app's configuration, this changes every time the config cache is invalidated.
+
+    Returns:
+        int: The generation, or 0 if there is no resolver registered.
+    """
+    resolver = get_config_resolver()
+    return resolver.generation if resolver is not None else 0
+
+
+class LRUCache:
+    """
+    A small bounded least recently used cache, that keeps count of its hits and misses.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """
+        Initializes the cache.
+
+        Args:
+            maxsize (int): The maximum number of entries, 0 disables the cache.
+        """
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.maxsize = max(int(maxsize or 0), 0)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """
+        Gets a value, marking it as the most recently used.
+
+        Args:
+            key (Any): The cache key.
+            default (Any): Returned if the key is not cached.
+
+        Returns:
+            Any: The cached value or the default.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Any, value: Any):
+        """
+        Stores a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (Any): The cache key.
+            value (Any): The value to cache.
+
+        Returns:
+            None
+        """
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        """
+        Removes a value from the cache.
+
+        Args:
+            key (Any): The cache key.
+            default (Any): Returned if the key is not cached.
+
+        Returns:
+            Any: The removed value or the default.
+        """
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        """
+        Removes every entry, the statistics are kept.
+        """
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Gets the statistics for the cache.
+
+        Returns:
+            dict: The number of entries, maximum size, hits and misses.
+        """
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# the memoised naming functions, by qualified name
+MEMOIZED_FUNCTIONS: Dict[str, Callable] = {}
+
+_NOT_CACHED = object()
+
+
+def memoize(maxsize: int = 1024, per_config: bool = False) -> Callable:
+    """
+    Memoises a pure function in a bounded :class:`LRUCache`. Used for the naming and case conversion helpers, which
+    are called with the same handful of model and field names at startup and on every request.
+
+    Calls with unhashable arguments are passed straight through.
+
+    Args:
+        maxsize (int): The maximum number of results kept.
+        per_config (bool): Whether the result depends on the config, if so results are kept per config generation
+            so they are recalculated after the config cache is invalidated.
+
+    Returns:
+        Callable: The decorator.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        cache = LRUCache(maxsize)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(kwargs.items())) if kwargs else args
+            if per_config:
+                key = (config_generation(), key)
+            try:
+                value = cache.get(key, _NOT_CACHED)
+            except TypeError:
+                return func(*args, **kwargs)
+            if value is _NOT_CACHED:
+                value = func(*args, **kwargs)
+                cache.set(key, value)
+            return value
+
+        wrapper.cache = cache
+        MEMOIZED_FUNCTIONS[f"{func.__module__}.{func.__qualname__}"] = wrapper
+        return wrapper
+
+    return decorator
+
+
+def memo_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Gets the cache statistics for each memoised function.
+
+    Returns:
+        dict: The :meth:`LRUCache.stats` of each function, by qualified name.
+    """
+    return {name: func.cache.stats() for name, func in MEMOIZED_FUNCTIONS.items()}
+
+
+def clear_memo_caches():
+    """
+    Empties the caches of all memoised functions.
+
+    Returns:
+        None
+    """
+    for func in MEMOIZED_FUNCTIONS.values():
+        func.cache.clear()
+
+
+def get_app_cache(name: str, config_key: str, default_size: int = 128) -> Optional[LRUCache]:
+    """
+    Gets an LRU cache stored on the current app, sized from the config. A new, empty cache replaces the old one
+    whenever the config cache is invalidated.
+
+    Args:
+        name (str): The name the cache is stored under in ``app.extensions``.
+        config_key (str): The config key holding the cache size.
+        default_size (int): The size if the config key is not set.
+
+    Returns:
+        Optional[LRUCache]: The cache, or None if outside an app context.
+    """
+    if not has_app_context():
+        return None
+    generation = config_generation()
+    entry = current_app.extensions.get(name)
+    if entry is None or entry[0] != generation:
+        size = get_config_or_model_meta(config_key, default=default_size)
+        entry = current_app.extensions[name] = (generation, LRUCache(size))
+    return entry[1]
+
+
 def get_config_or_model_meta(
         key: str,
         model: Optional[DeclarativeBase] = None,
@@ -113,8 +451,36 @@ def get_config_or_model_meta(
     """
     Dynamically gets the configuration or Meta attribute from the model, or schemas,
     with precedence to models and schemas over Flask config, for any given key.
+
+    Once ``Naan.init_app`` has run, lookups are memoised per app, see :class:`ConfigResolver`.
+    """
+    resolver = get_config_resolver()
+    if resolver is None:
+        result = _resolve_config_or_model_meta(
+            key, model, output_schema, input_schema, allow_join, method
+        )
+    else:
+        result = resolver.resolve(
+            key, model, output_schema, input_schema, allow_join, method
+        )
+
+    return default if result is _MISSING else result
+
+
+def _resolve_config_or_model_meta(
+        key: str,
+        model: Optional[DeclarativeBase] = None,
+        output_schema: Optional[Schema] = None,
+        input_schema: Optional[Schema] = None,
+        allow_join=False,
+        method="IGNORE",
+) -> Any:
+    """
+    Works out the value for a key by searching the model and schema ``Meta`` classes, then the Flask config.
+
+    Returns:
+        Any: The value, or ``_MISSING`` if it was not found.
     """
-    from flask import current_app  # Assuming Flask context is available
 
     def normalize_key(key: str) -> str:
         """Normalizes the key for consistent access patterns."""
@@ -173,7 +539,7 @@ def get_config_or_model_meta(
     if result is not None and result != []:
         return result
 
-    return default
+    return _MISSING
 
 # def get_config_or_model_meta(
 #         key: str,
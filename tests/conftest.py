@@ -0,0 +1,28 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+
+@pytest.fixture
+def count_statements():
+    """
+    Records the SQL statements an app runs within a ``with count_statements(app) as statements:`` block.
+    """
+
+    @contextmanager
+    def count(app):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        with app.app_context():
+            engine = app.extensions["sqlalchemy"].engine
+            event.listen(engine, "before_cursor_execute", before_cursor_execute)
+            try:
+                yield statements
+            finally:
+                event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return count
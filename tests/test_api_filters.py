@@ -1,6 +1,7 @@
 import pytest
 
 from demo.basic_factory.basic_factory import create_app
+from flask_scheema.utilities import invalidate_config_cache
 
 
 @pytest.fixture
@@ -87,6 +88,7 @@ def test_basic_pagination(client, app):
     assert books["previous_url"] == f"http://localhost/api/books?limit=5&page=1"
 
     app.config["API_PAGINATION_SIZE_DEFAULT"] = 5
+    invalidate_config_cache(app)
     books = client.get('/api/books?order_by=id').json
     assert len(books["value"]) == 5
 
@@ -0,0 +1,53 @@
+from datetime import date
+
+import pytest
+
+from demo.basic_factory.basic_factory import create_app
+
+pyarrow = pytest.importorskip("pyarrow")
+
+ACCEPT = {"Accept": "application/vnd.apache.arrow.stream"}
+
+
+def read_table(response):
+    return pyarrow.ipc.open_stream(response.data).read_all()
+
+
+def test_arrow_stream():
+    app = create_app({"API_STREAM_BATCH_SIZE": 10})
+    client = app.test_client()
+
+    page = client.get("/api/books?limit=25&order_by=-title").json
+    response = client.get("/api/books?limit=25&order_by=-title", headers=ACCEPT)
+    table = read_table(response)
+
+    assert response.mimetype == "application/vnd.apache.arrow.stream"
+    assert response.headers["X-Total-Count"] == str(page["total_count"])
+    assert table.num_rows == 25
+    assert table.column("id").to_pylist() == [book["id"] for book in page["value"]]
+    assert table.column("title").to_pylist() == [book["title"] for book in page["value"]]
+    assert table.schema.field("id").type == pyarrow.int64()
+    assert table.schema.field("publication_date").type == pyarrow.date32()
+    assert isinstance(table.column("publication_date")[0].as_py(), date)
+    # relationships are written as urls, as for csv
+    assert table.column("author")[0].as_py() == f"/api/authors/{page['value'][0]['author']['id']}"
+
+
+def test_arrow_stream_with_filters_and_fields():
+    app = create_app({})
+    client = app.test_client()
+
+    total = client.get("/api/books?id__le=30").json["total_count"]
+    table = read_table(client.get("/api/books?id__le=30&fields=id,title&format=arrow"))
+
+    assert table.column_names == ["id", "title"]
+    assert table.num_rows == total
+    assert max(table.column("id").to_pylist()) <= 30
+
+
+def test_arrow_stream_no_rows():
+    app = create_app({})
+    table = read_table(app.test_client().get("/api/books?id__lt=0&fields=id,title&format=arrow"))
+
+    assert table.num_rows == 0
+    assert table.column_names == ["id", "title"]
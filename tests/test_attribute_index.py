@@ -0,0 +1,54 @@
+import pytest
+
+from demo.basic_factory.basic_factory import create_app
+from demo.basic_factory.basic_factory.models import Author, Book
+from flask_scheema.exceptions import CustomHTTPException
+from flask_scheema.services.attributes import get_attribute_index, get_attribute_lookup
+
+
+def test_index_spellings():
+    app = create_app({})
+    with app.app_context():
+        index = get_attribute_index(Author)
+
+        assert index is get_attribute_index(Author)
+        for spelling in ["first_name", "firstName", "FirstName", "first-name", "author.firstName", "authors.first_name"]:
+            assert index.spellings[spelling].name == "first_name"
+
+        assert index.spellings["full_name"].is_hybrid
+        assert index.spellings["id"].coerce("3") == 3
+        assert index.spellings["first_name"].coerce("3") == "3"
+
+        with pytest.raises(TypeError):
+            index.spellings["x"] = index.spellings["id"]
+
+
+def test_lookup_with_join():
+    app = create_app({})
+    with app.app_context():
+        lookup = get_attribute_lookup(Book, {"author": Author})
+
+        assert lookup is get_attribute_lookup(Book, {"author": Author})
+        assert lookup.resolve("id").model is Book
+        assert lookup.resolve("author.id").model is Author
+        assert lookup.resolve("firstName").model is Author
+
+        with pytest.raises(CustomHTTPException) as error:
+            lookup.resolve("publisher.id")
+        assert error.value.reason == "Invalid table name: publisher"
+
+        with pytest.raises(CustomHTTPException) as error:
+            lookup.resolve("nope")
+        assert error.value.reason == "Invalid column name: nope"
+
+
+def test_filter_by_camel_case():
+    app = create_app({})
+    client = app.test_client()
+
+    snake = client.get("/api/books?author_id__eq=2&fields=id")
+    camel = client.get("/api/books?authorId__eq=2&fields=id")
+    qualified = client.get("/api/books?book.authorId__eq=2&fields=id")
+
+    assert snake.status_code == 200
+    assert snake.json["value"] == camel.json["value"] == qualified.json["value"]
@@ -0,0 +1,53 @@
+from demo.basic_factory.basic_factory import create_app
+from demo.basic_factory.basic_factory.models import Book
+from flask_scheema.scheema.utils import get_input_output_from_model_or_make
+
+
+def transpose(records, columns):
+    # the JSON provider may sort the keys of each record, so the columns are given in the order expected
+    assert sorted(records[0]) == sorted(columns)
+    return {"columns": columns, "data": {key: [record[key] for record in records] for key in columns}}
+
+
+def test_columnar_matches_rows():
+    app = create_app({})
+    client = app.test_client()
+
+    rows = client.get("/api/books?limit=50").json
+    columnar = client.get("/api/books?limit=50&layout=columnar").json
+
+    # columns come in the order the output schema declares its fields
+    with app.test_request_context("/api/books"):
+        schema = get_input_output_from_model_or_make(Book)[1]()
+        columns = [field.data_key or name for name, field in schema.dump_fields.items()]
+
+    assert columnar["value"] == transpose(rows["value"], columns)
+    assert columnar["total_count"] == rows["total_count"]
+    assert columnar["next_url"] == rows["next_url"].replace("limit=50", "limit=50&layout=columnar")
+
+
+def test_columnar_with_fields():
+    app = create_app({})
+    client = app.test_client()
+
+    rows = client.get("/api/authors?fields=id,first_name,date_of_birth").json
+    columnar = client.get("/api/authors?fields=id,first_name,date_of_birth&layout=columnar").json
+
+    # and in the order they were asked for with ?fields=
+    assert columnar["value"] == transpose(rows["value"], ["id", "first_name", "date_of_birth"])
+
+
+def test_columnar_no_rows():
+    app = create_app({})
+    response = app.test_client().get("/api/books?id__lt=0&fields=id,title&layout=columnar").json
+
+    assert response["value"] == {"columns": ["id", "title"], "data": {"id": [], "title": []}}
+    assert response["total_count"] == 0
+
+
+def test_invalid_layout():
+    app = create_app({})
+    response = app.test_client().get("/api/books?layout=diagonal")
+
+    assert response.status_code == 400
+    assert response.json["errors"][0]["reason"] == "Invalid layout value: diagonal (must be one of rows, columnar)"
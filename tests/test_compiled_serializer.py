@@ -0,0 +1,156 @@
+import json
+
+import pytest
+from marshmallow import Schema, fields
+
+from demo.basic_factory.basic_factory import create_app
+from demo.basic_factory.basic_factory import models as basic_models
+from demo.model_extension.model import create_app as create_app_models
+from demo.model_extension.model import models as extension_models
+from flask_scheema.scheema.compiler import (
+    compile_schema,
+    get_compiled_serializer,
+    get_row_serializer,
+    COMPILED_SERIALIZER_EXTENSION,
+)
+from flask_scheema.scheema.utils import get_input_output_from_model_or_make
+from flask_scheema.utilities import invalidate_config_cache
+
+DEMOS = [
+    (create_app, basic_models),
+    (create_app_models, extension_models),
+]
+MODEL_NAMES = ["Author", "Book", "Publisher", "Review", "Category"]
+
+
+@pytest.fixture(params=DEMOS, ids=["basic_factory", "model_extension"])
+def demo(request):
+    factory, models = request.param
+    app = factory({"API_DUMP_DATETIME": False, "API_DUMP_RESPONSE_MS": False})
+    yield app, models
+
+
+def dumps(data):
+    return json.dumps(data, sort_keys=True, default=str).encode()
+
+
+def test_compiled_dump_matches_marshmallow(demo):
+    app, models = demo
+    with app.test_request_context("/"):
+        for name in MODEL_NAMES:
+            model = getattr(models, name)
+            _, output_schema = get_input_output_from_model_or_make(model)
+            objs = model.query.limit(100).all()
+            for schema in [output_schema(many=True), output_schema(many=True, only=["id"])]:
+                compiled = compile_schema(schema)
+                assert compiled is not None
+
+                assert dumps(compiled(objs, many=True)) == dumps(schema.dump(objs, many=True))
+                if objs:
+                    assert dumps(compiled(objs[0])) == dumps(schema.dump(objs[0]))
+
+
+def test_compiled_responses_are_byte_identical(demo):
+    app, _ = demo
+    client = app.test_client()
+    urls = [
+        "/api/authors?limit=100",
+        "/api/authors/1",
+        "/api/books?limit=100&order_by=-id",
+        "/api/books/2",
+        "/api/books?fields=title,id",
+        "/api/publishers?limit=100",
+        "/api/reviews?limit=100",
+        "/api/categories?limit=100",
+        "/api/authors/1/books",
+        "/api/books/999999",
+    ]
+
+    expected = [client.get(url).data for url in urls]
+
+    app.config["API_COMPILED_SERIALIZER"] = True
+    invalidate_config_cache(app)
+
+    assert [client.get(url).data for url in urls] == expected
+    assert len(app.extensions[COMPILED_SERIALIZER_EXTENSION][1]) > 0
+
+
+def test_compiled_dump_runs_post_dump_callback():
+    def post_dump(data, **kwargs):
+        data["extra"] = "post dump"
+        return data
+
+    app = create_app({"API_COMPILED_SERIALIZER": True, "API_POST_DUMP_CALLBACK": post_dump})
+    client = app.test_client()
+
+    assert client.get("/api/books/1").json["value"]["extra"] == "post dump"
+    assert all(book["extra"] == "post dump" for book in client.get("/api/books").json["value"])
+
+
+def test_row_dump_matches_marshmallow(demo):
+    app, models = demo
+    with app.test_request_context("/"):
+        model = models.Book
+        _, output_schema = get_input_output_from_model_or_make(model)
+        columns = ["id", "title", "publication_date", "author_id"]
+        rows = model.query.with_entities(*[getattr(model, c) for c in columns]).limit(100).all()
+        assert rows
+
+        for only in [columns, ["title", "id"], ["publication_date"]]:
+            schema = output_schema(many=True, only=only)
+            dump = get_row_serializer(schema, rows, True)
+            assert dump is not None
+
+            assert dumps(dump(rows, many=True)) == dumps(schema.dump(rows, many=True))
+            assert dumps(dump(rows[0])) == dumps(schema.dump(rows[0]))
+
+        # model instances are left to marshmallow
+        assert get_row_serializer(output_schema(many=True), model.query.limit(2).all(), True) is None
+
+
+def test_field_selection_responses(demo):
+    app, _ = demo
+    client = app.test_client()
+
+    full = client.get("/api/books?limit=50").json["value"]
+    projected = client.get("/api/books?limit=50&fields=title,id,publication_date").json["value"]
+    assert projected == [
+        {key: book[key] for key in ["id", "title", "publication_date"]} for book in full
+    ]
+
+    # single rows are dumped too, rather than the last one of a list
+    book = client.get("/api/books/3?fields=title,id").json["value"]
+    assert book == {"id": 3, "title": full[2]["title"]}
+
+
+def test_compiled_functions_are_kept_without_the_projection_cache():
+    app = create_app({"API_COMPILED_SERIALIZER": True, "API_PROJECTION_CACHE_SIZE": 0})
+    client = app.test_client()
+
+    client.get("/api/books?limit=5")
+    compiled = len(app.extensions[COMPILED_SERIALIZER_EXTENSION][1])
+    client.get("/api/books?limit=5")
+
+    assert compiled > 0
+    assert len(app.extensions[COMPILED_SERIALIZER_EXTENSION][1]) == compiled
+
+
+def test_compiled_functions_use_each_instance():
+    class LabelSchema(Schema):
+        id = fields.Integer()
+        label = fields.Method("get_label")
+
+        def get_label(self, obj):
+            return self.label
+
+    app = create_app({"API_COMPILED_SERIALIZER": True})
+    with app.test_request_context("/"):
+        book = basic_models.Book.query.first()
+        first, second = LabelSchema(), LabelSchema()
+        first.label, second.label = "first", "second"
+
+        # the code is compiled once, but each instance dumps with its own fields and state
+        assert get_compiled_serializer(first)(book) == {"id": book.id, "label": "first"}
+        compiled = len(app.extensions[COMPILED_SERIALIZER_EXTENSION][1])
+        assert get_compiled_serializer(second)(book) == {"id": book.id, "label": "second"}
+        assert len(app.extensions[COMPILED_SERIALIZER_EXTENSION][1]) == compiled
@@ -0,0 +1,116 @@
+from datetime import datetime, timezone
+
+from werkzeug.http import http_date
+
+from demo.basic_factory.basic_factory import create_app
+
+
+def test_conditional_get_is_off_by_default():
+    response = create_app({}).test_client().get("/api/books/1")
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+
+def test_version_etag_skips_the_query(count_statements):
+    app = create_app({"API_CONDITIONAL_GET": True, "API_ETAG_SOURCE": "version"})
+    client = app.test_client()
+
+    for url in ["/api/books?limit=10", "/api/books/1"]:
+        response = client.get(url)
+        etag = response.headers["ETag"]
+        assert response.status_code == 200
+        assert etag.startswith('W/"')
+
+        with count_statements(app) as statements:
+            response = client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.data == b""
+        assert response.headers["ETag"] == etag
+        assert statements == []
+
+    # a different url is a different representation
+    assert client.get("/api/books?limit=5").headers["ETag"] != etag
+
+
+def test_version_etag_changes_on_write():
+    app = create_app({"API_CONDITIONAL_GET": True, "API_ETAG_SOURCE": "version"})
+    client = app.test_client()
+
+    etag = client.get("/api/books?limit=10").headers["ETag"]
+    assert client.patch("/api/books/1", json={"title": "A new title"}).status_code == 200
+
+    response = client.get("/api/books?limit=10", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_updated_etag_and_last_modified(count_statements):
+    app = create_app(
+        {"API_CONDITIONAL_GET": True, "API_ETAG_SOURCE": "updated", "API_LAST_MODIFIED_COLUMN": "publication_date"}
+    )
+    client = app.test_client()
+
+    response = client.get("/api/books?limit=10")
+    etag = response.headers["ETag"]
+    # lists have no Last-Modified, a delete wouldn't move it on
+    assert "Last-Modified" not in response.headers
+
+    with count_statements(app) as statements:
+        response = client.get("/api/books?limit=10", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert len(statements) == 1
+    assert "max" in statements[0].lower()
+
+    last_modified = client.get("/api/books/2").headers["Last-Modified"]
+    response = client.get("/api/books/2", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+    # deleting a row changes the count, so the ETag
+    assert client.delete("/api/books/1").status_code == 200
+    response = client.get("/api/books?limit=10", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_delete_is_seen_with_if_modified_since():
+    app = create_app(
+        {"API_CONDITIONAL_GET": True, "API_ETAG_SOURCE": "updated", "API_LAST_MODIFIED_COLUMN": "publication_date"}
+    )
+    client = app.test_client()
+    first = client.get("/api/books?limit=10")
+
+    # a delete leaves the latest publication date as it was, so a client that only sends a date must get the list
+    assert client.delete("/api/books/1").status_code == 200
+    response = client.get("/api/books?limit=10", headers={"If-Modified-Since": http_date(datetime.now(timezone.utc))})
+    assert response.status_code == 200
+    assert response.json["value"] != first.json["value"]
+
+
+def test_body_etag():
+    app = create_app({"API_CONDITIONAL_GET": True})
+    client = app.test_client()
+
+    response = client.get("/api/books/1")
+    etag = response.headers["ETag"]
+    assert "Last-Modified" not in response.headers
+    assert client.get("/api/books/1").headers["ETag"] == etag
+    assert client.get("/api/books/1", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/books/2", headers={"If-None-Match": etag}).status_code == 200
+    assert client.get("/api/books/999999", headers={"If-None-Match": etag}).status_code == 404
+
+
+def test_cache_control():
+    app = create_app({"API_CACHE_CONTROL": "private, max-age=30"})
+    client = app.test_client()
+
+    assert client.get("/api/books?limit=5").headers["Cache-Control"] == "private, max-age=30"
+    assert "Cache-Control" not in client.get("/api/books/999999").headers
+
+    app = create_app({"API_CONDITIONAL_GET": True, "API_CACHE_CONTROL": "no-cache"})
+    client = app.test_client()
+    etag = client.get("/api/books/1").headers["ETag"]
+    response = client.get("/api/books/1", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["Cache-Control"] == "no-cache"
@@ -0,0 +1,56 @@
+from demo.basic_factory.basic_factory import create_app
+from demo.basic_factory.basic_factory.models import Book
+from flask_scheema.services.counting import COUNT_CACHE_EXTENSION
+from flask_scheema.utilities import get_app_cache
+
+
+def test_count_none():
+    app = create_app({})
+    client = app.test_client()
+
+    exact = client.get("/api/books?limit=10").json
+    response = client.get("/api/books?limit=10&count=none").json
+
+    assert response["total_count"] is None
+    assert [row["id"] for row in response["value"]] == [row["id"] for row in exact["value"]]
+    assert response["next_url"] == "http://localhost/api/books?limit=10&count=none&page=2"
+
+    last_page = -(-exact["total_count"] // 10)
+    response = client.get(f"/api/books?limit=10&count=none&page={last_page}").json
+    assert response["next_url"] is None
+    assert response["previous_url"] is not None
+
+
+def test_count_estimate_falls_back_to_exact():
+    app = create_app({})
+    client = app.test_client()
+
+    exact = client.get("/api/books?id__gt=5").json["total_count"]
+    assert client.get("/api/books?id__gt=5&count=estimate").json["total_count"] == exact
+
+
+def test_invalid_count_mode():
+    app = create_app({})
+    response = app.test_client().get("/api/books?count=roughly")
+
+    assert response.status_code == 400
+    assert response.json["errors"][0]["reason"] == (
+        "Invalid count value: roughly (must be one of exact, cached, estimate, none)"
+    )
+
+
+def test_cached_count_is_invalidated_by_writes():
+    app = create_app({"API_COUNT_MODE": "cached"})
+    client = app.test_client()
+
+    first = client.get("/api/books?id__gt=5").json["total_count"]
+    assert client.get("/api/books?id__gt=5").json["total_count"] == first
+
+    with app.app_context():
+        assert get_app_cache(COUNT_CACHE_EXTENSION, "API_COUNT_CACHE_SIZE").hits == 1
+
+        session = app.extensions["sqlalchemy"].session
+        session.delete(session.get(Book, 10))
+        session.commit()
+
+    assert client.get("/api/books?id__gt=5").json["total_count"] == first - 1
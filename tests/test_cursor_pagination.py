@@ -0,0 +1,92 @@
+from urllib.parse import parse_qs, urlparse
+
+from demo.basic_factory.basic_factory import create_app
+
+
+def walk(client, url):
+    pages = []
+    while url:
+        response = client.get(url).json
+        pages.append(response)
+        url = response["next_url"]
+    return pages
+
+
+def test_cursor_pages():
+    app = create_app({})
+    client = app.test_client()
+
+    pages = walk(client, "/api/books?cursor=&order_by=-title&fields=id,title&limit=7")
+    rows = [(row["title"], row["id"]) for page in pages for row in page["value"]]
+
+    # ordered by title descending, then id
+    assert rows == sorted(rows, key=lambda row: (row[0], -row[1]), reverse=True)
+    assert len({row[1] for row in rows}) == len(rows) == client.get("/api/books").json["total_count"]
+    assert "page" not in parse_qs(urlparse(pages[0]["next_url"]).query)
+    assert pages[0]["previous_url"] is None
+    assert pages[-1]["next_url"] is None
+
+    previous = client.get(pages[2]["previous_url"]).json
+    assert previous["value"] == pages[1]["value"]
+    assert client.get(previous["previous_url"]).json["value"] == pages[0]["value"]
+
+
+def test_cursor_columns_not_selected():
+    app = create_app({})
+    client = app.test_client()
+
+    pages = walk(client, "/api/books?cursor=&order_by=-title&fields=id&limit=50")
+    assert all(list(row.keys()) == ["id"] for page in pages for row in page["value"])
+    assert len({row["id"] for page in pages for row in page["value"]}) == client.get("/api/books").json["total_count"]
+
+
+def test_cursor_mode_from_config():
+    app = create_app({"API_PAGINATION_MODE": "cursor"})
+    client = app.test_client()
+
+    response = client.get("/api/authors?limit=5").json
+    assert "cursor" in parse_qs(urlparse(response["next_url"]).query)
+
+    # asking for a page number still pages by offset
+    response = client.get("/api/authors?limit=5&page=2").json
+    assert [row["id"] for row in response["value"]] == [6, 7, 8, 9, 10]
+
+
+def test_invalid_cursor():
+    app = create_app({})
+    client = app.test_client()
+
+    next_url = client.get("/api/books?cursor=&limit=5").json["next_url"]
+    cursor = parse_qs(urlparse(next_url).query)["cursor"][0]
+
+    response = client.get(f"/api/books?limit=5&cursor={cursor[:-2]}xx")
+    assert response.status_code == 400
+    assert response.json["errors"][0]["reason"] == "Invalid cursor"
+
+    response = client.get(f"/api/books?limit=5&order_by=-id&cursor={cursor}")
+    assert response.status_code == 400
+    assert response.json["errors"][0]["reason"] == "Cursor does not match the order_by of the request"
+
+
+def test_cursor_pages_over_nulls():
+    app = create_app({})
+    client = app.test_client()
+
+    with app.app_context():
+        from demo.basic_factory.basic_factory.models import Author
+
+        session = app.extensions["sqlalchemy"].session
+        for author in session.query(Author).filter(Author.id % 3 == 0):
+            author.website = None
+        session.commit()
+    total = client.get("/api/authors").json["total_count"]
+
+    for order_by in ("website", "-website"):
+        pages = walk(client, f"/api/authors?cursor=&order_by={order_by}&fields=id,website&limit=4")
+        ids = [row["id"] for page in pages for row in page["value"]]
+        assert len(set(ids)) == len(ids) == total
+
+        # paging back from a page that starts among the nulls returns the page before it
+        index = next(i for i, page in enumerate(pages) if any(row["website"] is None for row in page["value"]))
+        if index and pages[index]["previous_url"]:
+            assert client.get(pages[index]["previous_url"]).json["value"] == pages[index - 1]["value"]
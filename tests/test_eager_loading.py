@@ -0,0 +1,85 @@
+from marshmallow import Schema, fields
+from sqlalchemy.orm import joinedload
+
+from demo.basic_factory.basic_factory import create_app
+from demo.basic_factory.basic_factory.models import Book, Author
+from flask_scheema.scheema.utils import get_input_output_from_model_or_make
+from flask_scheema.services.loading import LOADER_OPTIONS_EXTENSION, build_loader_options, requires_unique
+
+
+def test_page_queries_are_constant(count_statements):
+    app = create_app({"API_PAGINATION_SIZE_MAX": 100})
+    client = app.test_client()
+
+    with count_statements(app) as small:
+        assert client.get("/api/books?limit=10").status_code == 200
+    with count_statements(app) as large:
+        response = client.get("/api/books?limit=100")
+
+    assert response.status_code == 200
+    assert len(response.json["value"]) == 100
+    assert all(book["author"]["id"] == book["author_id"] for book in response.json["value"])
+    assert len(large) == len(small)
+    assert len(large) <= 3
+
+
+def test_eager_loading_can_be_disabled(count_statements):
+    app = create_app({"API_PAGINATION_SIZE_MAX": 100, "API_EAGER_LOAD": False})
+    client = app.test_client()
+
+    with count_statements(app) as small:
+        assert client.get("/api/books?limit=10").status_code == 200
+    with count_statements(app) as large:
+        assert client.get("/api/books?limit=100").status_code == 200
+    assert len(large) > len(small)
+
+
+def test_loader_strategy_from_meta(monkeypatch):
+    app = create_app({})
+    with app.app_context():
+        _, output_schema = get_input_output_from_model_or_make(Book)
+
+        options = build_loader_options(Book, output_schema)
+        assert {str(option.path) for option in options} == {
+            str(joinedload(Book.author).path),
+            str(joinedload(Book.publisher).path),
+        }
+        assert all(option.context[0].strategy == (("lazy", "joined"),) for option in options)
+
+        monkeypatch.setattr(Book.Meta, "eager_load", "selectin", raising=False)
+        app.extensions["flask_scheema"].invalidate_config_cache()
+        options = build_loader_options(Book, output_schema)
+        assert all(option.context[0].strategy == (("lazy", "selectin"),) for option in options)
+
+        # authors only link to their books by url, there is nothing to load
+        assert build_loader_options(Author, get_input_output_from_model_or_make(Author)[1]) == ()
+
+
+def test_loader_options_are_kept_without_the_projection_cache():
+    app = create_app({"API_PROJECTION_CACHE_SIZE": 0})
+    client = app.test_client()
+
+    client.get("/api/books?limit=5")
+
+    assert len(app.extensions[LOADER_OPTIONS_EXTENSION][1]) > 0
+
+
+def test_streams_select_joined_collections(monkeypatch):
+    class BookSchema(Schema):
+        id = fields.Integer()
+
+    class AuthorSchema(Schema):
+        books = fields.Nested(BookSchema, many=True)
+
+    app = create_app({})
+    with app.app_context():
+        monkeypatch.setattr(Author.Meta, "eager_load", "joined", raising=False)
+        app.extensions["flask_scheema"].invalidate_config_cache()
+
+        options = build_loader_options(Author, AuthorSchema)
+        assert requires_unique(options)
+
+        # joined collections repeat rows, so streams load them a batch at a time with selectinload
+        options = build_loader_options(Author, AuthorSchema, stream=True)
+        assert not requires_unique(options)
+        assert all(option.context[0].strategy == (("lazy", "selectin"),) for option in options)
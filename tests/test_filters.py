@@ -0,0 +1,53 @@
+import pytest
+
+from demo.basic_factory.basic_factory import create_app
+from flask_scheema.exceptions import CustomHTTPException
+from flask_scheema.services.filters import Condition, Group, parse_filter_args
+
+
+def test_parse_nested_groups():
+    tree, values = parse_filter_args(
+        {"id__in": "(1,2)", "or[id__eq": "1, and[title__like=dune, author_id__eq=]]", "page": "2", "id__sum": "x"}
+    )
+
+    assert tree == Group("and", (
+        Condition("id", "in", False),
+        Group("or", (
+            Condition("id", "eq", False),
+            Group("and", (Condition("title", "like", False), Condition("author_id", "eq", True))),
+        )),
+    ))
+    assert values == ["(1,2)", "1", "dune", ""]
+
+
+@pytest.mark.parametrize("args, reason", [
+    ({"id__foo": "1"}, "Invalid filter 'id__foo': unknown operator 'foo' at position 4"),
+    ({"or[id__eq": "1"}, "Invalid filter 'or[id__eq=1': expected ',' or ']', found end of filter at position 11"),
+    ({"or[id__eq": "1,]"}, "Invalid filter 'or[id__eq=1,]': expected a filter or group, found ']' at position 12"),
+    ({"or[id__in": "(1,2]"}, "Invalid filter 'or[id__in=(1,2]': '(' is not closed at position 10"),
+    ({"xor[id__eq": "1]"}, "Invalid filter 'xor[id__eq=1]': unknown group 'xor', use 'and' or 'or' at position 0"),
+])
+def test_malformed_filters(args, reason):
+    with pytest.raises(CustomHTTPException) as error:
+        parse_filter_args(args)
+    assert error.value.status_code == 400
+    assert error.value.reason == reason
+
+
+def test_nesting_is_limited():
+    key, value = ("or[" * 40 + "id__eq=1" + "]" * 40).split("=", 1)
+    with pytest.raises(CustomHTTPException) as error:
+        parse_filter_args({key: value})
+    assert "nested more than 32 deep" in error.value.reason
+
+
+def test_nested_filter_request():
+    app = create_app({})
+    client = app.test_client()
+
+    response = client.get("/api/authors?or[id__eq=1, and[id__gt=3, id__lt=6]]&fields=id&order_by=id")
+    assert [row["id"] for row in response.json["value"]] == [1, 4, 5]
+
+    response = client.get("/api/authors?pages__eq=1")
+    assert response.status_code == 400
+    assert response.json["errors"][0]["reason"] == "Invalid column name: pages"
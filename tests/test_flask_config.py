@@ -1,8 +1,12 @@
+import dataclasses
+
 import pytest
 from flask import session
 
 from demo.basic_factory.basic_factory import create_app
 from demo.model_extension.model import create_app as create_app_models
+from flask_scheema.api.plan import get_route_plan
+from flask_scheema.utilities import get_config_resolver, invalidate_config_cache
 
 
 @pytest.fixture
@@ -310,6 +314,74 @@ def test_dump_hybrid_on(client):
     assert "full_name" in resp.json["value"].keys()
 
 
+def test_config_lookups_are_memoised(app, client):
+    client.get("/api/books?order_by=id")
+    resolver = get_config_resolver(app)
+    misses = resolver.stats()["misses"]
+
+    client.get("/api/books?order_by=id")
+    client.get("/api/books?order_by=id")
+
+    assert resolver.stats()["misses"] == misses
+    assert resolver.stats()["hits"] > 0
+
+
+def test_config_cache_invalidation(app, client):
+    assert "api_version" in client.get("/api/books/1").json
+
+    app.config["API_DUMP_VERSION"] = False
+    assert "api_version" in client.get("/api/books/1").json
+
+    invalidate_config_cache(app)
+    assert "api_version" not in client.get("/api/books/1").json
+
+
+def test_route_plan(app):
+    with app.test_client() as client:
+        client.get("/api/books")
+        plan = get_route_plan()
+
+        assert plan.model.__name__ == "Book"
+        assert plan.many is True
+        assert plan.pagination_default == 20
+        assert plan.handler is not None
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            plan.many = False
+
+        # a stale plan is ignored once the config cache is cleared
+        invalidate_config_cache(app)
+        assert get_route_plan() is None
+
+
+def test_decorator_chain_built_once(monkeypatch):
+    app = create_app({"API_RATE_LIMIT": "100 per minute"})
+    client = app.test_client()
+    client.get("/api/books")
+
+    calls = []
+
+    def count(func):
+        def counted(*args, **kwargs):
+            calls.append(func.__name__)
+            return func(*args, **kwargs)
+
+        return counted
+
+    import flask_scheema.flask_extension as extension
+
+    monkeypatch.setattr(extension, "handle_many", count(extension.handle_many))
+    monkeypatch.setattr(extension, "handle_one", count(extension.handle_one))
+    limiter = app.extensions["flask_scheema"].limiter
+    monkeypatch.setattr(limiter, "limit", count(limiter.limit))
+
+    for _ in range(3):
+        assert client.get("/api/books").status_code == 200
+        assert client.get("/api/books/1").status_code == 200
+
+    assert calls == []
+    assert "X-RateLimit-Limit" in client.get("/api/books").headers
+
+
 # change the api base url prefix
 def test_change_api_route():
     app_prefix = create_app(
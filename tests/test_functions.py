@@ -1,6 +1,7 @@
 # Generated by CodiumAI
 
-from flask_scheema.utilities import validate_flask_limiter_rate_limit_string
+from flask_scheema.api.utils import endpoint_namer
+from flask_scheema.utilities import memoize, memo_stats, validate_flask_limiter_rate_limit_string
 
 
 class TestValidateRateLimitString:
@@ -210,3 +211,65 @@ class TestPluralizeLastWord:
         assert result == "words"
 
     #  input with only non-alphabetic characters returns the same input
+
+
+class TestMemoize:
+
+    #  results are cached and counted
+    def test_memoize_caches_results(self):
+        # Arrange
+        calls = []
+
+        @memoize(maxsize=2)
+        def double(value):
+            calls.append(value)
+            return value * 2
+
+        # Act
+        results = [double(1), double(1), double(2), double(3), double(1)]
+
+        # Assert
+        assert results == [2, 2, 4, 6, 2]
+        assert calls == [1, 2, 3, 1]
+        assert double.cache.stats() == {"size": 2, "maxsize": 2, "hits": 1, "misses": 4}
+
+    #  unhashable arguments are passed through
+    def test_memoize_unhashable_arguments(self):
+        # Arrange
+        @memoize()
+        def total(values):
+            return sum(values)
+
+        # Act / Assert
+        assert total([1, 2]) == 3
+        assert len(total.cache) == 0
+
+    #  the naming functions share the memo registry
+    def test_naming_functions_are_memoised(self):
+        # Act
+        pluralize_last_word("book_review")
+        pluralize_last_word("book_review")
+
+        # Assert
+        stats = memo_stats()["flask_scheema.api.utils.pluralize_last_word"]
+        assert stats["hits"] >= 1
+        assert "flask_scheema.api.utils.convert_case" in memo_stats()
+
+    #  endpoint names follow the config after it is invalidated
+    def test_endpoint_namer_follows_config(self):
+        # Arrange
+        from demo.basic_factory.basic_factory import create_app
+        from demo.basic_factory.basic_factory.models import Author
+
+        app = create_app({"API_ENDPOINT_CASE": "kebab"})
+
+        with app.app_context():
+            # Act
+            before = endpoint_namer(Author)
+            app.config["API_ENDPOINT_CASE"] = "pascal"
+            app.extensions["flask_scheema"].invalidate_config_cache()
+            after = endpoint_namer(Author)
+
+        # Assert
+        assert before == "authors"
+        assert after == "Authors"
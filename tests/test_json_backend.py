@@ -0,0 +1,151 @@
+import json
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+
+import pytest
+
+from demo.basic_factory.basic_factory import create_app
+from flask_scheema.api.encoding import JSON_BACKENDS, create_json_response, json_default
+from flask_scheema.utilities import invalidate_config_cache
+
+
+class Colour(Enum):
+    RED = "red"
+
+
+VALUES = {
+    "datetime": datetime(2024, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc),
+    "naive": datetime(2024, 1, 2, 3, 4, 5),
+    "date": date(2024, 1, 2),
+    "time": time(3, 4, 5),
+    "decimal": Decimal("1.10"),
+    "uuid": UUID("12345678-1234-5678-1234-567812345678"),
+    "enum": Colour.RED,
+    "text": "café",
+    "list": [1, 2.5, None, True],
+}
+
+
+def test_json_default():
+    assert json.loads(JSON_BACKENDS["stdlib"].dumps(VALUES)) == {
+        "datetime": "2024-01-02T03:04:05.000678+00:00",
+        "naive": "2024-01-02T03:04:05",
+        "date": "2024-01-02",
+        "time": "03:04:05",
+        "decimal": "1.10",
+        "uuid": "12345678-1234-5678-1234-567812345678",
+        "enum": "red",
+        "text": "café",
+        "list": [1, 2.5, None, True],
+    }
+    with pytest.raises(TypeError):
+        json_default(object())
+
+
+def test_orjson_matches_stdlib():
+    pytest.importorskip("orjson")
+    assert JSON_BACKENDS["orjson"].dumps(VALUES) == JSON_BACKENDS["stdlib"].dumps(VALUES)
+    assert JSON_BACKENDS["orjson"].dumps({"big": 2**70}) == b'{"big":1180591620717411303424}'
+
+    # large and small floats are formatted differently, but read back the same
+    floats = {"large": 1e16, "larger": 1.5e300, "small": 1e-7, "negative": -2.5e20}
+    assert json.loads(JSON_BACKENDS["orjson"].dumps(floats)) == json.loads(JSON_BACKENDS["stdlib"].dumps(floats))
+
+    # NaN and infinity aren't JSON, both write null
+    special = {"nan": float("nan"), "inf": float("inf"), "list": [float("-inf"), 1.0]}
+    for name in ("orjson", "stdlib"):
+        assert json.loads(JSON_BACKENDS[name].dumps(special)) == {"nan": None, "inf": None, "list": [None, 1.0]}
+
+
+@pytest.mark.parametrize("backend", ["stdlib", "auto"])
+def test_verify_against_the_app_provider(backend):
+    app = create_app({"API_JSON_BACKEND": backend, "API_JSON_VERIFY": True})
+
+    with app.test_request_context():
+        data = {"b": 1e16, "a": float("nan"), "c": [Decimal("1.10")]}
+        assert json.loads(create_json_response(data).get_data()) == {"b": 1e16, "a": None, "c": ["1.10"]}
+
+        # a datetime outside of a schema is written as an HTTP date by Flask, but in ISO 8601 by the backends
+        assert json.loads(create_json_response({"when": datetime(2024, 1, 2)}).get_data()) == {
+            "when": "2024-01-02T00:00:00"
+        }
+
+
+def test_verify_catches_a_different_body():
+    class Backend:
+        loads = staticmethod(json.loads)
+
+        @staticmethod
+        def dumps(data):
+            return json.dumps({**data, "extra": True}).encode()
+
+    app = create_app({"API_JSON_BACKEND": Backend(), "API_JSON_VERIFY": True})
+
+    with app.test_request_context():
+        with pytest.raises(ValueError):
+            create_json_response({"a": 1})
+
+
+@pytest.mark.parametrize("backend", ["stdlib", "auto"])
+def test_responses_match_flask(backend):
+    # one app, switched between encoders, so both responses come from the same seeded rows
+    app = create_app({})
+    client = app.test_client()
+
+    for url in ["/api/books?limit=20", "/api/books/1", "/api/authors/1/books", "/api/books/999999"]:
+        app.config.update(API_JSON_BACKEND="flask", API_JSON_VERIFY=False)
+        invalidate_config_cache(app)
+        expected = client.get(url)
+
+        app.config.update(API_JSON_BACKEND=backend, API_JSON_VERIFY=True)
+        invalidate_config_cache(app)
+        response = client.get(url)
+
+        assert response.status_code == expected.status_code
+        assert response.mimetype == "application/json"
+        expected_data, data = expected.json, response.json
+        expected_data.pop("datetime", None), data.pop("datetime", None)
+        expected_data.pop("response_ms", None), data.pop("response_ms", None)
+        assert data == expected_data
+
+
+def test_request_body():
+    client = create_app({"API_JSON_BACKEND": "auto"}).test_client()
+
+    data = {
+        "biography": "Foo is a Baz",
+        "date_of_birth": "1900-01-01",
+        "first_name": "Foo",
+        "last_name": "Bar",
+        "nationality": "Bazville",
+        "website": "https://foobar.baz",
+    }
+    response = client.post("/api/authors", json=data)
+    assert response.status_code == 200
+    assert response.json["value"]["first_name"] == "Foo"
+
+    response = client.post("/api/authors", data="{not json", headers={"Content-Type": "application/json"})
+    assert response.status_code == 400
+
+
+def test_custom_backend():
+    calls = []
+
+    class Backend:
+        def dumps(self, data):
+            calls.append(data)
+            return json.dumps(data, default=json_default).encode()
+
+        loads = staticmethod(json.loads)
+
+    client = create_app({"API_JSON_BACKEND": Backend()}).test_client()
+
+    assert client.get("/api/books/1").json["value"]["id"] == 1
+    assert len(calls) == 1
+
+
+def test_invalid_backend():
+    with pytest.raises(ValueError):
+        create_app({"API_JSON_BACKEND": "simplejson"})
@@ -0,0 +1,54 @@
+from demo.basic_factory.basic_factory import create_app
+from flask_scheema.utilities import invalidate_config_cache
+
+
+def test_list_query_is_one_statement(count_statements):
+    app = create_app({})
+    client = app.test_client()
+
+    with count_statements(app) as statements:
+        response = client.get("/api/books?fields=id,title&limit=5").json
+
+    assert len(statements) == 1
+    assert len(response["value"]) == 5
+    assert list(response["value"][0]) == ["id", "title"]
+
+    with count_statements(app) as statements:
+        client.get("/api/books?limit=5&count=exact")
+
+    assert len(statements) == 1
+
+
+def test_window_count_matches_exact_count(count_statements):
+    # one app, so both counts are of the same seeded rows
+    app = create_app({})
+    client = app.test_client()
+    windowed = client.get("/api/books?id__gt=5&limit=7").json
+
+    app.config["API_WINDOW_COUNT"] = False
+    invalidate_config_cache(app)
+    with count_statements(app) as statements:
+        counted = client.get("/api/books?id__gt=5&limit=7").json
+
+    assert len(statements) == 2
+    assert windowed["total_count"] == counted["total_count"]
+    assert [row["id"] for row in windowed["value"]] == [row["id"] for row in counted["value"]]
+
+
+def test_window_count_past_last_page():
+    app = create_app({})
+    client = app.test_client()
+
+    total = client.get("/api/books?limit=10").json["total_count"]
+    response = client.get(f"/api/books?limit=10&page={total // 10 + 2}").json
+
+    assert response["value"] == []
+    assert response["total_count"] == total
+
+
+def test_window_count_with_no_rows():
+    app = create_app({})
+    response = app.test_client().get("/api/books?id__lt=0").json
+
+    assert response["value"] == []
+    assert response["total_count"] == 0
@@ -0,0 +1,71 @@
+import pytest
+
+from demo.basic_factory.basic_factory import create_app
+
+msgpack = pytest.importorskip("msgpack")
+
+ACCEPT = {"Accept": "application/msgpack"}
+
+
+def test_msgpack_list_response():
+    app = create_app({})
+    client = app.test_client()
+
+    expected = client.get("/api/books?limit=10").json
+    response = client.get("/api/books?limit=10", headers=ACCEPT)
+    data = msgpack.unpackb(response.data)
+
+    assert response.mimetype == "application/msgpack"
+    assert "Accept" in response.headers["Vary"]
+    assert data["value"] == expected["value"]
+    assert data["total_count"] == expected["total_count"]
+    assert data["next_url"] == expected["next_url"]
+    assert len(response.data) < len(client.get("/api/books?limit=10").data)
+
+
+def test_msgpack_error_response():
+    app = create_app({})
+    response = app.test_client().get("/api/books/999999", headers=ACCEPT)
+
+    assert response.status_code == 404
+    assert msgpack.unpackb(response.data)["status_code"] == 404
+
+
+def test_json_is_preferred_by_default():
+    app = create_app({})
+    response = app.test_client().get("/api/books/1", headers={"Accept": "*/*"})
+
+    assert response.mimetype == "application/json"
+
+
+def test_msgpack_request_body():
+    app = create_app({})
+    client = app.test_client()
+
+    data = {
+        "biography": "Foo is a Baz",
+        "date_of_birth": "1900-01-01",
+        "first_name": "Foo",
+        "last_name": "Bar",
+        "nationality": "Bazville",
+        "website": "https://foobar.baz",
+    }
+    response = client.post(
+        "/api/authors",
+        data=msgpack.packb(data),
+        headers={"Content-Type": "application/msgpack", **ACCEPT},
+    )
+    created = msgpack.unpackb(response.data)["value"]
+
+    assert response.status_code == 200
+    assert created["full_name"] == "Foo Bar"
+    assert client.get(f"/api/authors/{created['id']}").json["value"]["full_name"] == "Foo Bar"
+
+
+def test_invalid_msgpack_request_body():
+    app = create_app({})
+    response = app.test_client().patch(
+        "/api/authors/1", data=b"\xc1", headers={"Content-Type": "application/msgpack"}
+    )
+
+    assert response.status_code == 400
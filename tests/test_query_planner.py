@@ -0,0 +1,70 @@
+from sqlalchemy import or_
+
+from demo.basic_factory.basic_factory import create_app
+from demo.basic_factory.basic_factory.models import Book
+from flask_scheema.services.database import CrudService
+from flask_scheema.services.planner import get_query_plan_stats, normalise_args
+
+
+def test_same_shape_shares_plan():
+    shape, values = normalise_args({"id__gt": "3", "title__like": "the", "limit": "5"})
+    reordered, reordered_values = normalise_args({"title__like": "love", "limit": "10", "id__gt": "7"})
+
+    assert shape == reordered
+    assert values == ["3", "the"]
+    assert reordered_values == ["7", "love"]
+
+    other_shape, _ = normalise_args({"id__gt": "3", "order_by": "-id"})
+    assert other_shape != shape
+
+
+def test_plan_cache_hits():
+    app = create_app({})
+    client = app.test_client()
+
+    first = client.get("/api/books?id__lt=10&fields=id,title")
+    second = client.get("/api/books?id__lt=5&fields=id,title")
+
+    assert [row["id"] for row in first.json["value"]] == list(range(1, 10))
+    assert [row["id"] for row in second.json["value"]] == list(range(1, 5))
+
+    with app.app_context():
+        stats = get_query_plan_stats()
+
+    assert stats["plans"]["hits"] >= 1
+    assert stats["plans"]["hit_rate"] > 0
+    assert stats["build"]["count"] == stats["plans"]["misses"]
+    assert stats["parse"]["count"] >= 2
+    assert stats["execute"]["count"] >= 2
+
+
+def test_invalid_column_is_not_cached():
+    app = create_app({})
+    client = app.test_client()
+
+    for _ in range(2):
+        response = client.get("/api/books?nope__eq=1")
+        assert response.status_code == 400
+        assert response.json["errors"][0]["reason"] == "Invalid column name: nope"
+
+    with app.app_context():
+        assert get_query_plan_stats()["plans"]["hits"] == 0
+
+
+def test_plan_matches_hand_written_query():
+    app = create_app({})
+    args = {"id__in": "(3,4,5,40)", "order_by": "-id", "or[title__like": "a, id__eq=40]"}
+
+    with app.test_request_context("/api/books"):
+        session = app.extensions["sqlalchemy"].session
+        service = CrudService(Book, session=session)
+        planned = service.get_query(args)
+        expected = (
+            session.query(Book)
+            .filter(Book.id.in_([3, 4, 5, 40]), or_(Book.title.like("%a%"), Book.id == 40))
+            .order_by(Book.id.desc())
+            .all()
+        )
+
+        assert [book.id for book in planned["query"]] == [book.id for book in expected]
+        assert planned["total_count"] == len(expected)
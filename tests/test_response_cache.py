@@ -0,0 +1,206 @@
+import time
+
+from demo.basic_factory.basic_factory import create_app
+from flask_scheema.api.caching import MemoryResponseCache, RedisResponseCache, get_response_cache_stats
+
+
+class FakeRedis:
+    """
+    The few Redis commands the response cache uses, held in dictionaries.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+        self.expiry = {}
+
+    def _expired(self, key):
+        if key in self.expiry and self.expiry[key] <= time.monotonic():
+            self.values.pop(key, None)
+            self.sets.pop(key, None)
+            self.expiry.pop(key)
+
+    def get(self, key):
+        self._expired(key)
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+        if ex:
+            self.expiry[key] = time.monotonic() + ex
+
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+    def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1).encode()
+        return int(self.values[key])
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    def smembers(self, key):
+        self._expired(key)
+        return set(self.sets.get(key, set()))
+
+    def expire(self, key, seconds):
+        self.expiry[key] = time.monotonic() + seconds
+
+    def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            removed += (self.values.pop(key, None) is not None) + (self.sets.pop(key, None) is not None)
+        return removed
+
+    def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip("*") if match else ""
+        return [key.encode() for key in [*self.values, *self.sets] if key.startswith(prefix)]
+
+    def memory_usage(self, key):
+        key = key.decode()
+        self._expired(key)
+        if key in self.values:
+            return len(key) + len(self.values[key])
+        return None
+
+
+def test_response_cache_is_off_by_default():
+    response = create_app({}).test_client().get("/api/books?limit=5")
+
+    assert "X-Cache" not in response.headers
+
+
+def test_cached_response_skips_the_query(count_statements):
+    app = create_app({"API_RESPONSE_CACHE": True})
+    client = app.test_client()
+
+    first = client.get("/api/books?limit=5&page=2")
+    assert first.headers["X-Cache"] == "MISS"
+
+    # the arguments are put in order, so both urls share an entry
+    with count_statements(app) as statements:
+        second = client.get("/api/books?page=2&limit=5")
+
+    assert second.headers["X-Cache"] == "HIT"
+    assert statements == []
+    assert second.json["value"] == first.json["value"]
+    assert second.mimetype == first.mimetype
+
+    with app.app_context():
+        stats = get_response_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+    assert stats["entries"] == 1
+    assert stats["bytes"] > len(first.data)
+
+
+def test_errors_are_not_cached():
+    client = create_app({"API_RESPONSE_CACHE": True}).test_client()
+
+    client.get("/api/books/999999")
+    assert client.get("/api/books/999999").headers["X-Cache"] == "MISS"
+
+
+def test_writes_invalidate_related_responses():
+    app = create_app({"API_RESPONSE_CACHE": True})
+    client = app.test_client()
+
+    client.get("/api/books/1")
+    client.get("/api/authors?limit=5")
+    client.get("/api/publishers?limit=5")
+    assert client.get("/api/books/1").headers["X-Cache"] == "HIT"
+
+    assert client.patch("/api/books/1", json={"title": "A new title"}).status_code == 200
+
+    response = client.get("/api/books/1")
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.json["value"]["title"] == "A new title"
+    # authors are related to books, so their responses are dropped too
+    assert client.get("/api/authors?limit=5").headers["X-Cache"] == "MISS"
+
+    with app.app_context():
+        stats = get_response_cache_stats()
+    assert stats["invalidations"]["Book"] >= 1
+    assert stats["invalidated_entries"] >= 2
+
+
+def test_writes_outside_the_api_invalidate():
+    app = create_app({"API_RESPONSE_CACHE": True})
+    client = app.test_client()
+    client.get("/api/books/1")
+
+    with app.app_context():
+        from demo.basic_factory.basic_factory.models import Book
+
+        session = app.extensions["sqlalchemy"].session
+        session.get(Book, 1).title = "Changed elsewhere"
+        session.commit()
+
+    response = client.get("/api/books/1")
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.json["value"]["title"] == "Changed elsewhere"
+
+
+def test_memory_cache_limits():
+    cache = MemoryResponseCache(maxsize=2, max_bytes=100)
+
+    cache.set("a", b"x" * 10, 60, ["Book"])
+    cache.set("b", b"x" * 10, 60, ["Book"])
+    cache.set("c", b"x" * 10, 60, ["Author"])
+    assert cache.get("a") is None
+    assert cache.size()["entries"] == 2
+    assert cache.size()["evictions"] == 1
+
+    cache.set("d", b"x" * 90, 60, ["Author"])
+    assert cache.size()["bytes"] <= 100
+
+    cache.set("e", b"x" * 101, 60, ["Author"])
+    assert cache.get("e") is None
+
+    cache.set("f", b"x", 0, ["Author"])
+    assert cache.get("f") is None
+
+    assert cache.versions(["Book"]) == (0,)
+    cache.set("g", b"x", 60, ["Book"])
+    assert cache.invalidate(["Book"]) == 1
+    assert cache.versions(["Book"]) == (1,)
+    assert cache.get("g") is None
+
+
+def test_redis_backend():
+    redis = FakeRedis()
+    backend = RedisResponseCache(redis)
+    app = create_app({"API_RESPONSE_CACHE": True, "API_RESPONSE_CACHE_BACKEND": backend})
+    client = app.test_client()
+
+    first = client.get("/api/books?limit=5")
+    assert client.get("/api/books?limit=5").headers["X-Cache"] == "HIT"
+    assert "flask_scheema:response:tag:Book" in redis.sets
+
+    assert client.patch("/api/books/1", json={"title": "A new title"}).status_code == 200
+    response = client.get("/api/books?limit=5")
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.json["value"] != first.json["value"]
+    assert client.get("/api/books?limit=5").headers["X-Cache"] == "HIT"
+
+    # a write recorded by another process sharing the server moves the version on for every process
+    RedisResponseCache(redis).invalidate(["Book"])
+    response = client.get("/api/books?limit=5")
+    assert response.headers["X-Cache"] == "MISS"
+
+    stats = backend.stats()
+    assert stats["hit_ratio"] > 0
+    # the versions and tag sets aren't entries
+    assert stats["entries"] == 1
+    assert stats["bytes"] > len(response.data)
+
+
+def test_cached_response_is_conditional():
+    client = create_app({"API_RESPONSE_CACHE": True, "API_CONDITIONAL_GET": True}).test_client()
+
+    etag = client.get("/api/books/1").headers["ETag"]
+    response = client.get("/api/books/1", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["X-Cache"] == "HIT"
@@ -0,0 +1,200 @@
+import pytest
+
+from demo.basic_factory.basic_factory import create_app
+from demo.basic_factory.basic_factory.models import Book
+from flask_scheema.api.decorators import PROJECTION_CACHE_EXTENSION, get_projected_schema
+from flask_scheema.scheema.bases import FIELD_TEMPLATE_EXTENSION, AutoScheema
+from flask_scheema.scheema.utils import get_input_output_from_model_or_make
+from flask_scheema.utilities import get_app_cache, invalidate_config_cache
+
+
+@pytest.fixture
+def app():
+    app = create_app({})
+    yield app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def test_fields_built_once_per_schema_class(app, monkeypatch):
+    with app.test_request_context("/api/books"):
+        _, output_schema = get_input_output_from_model_or_make(Book)
+        first = output_schema()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("fields should come from the template")
+
+        monkeypatch.setattr(AutoScheema, "_build_fields", fail)
+        second = output_schema()
+
+        assert list(first.fields) == list(second.fields)
+        for name, field in second.fields.items():
+            assert field is not first.fields[name]
+            assert field.parent is second
+            assert field.data_key == first.fields[name].data_key
+
+        # changes to one instance's fields don't leak into the next
+        second.fields["title"].required = not first.fields["title"].required
+        assert output_schema().fields["title"].required == first.fields["title"].required
+
+        book = Book.query.first()
+        assert first.dump(book) == second.dump(book)
+
+
+def test_field_templates_are_kept_per_app(app):
+    with app.test_request_context("/api/books"):
+        _, output_schema = get_input_output_from_model_or_make(Book)
+        output_schema()
+        templates = get_app_cache(FIELD_TEMPLATE_EXTENSION, "API_FIELD_TEMPLATE_CACHE_SIZE")
+        assert len(templates) > 0
+
+        # invalidating the config replaces the cache, rather than leaving the old templates behind
+        invalidate_config_cache(app)
+        output_schema()
+        assert get_app_cache(FIELD_TEMPLATE_EXTENSION, "API_FIELD_TEMPLATE_CACHE_SIZE") is not templates
+        assert app.extensions[FIELD_TEMPLATE_EXTENSION][1].maxsize == 512
+
+
+def test_projected_schemas_are_cached(app, client):
+    for _ in range(3):
+        response = client.get("/api/books?fields=title,id")
+        assert response.status_code == 200
+        assert set(response.json["value"][0]) == {"id", "title"}
+
+    with app.app_context():
+        cache = get_app_cache(PROJECTION_CACHE_EXTENSION, "API_PROJECTION_CACHE_SIZE")
+    assert cache.stats()["size"] == 1
+    assert cache.stats()["hits"] == 2
+
+    # the same fields in a different order get their own entry, so keys follow each request's order
+    client.get("/api/books?fields=id,title")
+    assert cache.stats()["size"] == 2
+
+    # single record schemas are entries of their own, one per order
+    with app.test_request_context("/api/books"):
+        _, output_schema = get_input_output_from_model_or_make(Book)
+        book = Book.query.first()
+        title_first = get_projected_schema(output_schema, False, ["title", "id"])
+        id_first = get_projected_schema(output_schema, False, ["id", "title"])
+        assert list(title_first.dump(book)) == ["title", "id"]
+        assert list(id_first.dump(book)) == ["id", "title"]
+        assert get_projected_schema(output_schema, False, ["title", "id"]) is title_first
+    assert cache.stats()["size"] == 4
+
+    # invalid names fail fast and are not cached
+    response = client.get("/api/books?fields=title,not_a_field")
+    assert response.status_code == 400
+    assert cache.stats()["size"] == 4
+
+
+def test_projection_cache_size():
+    app = create_app({"API_PROJECTION_CACHE_SIZE": 1})
+    client = app.test_client()
+    client.get("/api/books?fields=title")
+    client.get("/api/books?fields=id")
+
+    with app.app_context():
+        cache = get_app_cache(PROJECTION_CACHE_EXTENSION, "API_PROJECTION_CACHE_SIZE")
+    assert cache.stats()["size"] == 1
+    assert cache.stats()["maxsize"] == 1
+
+
+def test_relation_urls_are_not_renamed_per_row(client, monkeypatch):
+    from flask_scheema.api import utils
+
+    calls = []
+    original = utils.pluralize_last_word
+
+    def pluralize_last_word(name):
+        calls.append(name)
+        return original(name)
+
+    # warm up, any naming left over from startup happens here
+    client.get("/api/authors?limit=5")
+    monkeypatch.setattr(utils, "pluralize_last_word", pluralize_last_word)
+
+    response = client.get("/api/authors?limit=50")
+    assert response.status_code == 200
+    for author in response.json["value"]:
+        assert author["books"] == f"/api/authors/{author['id']}/books"
+
+    book = client.get("/api/books/1").json["value"]
+    assert book["reviews"] == "/api/books/1/reviews"
+    assert calls == []
+
+
+def test_schema_registry(app, monkeypatch):
+    from sqlalchemy import Integer
+    from sqlalchemy.orm import DeclarativeBase, mapped_column
+
+    from flask_scheema.scheema import bases, utils
+
+    # a registry and models of the test's own, so nothing is left behind for other tests
+    registry = utils.SchemaRegistry()
+    monkeypatch.setattr(utils, "schema_registry", registry)
+    monkeypatch.setattr(bases, "schema_registry", registry)
+
+    created = []
+    create_dynamic_schema = utils.create_dynamic_schema
+
+    def counting_create_dynamic_schema(base_class, model_class):
+        created.append(model_class)
+        return create_dynamic_schema(base_class, model_class)
+
+    monkeypatch.setattr(utils, "create_dynamic_schema", counting_create_dynamic_schema)
+
+    class Base(DeclarativeBase):
+        pass
+
+    class Shelf(Base):
+        __tablename__ = "registry_shelf"
+        id = mapped_column(Integer, primary_key=True)
+
+    class Bench(Base):
+        __tablename__ = "registry_bench"
+        id = mapped_column(Integer, primary_key=True)
+
+    class Stool(Base):
+        __tablename__ = "registry_stool"
+        id = mapped_column(Integer, primary_key=True)
+
+    with app.app_context():
+        input_schema, output_schema = get_input_output_from_model_or_make(Book)
+        assert get_input_output_from_model_or_make(Book) == (input_schema, output_schema)
+
+        # a dynamic schema is made once and used for both directions
+        first = get_input_output_from_model_or_make(Shelf)
+        second = get_input_output_from_model_or_make(Shelf)
+        assert first == second
+        assert first[0] is first[1]
+        assert created.count(Shelf) == 1
+
+        # a model without a schema is only looked for once, until another schema is declared
+        indexed = []
+        index_base = registry._index_base
+        monkeypatch.setattr(registry, "_index_base", lambda base: indexed.append(base) or index_base(base))
+        assert registry.get(AutoScheema, Stool, dump=True) is None
+        assert registry.get(AutoScheema, Stool, dump=True) is None
+        assert indexed == [AutoScheema]
+
+        class StoolSchema(AutoScheema):
+            class Meta:
+                model = Stool
+
+        assert registry.get(AutoScheema, Stool, dump=True) is StoolSchema
+        assert indexed == [AutoScheema]
+
+        # schemas declared after the index was built are found without a rescan
+        class BenchSchema(AutoScheema):
+            class Meta:
+                model = Bench
+
+        def fail(*args, **kwargs):
+            raise AssertionError("the registry should not rescan the subclasses")
+
+        monkeypatch.setattr(registry, "_index_base", fail)
+        assert utils.get_scheema_subclass(Bench, dump=True) is BenchSchema
+        assert utils.get_scheema_subclass(Bench, dump=False) is BenchSchema
@@ -0,0 +1,180 @@
+import csv
+import io
+import json
+import tracemalloc
+from datetime import date
+
+import pytest
+
+from demo.basic_factory.basic_factory import create_app
+from demo.basic_factory.basic_factory.models import Book
+from flask_scheema.api.encoding import json_default
+
+
+def read_lines(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_stream_all_rows():
+    app = create_app({})
+    client = app.test_client()
+
+    total = client.get("/api/books").json["total_count"]
+    response = client.get("/api/books?stream=1")
+    rows = read_lines(response)
+
+    assert response.mimetype == "application/x-ndjson"
+    assert response.headers["X-Total-Count"] == str(total)
+    assert "Link" not in response.headers
+    assert len(rows) == total
+    assert len({row["id"] for row in rows}) == total
+
+
+def test_stream_page_with_accept_header():
+    app = create_app({})
+    client = app.test_client()
+
+    page = client.get("/api/books?limit=5&page=2&order_by=-id").json
+    response = client.get("/api/books?limit=5&page=2&order_by=-id", headers={"Accept": "application/x-ndjson"})
+
+    assert read_lines(response) == page["value"]
+    assert f'<{page["next_url"]}>; rel="next"' in response.headers["Link"]
+    assert f'<{page["previous_url"]}>; rel="prev"' in response.headers["Link"]
+
+
+def test_stream_filtered_fields():
+    app = create_app({"API_STREAM_BATCH_SIZE": 7})
+    client = app.test_client()
+
+    total = client.get("/api/books?id__gt=10").json["total_count"]
+    rows = read_lines(client.get("/api/books?id__gt=10&fields=id,title&stream=1"))
+
+    assert len(rows) == total
+    assert all(list(row) == ["id", "title"] and row["id"] > 10 for row in rows)
+
+
+def test_stream_errors_are_json():
+    app = create_app({})
+    response = app.test_client().get("/api/books?stream=1&count=roughly")
+
+    assert response.status_code == 400
+    assert response.mimetype == "application/json"
+
+
+def stream_peak(client, url):
+    tracemalloc.start()
+    response = client.get(url, buffered=False)
+    rows = sum(chunk.count(b"\n") for chunk in response.response)
+    response.close()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return rows, peak
+
+
+@pytest.mark.parametrize("unique", [False, True])
+def test_stream_memory_is_flat(unique, monkeypatch):
+    if unique:
+        # as for a plan that joins a collection, which streams with the collections loaded by selectinload instead
+        monkeypatch.setattr("flask_scheema.services.planner.requires_unique", lambda options: True)
+    app = create_app({"API_STREAM_BATCH_SIZE": 100})
+    with app.app_context():
+        session = app.extensions["sqlalchemy"].session
+        session.add_all(
+            Book(title=f"Book {i}", isbn=str(i), publication_date=date(2000, 1, 1), author_id=1, publisher_id=1)
+            for i in range(6000)
+        )
+        session.commit()
+        last_id = session.query(Book.id).order_by(Book.id.desc()).first()[0]
+
+    client = app.test_client()
+    client.get("/api/books?stream=1&limit=1")
+
+    small_rows, small_peak = stream_peak(client, f"/api/books?stream=1&id__gt={last_id - 1000}")
+    large_rows, large_peak = stream_peak(client, "/api/books?stream=1")
+
+    assert small_rows == 1000
+    assert large_rows > 6 * small_rows
+    # six times the rows, but about the same peak, as only a batch is held at a time
+    assert large_peak < small_peak * 2
+
+
+def read_csv(response):
+    return list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+
+
+def test_stream_csv():
+    app = create_app({"API_STREAM_BATCH_SIZE": 10})
+    client = app.test_client()
+
+    page = client.get("/api/books?limit=25&order_by=-title").json
+    response = client.get("/api/books?limit=25&order_by=-title&format=csv")
+    rows = read_csv(response)
+
+    assert response.mimetype == "text/csv"
+    assert response.headers["X-Total-Count"] == str(page["total_count"])
+    assert [row["id"] for row in rows] == [str(book["id"]) for book in page["value"]]
+    assert [row["title"] for row in rows] == [book["title"] for book in page["value"]]
+    # relationships are written as urls rather than nested records
+    assert rows[0]["author"] == f"/api/authors/{page['value'][0]['author']['id']}"
+    assert rows[0]["reviews"] == page["value"][0]["reviews"]
+
+
+def test_stream_csv_with_accept_header_and_fields():
+    app = create_app({})
+    client = app.test_client()
+
+    total = client.get("/api/books?id__le=30").json["total_count"]
+    response = client.get("/api/books?id__le=30&fields=id,title", headers={"Accept": "text/csv"})
+    lines = response.get_data(as_text=True).splitlines()
+
+    assert lines[0] == "id,title"
+    assert len(lines) == total + 1
+
+
+def test_stream_csv_no_rows():
+    app = create_app({})
+    response = app.test_client().get("/api/books?id__lt=0&fields=id,title&format=csv")
+
+    assert response.get_data(as_text=True).splitlines() == ["id,title"]
+
+
+def test_invalid_format():
+    app = create_app({})
+    response = app.test_client().get("/api/books?format=xml")
+
+    assert response.status_code == 400
+    assert response.json["errors"][0]["reason"] == "Invalid format value: xml (must be one of json, ndjson, csv, arrow)"
+
+
+def test_arrow_needs_pyarrow(monkeypatch):
+    # as when pyarrow is installed but fails to import
+    monkeypatch.setattr("flask_scheema.services.streaming.pyarrow", None)
+    client = create_app({}).test_client()
+
+    response = client.get("/api/books?format=arrow")
+    assert response.status_code == 406
+    assert response.json["errors"][0]["reason"] == "The arrow format needs the pyarrow package to be installed."
+
+    # and it isn't offered to clients that only prefer it
+    response = client.get("/api/books", headers={"Accept": "application/vnd.apache.arrow.stream"})
+    assert response.mimetype == "application/json"
+
+
+def test_stream_uses_the_json_backend():
+    calls = []
+
+    class Backend:
+        def dumps(self, data):
+            calls.append(data)
+            return json.dumps(data, default=json_default).encode()
+
+        loads = staticmethod(json.loads)
+
+    client = create_app({"API_JSON_BACKEND": Backend()}).test_client()
+
+    page = client.get("/api/books?limit=5").json["value"]
+    calls.clear()
+    rows = read_lines(client.get("/api/books?limit=5&format=ndjson"))
+
+    assert rows == page
+    assert calls == page